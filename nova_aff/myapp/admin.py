@@ -1,9 +1,10 @@
 from django.contrib import admin
 from .models import (
-    UserProfile, Project, KOL, DataTracking, TrackingNumber,
+    UserProfile, Project, KOL, DataTracking, TrackingNumber, ChunkedUpload,
     Creator, BrandDashboardStats, CreatorAnalytics, VideoAnalytics, 
-    LiveAnalytics, FollowerDemographics, TrendData
+    LiveAnalytics, FollowerDemographics, TrendData, CreatorProfileDocument
 )
+from .text import fold
 
 # Register your models here.
 
@@ -37,6 +38,13 @@ class TrackingNumberAdmin(admin.ModelAdmin):
     list_filter = ['project', 'tracking_date', 'phone_check']
     search_fields = ['tracking_number', 'phone_number', 'tiktok_id']
 
+@admin.register(ChunkedUpload)
+class ChunkedUploadAdmin(admin.ModelAdmin):
+    list_display = ['upload_id', 'project', 'target', 'object_id', 'filename', 'offset', 'total_size', 'status']
+    list_filter = ['target', 'status', 'created_at']
+    search_fields = ['upload_id', 'filename']
+    readonly_fields = ['upload_id', 'created_at', 'updated_at']
+
 # Brand Analytics Admin
 @admin.register(Creator)
 class CreatorAdmin(admin.ModelAdmin):
@@ -44,6 +52,12 @@ class CreatorAdmin(admin.ModelAdmin):
     list_filter = ['gender', 'created_at']
     search_fields = ['display_name', 'username']
     readonly_fields = ['created_at', 'updated_at']
+    
+    def get_search_results(self, request, queryset, search_term):
+        # Match on the accent-folded, trigram-indexed column instead of icontains scans
+        for word in fold(search_term).split():
+            queryset = queryset.filter(search_name__contains=word)
+        return queryset, False
 
 @admin.register(BrandDashboardStats)
 class BrandDashboardStatsAdmin(admin.ModelAdmin):
@@ -81,3 +95,10 @@ class TrendDataAdmin(admin.ModelAdmin):
     list_filter = ['date']
     search_fields = ['creator__display_name']
     ordering = ['-date']
+
+@admin.register(CreatorProfileDocument)
+class CreatorProfileDocumentAdmin(admin.ModelAdmin):
+    list_display = ['creator', 'stale', 'version', 'built_at']
+    list_filter = ['stale']
+    exclude = ['content']
+    readonly_fields = ['stale', 'version', 'built_at']
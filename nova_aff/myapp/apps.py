@@ -4,3 +4,18 @@ from django.apps import AppConfig
 class MyappConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'myapp'
+
+    def ready(self):
+        # Register the dashboard rollup, response cache and profile document signal receivers
+        from . import caching, profiles, rollups  # noqa: F401
+        from django.conf import settings
+        from . import routers
+        # Detect writes for read-your-writes replica pinning
+        routers.install()
+        if settings.QUERY_PROFILER:
+            from . import profiling
+            profiling.install()
+        elif settings.METRICS_ENABLED:
+            # Metrics count queries per request but need no serializer timing
+            from . import profiling
+            profiling.install_query_wrapper()
@@ -0,0 +1,207 @@
+"""Async versions of the brand analytics read endpoints, for ASGI deployments.
+
+These are plain Django async views (DRF's APIView has no async handlers), so
+under ASGI a request does not hold a worker thread while it waits on the
+database. They do the same work as their counterparts in views.py and return
+the same JSON: the same ETag validators answer If-None-Match with a 304, the
+per-creator endpoints read and fill the same response cache (and the detail
+view serves profile documents when CREATOR_PROFILE_DOCUMENTS is on), and on a
+miss rows are fetched with the async ORM and then handed to the existing
+serializers, which never touch the database here because every related
+object they read is already loaded. The validators, cache and documents are
+synchronous code and run via sync_to_async.
+
+The independent latest-row queries of the detail page are issued together
+with asyncio.gather. Django's async ORM still runs each query through a
+thread-sensitive executor, so the fan-out saves event-loop hops rather than
+running the SQL in parallel.
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views import View
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+
+from . import caching, profiles
+from .conditional import async_etag, creator_etag
+from .models import BrandDashboardStats, Creator
+from .serializers import (
+    BrandDashboardStatsSerializer, CreatorSerializer, CreatorDetailSerializer,
+    CreatorAnalyticsSerializer, VideoAnalyticsSerializer, LiveAnalyticsSerializer,
+    FollowerDemographicsSerializer, TrendDataSerializer
+)
+from .views import (
+    bucket_trend_data, creator_list_etag, dashboard_stats_etag, filter_creators, filter_trend_data,
+    trend_columns, trend_data_etag, trend_granularity_error
+)
+
+
+def json_response(data, status=status.HTTP_200_OK):
+    return HttpResponse(JSONRenderer().render(data), content_type='application/json', status=status)
+
+
+def creator_not_found():
+    return json_response({'error': 'Creator not found'}, status=status.HTTP_404_NOT_FOUND)
+
+
+async def latest_rows(queryset):
+    """The first row of `queryset` as a list, matching the sliced prefetches"""
+    row = await queryset.afirst()
+    return [row] if row is not None else []
+
+
+class AsyncBrandDashboardStatsView(View):
+    """Get brand dashboard stats"""
+
+    @method_decorator(async_etag(dashboard_stats_etag))
+    async def get(self, request):
+        today = timezone.now().date()
+        try:
+            stats = await BrandDashboardStats.objects.aget(date=today)
+            return json_response(BrandDashboardStatsSerializer(stats).data)
+        except BrandDashboardStats.DoesNotExist:
+            return json_response({
+                'date': today,
+                'clicks_today': 0,
+                'orders_today': 0,
+                'revenue_today': 0
+            })
+
+
+class AsyncCreatorListView(View):
+    """Get list of creators, filtered by ?gender=, ?category= and min_/max_followers"""
+
+    @method_decorator(async_etag(creator_list_etag))
+    async def get(self, request):
+        creators = [creator async for creator in filter_creators(Creator.objects.all(), request.GET)]
+        return json_response(CreatorSerializer(creators, many=True).data)
+
+
+class AsyncCreatorDetailView(View):
+    """Get detailed creator information with analytics"""
+
+    @method_decorator(async_etag(creator_etag(
+        'analytics', 'video_analytics', 'live_analytics', 'follower_demographics', 'trend_data'
+    )))
+    async def get(self, request, creator_id):
+        if settings.CREATOR_PROFILE_DOCUMENTS:
+            try:
+                content = await sync_to_async(profiles.get_document)(creator_id)
+            except Creator.DoesNotExist:
+                return creator_not_found()
+            return HttpResponse(content, content_type='application/json')
+
+        data, version = await sync_to_async(caching.get_response)('detail', creator_id)
+        if data is not None:
+            return json_response(data)
+        try:
+            creator = await Creator.objects.aget(id=creator_id)
+        except Creator.DoesNotExist:
+            return creator_not_found()
+
+        (
+            creator.latest_analytics_rows,
+            creator.latest_video_analytics_rows,
+            creator.latest_live_analytics_rows,
+            creator.latest_demographics_rows,
+            creator.recent_trend_rows,
+        ) = await asyncio.gather(
+            latest_rows(creator.analytics.order_by('-created_at', '-id')),
+            latest_rows(creator.video_analytics.order_by('-created_at', '-id')),
+            latest_rows(creator.live_analytics.order_by('-created_at', '-id')),
+            latest_rows(creator.follower_demographics.order_by('-snapshot_date', '-id')),
+            self.recent_trends(creator),
+        )
+        data = CreatorDetailSerializer(creator).data
+        await sync_to_async(caching.set_response)('detail', creator_id, version, data)
+        return json_response(data)
+
+    @staticmethod
+    async def recent_trends(creator):
+        return [row async for row in creator.trend_data.order_by('-date')[:30]]
+
+
+class AsyncCreatorRowsView(View):
+    """Base for the per-creator list endpoints: every row of one related model"""
+    related_name = None
+    serializer_class = None
+    cache_endpoint = None
+    etag_func = None
+
+    async def get(self, request, creator_id):
+        return await async_etag(self.etag_func)(self.rows)(request, creator_id)
+
+    async def rows(self, request, creator_id):
+        data, version = await sync_to_async(caching.get_response)(self.cache_endpoint, creator_id)
+        if data is not None:
+            return json_response(data)
+        try:
+            creator = await Creator.objects.aget(id=creator_id)
+        except Creator.DoesNotExist:
+            return creator_not_found()
+        # Rows fetched through the related manager already carry `creator`,
+        # so the serializers' creator_name lookups stay in memory.
+        rows = [row async for row in getattr(creator, self.related_name).all()]
+        data = self.serializer_class(rows, many=True).data
+        await sync_to_async(caching.set_response)(self.cache_endpoint, creator_id, version, data)
+        return json_response(data)
+
+
+class AsyncCreatorAnalyticsView(AsyncCreatorRowsView):
+    """Get creator analytics"""
+    related_name = 'analytics'
+    serializer_class = CreatorAnalyticsSerializer
+    cache_endpoint = 'analytics'
+    etag_func = staticmethod(creator_etag('analytics'))
+
+
+class AsyncVideoAnalyticsView(AsyncCreatorRowsView):
+    """Get video analytics for creator"""
+    related_name = 'video_analytics'
+    serializer_class = VideoAnalyticsSerializer
+    cache_endpoint = 'video_analytics'
+    etag_func = staticmethod(creator_etag('video_analytics'))
+
+
+class AsyncLiveAnalyticsView(AsyncCreatorRowsView):
+    """Get live analytics for creator"""
+    related_name = 'live_analytics'
+    serializer_class = LiveAnalyticsSerializer
+    cache_endpoint = 'live_analytics'
+    etag_func = staticmethod(creator_etag('live_analytics'))
+
+
+class AsyncFollowerDemographicsView(AsyncCreatorRowsView):
+    """Get follower demographics for creator"""
+    related_name = 'follower_demographics'
+    serializer_class = FollowerDemographicsSerializer
+    cache_endpoint = 'demographics'
+    etag_func = staticmethod(creator_etag('follower_demographics'))
+
+
+class AsyncTrendDataView(View):
+    """Get trend data for creator"""
+
+    @method_decorator(async_etag(trend_data_etag))
+    async def get(self, request, creator_id):
+        try:
+            creator = await Creator.objects.aget(id=creator_id)
+        except Creator.DoesNotExist:
+            return creator_not_found()
+        trend_data = filter_trend_data(creator.trend_data.all(), request.GET)
+
+        granularity = request.GET.get('granularity')
+        if granularity:
+            error = trend_granularity_error(granularity)
+            if error:
+                return json_response(error, status=status.HTTP_400_BAD_REQUEST)
+            rows = [row async for row in bucket_trend_data(trend_data, granularity)]
+            return json_response(trend_columns(rows, granularity))
+
+        rows = [row async for row in trend_data]
+        return json_response(TrendDataSerializer(rows, many=True).data)
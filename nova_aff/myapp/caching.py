@@ -0,0 +1,141 @@
+"""Response cache for the per-creator brand analytics endpoints.
+
+Serialized response data is cached per (endpoint, creator) in the default
+cache backend (local memory in development and tests, Redis in production).
+Cache keys carry a version per (endpoint, creator), which the signal receivers
+below replace once a transaction that saved or deleted a feeding row commits.
+
+Deleting the entry on commit would not be enough: a request that read the old
+rows before the commit could still store them afterwards, and they would be
+served until the entry expired. With versions, the request reads the version
+before it queries, so a response built from old rows lands under a key nobody
+reads any more. A request that starts just after the commit may still read old
+rows from a lagging replica; responses built within
+ANALYTICS_CACHE_SETTLE_TIMEOUT seconds of a version change are only cached for
+that long, which bounds how long such a response is served.
+
+Bulk writes (queryset.update(), bulk_create()) do not send signals; code
+doing those should call invalidate_creator() itself.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+
+from . import metrics
+from .models import (
+    Creator, CreatorAnalytics, VideoAnalytics, LiveAnalytics,
+    FollowerDemographics, TrendData
+)
+
+ENDPOINTS = ['detail', 'analytics', 'video_analytics', 'live_analytics', 'demographics']
+
+# Which cached endpoints each model's rows appear in
+MODEL_ENDPOINTS = {
+    CreatorAnalytics: ['analytics', 'detail'],
+    VideoAnalytics: ['video_analytics', 'detail'],
+    LiveAnalytics: ['live_analytics', 'detail'],
+    FollowerDemographics: ['demographics', 'detail'],
+    TrendData: ['detail'],
+    # Every response carries the creator's name
+    Creator: ENDPOINTS,
+}
+
+
+def response_key(endpoint, creator_id, version):
+    return f'brand:{endpoint}:{creator_id}:{version}'
+
+
+def version_key(endpoint, creator_id):
+    return f'brand:version:{endpoint}:{creator_id}'
+
+
+def counter_key(endpoint, outcome):
+    return f'brand:stats:{endpoint}:{outcome}'
+
+
+def count(endpoint, outcome):
+    metrics.inc('nova_cache_requests_total', (('endpoint', endpoint), ('result', outcome)))
+    key = counter_key(endpoint, outcome)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # First count, or the backend evicted the counter; never fail the request over it
+        cache.add(key, 1, timeout=None)
+
+
+def current_version(endpoint, creator_id):
+    """Version of the (endpoint, creator) entry: the time.time_ns() of its last invalidation"""
+    key = version_key(endpoint, creator_id)
+    version = cache.get(key)
+    if version is None:
+        # Never invalidated, or evicted: start a new version so older entries are not reused.
+        # Negative, as no write just happened that a replica could lag behind.
+        version = -time.time_ns()
+        if not cache.add(key, version, timeout=None):
+            version = cache.get(key, version)
+    return version
+
+
+def get_response(endpoint, creator_id):
+    """(cached response data or None on a miss, version to pass to set_response)
+
+    The version is read before the caller queries the database, so data built
+    from rows that change meanwhile is stored under an outdated key.
+    """
+    version = current_version(endpoint, creator_id)
+    data = cache.get(response_key(endpoint, creator_id, version))
+    count(endpoint, 'miss' if data is None else 'hit')
+    return data, version
+
+
+def set_response(endpoint, creator_id, version, data):
+    timeout = settings.ANALYTICS_CACHE_TIMEOUT
+    # Replicas may not have the latest write yet; let early responses expire soon
+    if time.time_ns() - version < settings.ANALYTICS_CACHE_SETTLE_TIMEOUT * 10 ** 9:
+        timeout = min(timeout, settings.ANALYTICS_CACHE_SETTLE_TIMEOUT)
+    cache.set(response_key(endpoint, creator_id, version), data, timeout=timeout)
+
+
+def invalidate_creator(creator_id, endpoints=ENDPOINTS):
+    keys = [version_key(endpoint, creator_id) for endpoint in endpoints]
+    old = cache.get_many(keys)
+    version = time.time_ns()
+    cache.set_many({key: version for key in keys}, timeout=None)
+    # Not needed for correctness, frees the memory before the entries expire
+    cache.delete_many([
+        response_key(endpoint, creator_id, old[key]) for endpoint, key in zip(endpoints, keys) if key in old
+    ])
+
+
+def cache_stats():
+    keys = [counter_key(endpoint, outcome) for endpoint in ENDPOINTS for outcome in ('hit', 'miss')]
+    values = cache.get_many(keys)
+    stats = {}
+    for endpoint in ENDPOINTS:
+        hits = values.get(counter_key(endpoint, 'hit'), 0)
+        misses = values.get(counter_key(endpoint, 'miss'), 0)
+        total = hits + misses
+        stats[endpoint] = {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': round(hits / total, 4) if total else None,
+        }
+    return stats
+
+
+def reset_cache_stats():
+    cache.delete_many([counter_key(endpoint, outcome) for endpoint in ENDPOINTS for outcome in ('hit', 'miss')])
+
+
+def invalidate_cached_responses(sender, instance, **kwargs):
+    endpoints = MODEL_ENDPOINTS[sender]
+    creator_id = instance.pk if sender is Creator else instance.creator_id
+    transaction.on_commit(lambda: invalidate_creator(creator_id, endpoints))
+
+
+for model in MODEL_ENDPOINTS:
+    post_save.connect(invalidate_cached_responses, sender=model, dispatch_uid=f'cache_{model.__name__}_save')
+    post_delete.connect(invalidate_cached_responses, sender=model, dispatch_uid=f'cache_{model.__name__}_delete')
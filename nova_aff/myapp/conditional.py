@@ -0,0 +1,74 @@
+"""ETag validators for the polled brand read endpoints.
+
+Each validator is a single aggregate query (latest updated_at plus row
+count, so deletions change it too) and is used with Django's etag()
+decorator, or async_etag() for the async views: a matching If-None-Match
+gets a 304 before the view body, and therefore the serializers, run at all.
+"""
+import hashlib
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+
+from .models import Creator
+
+
+def make_etag(*parts):
+    return hashlib.md5('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+
+
+def queryset_etag(queryset, *extra):
+    """Validator for a list response built from `queryset`"""
+    row = queryset.order_by().aggregate(latest=Max('updated_at'), count=Count('pk'))
+    return make_etag(row['latest'], row['count'], *extra)
+
+
+def creator_etag(*relations):
+    """etag() function for a per-creator endpoint fed by the given related rows.
+
+    The creator's own updated_at is always part of the validator, since every
+    response embeds its name. Returns None for unknown creators so the view
+    answers with its usual 404.
+    """
+    annotations = {}
+    for relation in relations:
+        model = Creator._meta.get_field(relation).related_model
+        rows = model.objects.filter(creator=OuterRef('pk')).order_by().values('creator')
+        annotations[f'{relation}_latest'] = Subquery(rows.annotate(value=Max('updated_at')).values('value'))
+        annotations[f'{relation}_count'] = Subquery(rows.annotate(value=Count('pk')).values('value'))
+
+    def etag_func(request, creator_id):
+        row = (
+            Creator.objects.filter(id=creator_id)
+            .annotate(**annotations)
+            .values_list('updated_at', *annotations)
+            .first()
+        )
+        if row is None:
+            return None
+        return make_etag(creator_id, *row)
+    return etag_func
+
+
+def async_etag(etag_func):
+    """etag() for async views.
+
+    Django's etag() calls the validator synchronously, which the async ORM
+    guard refuses inside an event loop; here it runs via sync_to_async.
+    """
+    def decorator(view):
+        @wraps(view)
+        async def inner(request, *args, **kwargs):
+            etag = await sync_to_async(etag_func)(request, *args, **kwargs)
+            etag = quote_etag(etag) if etag is not None else None
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = await view(request, *args, **kwargs)
+            if etag and request.method in ('GET', 'HEAD'):
+                response.headers.setdefault('ETag', etag)
+            return response
+        return inner
+    return decorator
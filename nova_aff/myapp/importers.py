@@ -0,0 +1,341 @@
+"""Bulk import of DataTracking rows from CSV / XLSX exports.
+
+Files are parsed row by row, validated with plain Python checks (running a
+DRF serializer per row would dominate the import time) and merged into the
+table on (project, video_id) in batches, via COPY + INSERT ... ON CONFLICT on
+Postgres and bulk_create(update_conflicts=True) elsewhere, all inside one
+transaction. Re-importing the same export updates rows instead of
+duplicating them.
+"""
+import codecs
+import csv
+import io
+import zipfile
+from itertools import chain, islice
+
+from django.core.exceptions import ValidationError
+from django.core.validators import URLValidator
+from django.db import connections, router, transaction
+from django.utils import timezone
+
+from .models import DataTracking
+from .rollups import apply_rollup_deltas
+
+
+class ImportFormatError(Exception):
+    """The file cannot be read at all (bad type, missing columns, ...)"""
+
+
+NOT_UTF8 = 'The file is not UTF-8 or UTF-16 encoded; save it from Excel as "CSV UTF-8"'
+# Every DataTracking number column is an IntegerField
+INT_MIN, INT_MAX = -2**31, 2**31 - 1
+
+
+def normalize_header(name):
+    return str(name or '').strip().lower().replace(' ', '_')
+
+
+def csv_encoding(fileobj):
+    """UTF-16 when the file starts with its byte order mark (Excel's "Unicode Text"), else UTF-8"""
+    start = fileobj.read(2)
+    fileobj.seek(0)
+    if start in (codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE):
+        return 'utf-16'
+    return 'utf-8-sig'
+
+
+def read_csv_rows(fileobj):
+    """Return (header, rows) for a CSV file; rows are dicts decoded from the byte stream incrementally"""
+    text = io.TextIOWrapper(fileobj, encoding=csv_encoding(fileobj), newline='')
+    try:
+        first_line = text.readline()
+    except UnicodeDecodeError:
+        text.detach()
+        raise ImportFormatError(NOT_UTF8)
+    # Excel's "Unicode Text" export is tab separated
+    delimiter = '\t' if '\t' in first_line and ',' not in first_line else ','
+    # chain, not _prepend: closing a `yield from` would close the wrapper and its file
+    reader = csv.reader(chain([first_line], text), delimiter=delimiter)
+    try:
+        header = [normalize_header(name) for name in next(reader, [])]
+    except csv.Error as e:
+        text.detach()
+        raise ImportFormatError(f'Unreadable CSV file: {e}')
+
+    def rows():
+        try:
+            for values in reader:
+                if any(values):
+                    yield dict(zip(header, values))
+        except UnicodeDecodeError:
+            raise ImportFormatError(NOT_UTF8)
+        except csv.Error as e:
+            raise ImportFormatError(f'Unreadable CSV file (line {reader.line_num}): {e}')
+        finally:
+            # Leave the underlying file open for its owner
+            text.detach()
+
+    return header, rows()
+
+
+def read_xlsx_rows(fileobj):
+    """Return (header, rows) for the active worksheet using openpyxl's streaming reader"""
+    try:
+        from openpyxl import load_workbook
+        from openpyxl.utils.exceptions import InvalidFileException
+    except ImportError:
+        raise ImportFormatError('XLSX import requires the openpyxl package')
+
+    try:
+        workbook = load_workbook(fileobj, read_only=True, data_only=True)
+        values = workbook.active.iter_rows(values_only=True)
+        header = [normalize_header(name) for name in next(values, ())]
+    except (zipfile.BadZipFile, InvalidFileException, KeyError, OSError):
+        # KeyError: a zip archive without the workbook parts
+        raise ImportFormatError('The file is not a valid .xlsx workbook')
+
+    def rows():
+        try:
+            for row in values:
+                if any(value not in (None, '') for value in row):
+                    yield dict(zip(header, ('' if value is None else value for value in row)))
+        finally:
+            workbook.close()
+
+    return header, rows()
+
+
+def read_rows(fileobj, filename):
+    """Return (header, rows) for an uploaded export"""
+    if filename.lower().endswith('.xlsx'):
+        return read_xlsx_rows(fileobj)
+    if filename.lower().endswith('.csv'):
+        return read_csv_rows(fileobj)
+    raise ImportFormatError('Unsupported file type, upload a .csv or .xlsx file')
+
+
+class DataTrackingImporter:
+    """Validate and upsert DataTracking rows for one project, keyed on video_id"""
+    int_fields = [
+        'view', 'like', 'share', 'comment', 'new_followers', 'product_impressions',
+        'product_entries', 'gmv', 'ctr', 'revenue_from_videos',
+    ]
+    char_fields = ['creator', 'creator_id', 'about_video', 'video_id', 'upload_time']
+    url_fields = ['product_linked']
+    unique_fields = ['project_id', 'video_id']
+
+    def __init__(self, project, batch_size=2000, max_errors=1000):
+        self.project = project
+        self.batch_size = batch_size
+        self.max_errors = max_errors
+        self.max_lengths = {
+            name: DataTracking._meta.get_field(name).max_length
+            for name in self.char_fields + self.url_fields
+        }
+        self.url_validator = URLValidator()
+        self.created = 0
+        self.updated = 0
+        self.error_count = 0
+        self.errors = []
+
+    @property
+    def required_columns(self):
+        return self.char_fields + self.url_fields + self.int_fields
+
+    @property
+    def update_fields(self):
+        return [name for name in self.char_fields + self.url_fields + self.int_fields
+                if name != 'video_id'] + ['updated_at']
+
+    def clean_row(self, row):
+        """Return (values, errors) for one parsed row"""
+        values, errors = {}, {}
+        for name in self.char_fields + self.url_fields:
+            # JSON null is a missing value, not the text "None"
+            value = row.get(name)
+            value = '' if value is None else str(value).strip()
+            if not value:
+                errors[name] = 'This field is required.'
+            elif len(value) > self.max_lengths[name]:
+                errors[name] = f'Ensure this field has no more than {self.max_lengths[name]} characters.'
+            values[name] = value
+        for name in self.url_fields:
+            if name not in errors:
+                try:
+                    self.url_validator(values[name])
+                except ValidationError:
+                    errors[name] = 'Enter a valid URL.'
+        for name in self.int_fields:
+            value = row.get(name)
+            if value is None:
+                value = ''
+            try:
+                if isinstance(value, float) and not value.is_integer():
+                    raise ValueError(value)
+                if isinstance(value, (int, float)):
+                    number = int(value)
+                else:
+                    number = int(str(value).replace(',', '').strip() or 0)
+            except (ValueError, OverflowError):
+                errors[name] = 'A valid integer is required.'
+                continue
+            if number > INT_MAX:
+                errors[name] = f'Ensure this value is less than or equal to {INT_MAX}.'
+            elif number < INT_MIN:
+                errors[name] = f'Ensure this value is greater than or equal to {INT_MIN}.'
+            else:
+                values[name] = number
+        return values, errors
+
+    def record_error(self, line, errors):
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({'row': line, 'errors': errors})
+
+    def run(self, rows, start=2, columns=None):
+        """Upsert an iterable of row dicts; rows with errors are skipped and reported.
+
+        `start` is the number reported for the first row (2 for files, where
+        line 1 is the header). `columns` is the file's header; without one
+        (JSON rows) the first row's keys are checked instead.
+        """
+        rows = iter(rows)
+        first = next(rows, None)
+        if first is None:
+            return self.result()
+        present = first if columns is None else columns
+        missing = [name for name in self.required_columns if name not in present]
+        if missing:
+            raise ImportFormatError(f"Missing columns: {', '.join(missing)}")
+
+        numbered = enumerate(_prepend(first, rows), start=start)
+        with transaction.atomic():
+            while True:
+                chunk = list(islice(numbered, self.batch_size))
+                if not chunk:
+                    break
+                self.write_chunk(chunk)
+        return self.result()
+
+    def write_chunk(self, chunk):
+        rows = {}
+        for line, row in chunk:
+            values, errors = self.clean_row(row)
+            if errors:
+                self.record_error(line, errors)
+            else:
+                # ON CONFLICT cannot touch the same row twice in one statement; last one wins
+                rows[values['video_id']] = values
+        if not rows:
+            return
+
+        existing = {
+            video_id: (created_at, product_entries)
+            for video_id, created_at, product_entries in DataTracking.objects.filter(
+                project=self.project, video_id__in=list(rows)
+            ).values_list('video_id', 'created_at', 'product_entries')
+        }
+        now = timezone.now()
+        self.upsert(list(rows.values()), now)
+
+        # Bulk writes skip signals, so roll the dashboard up once per chunk
+        deltas = {}
+        for video_id, values in rows.items():
+            if video_id in existing:
+                created_at, product_entries = existing[video_id]
+                day, delta = created_at.date(), values['product_entries'] - product_entries
+            else:
+                day, delta = now.date(), values['product_entries']
+            deltas.setdefault(day, {'clicks_today': 0})['clicks_today'] += delta
+        apply_rollup_deltas(deltas)
+
+        self.updated += len(existing)
+        self.created += len(rows) - len(existing)
+
+    def upsert(self, rows, now):
+        """Insert or update rows keyed on (project, video_id)"""
+        connection = connections[router.db_for_write(DataTracking)]
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                if hasattr(cursor.cursor, 'copy_expert'):
+                    extra = {'project_id': self.project.pk, 'video_file': '', 'created_at': now, 'updated_at': now}
+                    copy_upsert(cursor, DataTracking, [{**values, **extra} for values in rows],
+                                unique_fields=self.unique_fields, update_fields=self.update_fields)
+                    return
+        DataTracking.objects.bulk_create(
+            [DataTracking(project=self.project, **values) for values in rows],
+            batch_size=self.batch_size,
+            update_conflicts=True,
+            unique_fields=['project', 'video_id'],
+            update_fields=self.update_fields,
+        )
+
+    def result(self):
+        return {
+            'created': self.created,
+            'updated': self.updated,
+            'error_count': self.error_count,
+            'errors': self.errors,
+        }
+
+
+def copy_rows(cursor, model, rows, table=None):
+    """Stream already DB-ready value dicts into the model's table with COPY ... FROM STDIN.
+
+    Every dict must carry the same keys (field attnames); values are written
+    as-is, so callers are responsible for validation. `table` overrides the
+    (quoted) target table, e.g. for a staging table.
+    """
+    attnames = list(rows[0])
+    fields_by_attname = {field.attname: field for field in model._meta.concrete_fields}
+    fields = [fields_by_attname[attname] for attname in attnames]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for values in rows:
+        writer.writerow([_copy_value(values[attname]) for attname in attnames])
+    buffer.seek(0)
+
+    quote_name = cursor.db.ops.quote_name
+    table = table or quote_name(model._meta.db_table)
+    columns = ', '.join(quote_name(field.column) for field in fields)
+    # Only nullable columns may read the \N marker as NULL
+    not_null = ', '.join(quote_name(field.column) for field in fields if not field.null)
+    cursor.cursor.copy_expert(
+        f"COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '\\N', FORCE_NOT_NULL ({not_null}))",
+        buffer,
+    )
+
+
+def copy_upsert(cursor, model, rows, unique_fields, update_fields):
+    """COPY rows into a temporary staging table, then merge them with INSERT ... ON CONFLICT"""
+    quote_name = cursor.db.ops.quote_name
+    table = quote_name(model._meta.db_table)
+    staging = quote_name(f'{model._meta.db_table}_staging')
+    fields_by_attname = {field.attname: field for field in model._meta.concrete_fields}
+    columns = ', '.join(quote_name(fields_by_attname[attname].column) for attname in rows[0])
+    conflict = ', '.join(quote_name(fields_by_attname[attname].column) for attname in unique_fields)
+    updates = ', '.join(
+        f'{column} = EXCLUDED.{column}'
+        for column in (quote_name(model._meta.get_field(name).column) for name in update_fields)
+    )
+
+    # Column types only, no constraints; dropped when the transaction ends
+    cursor.execute(
+        f'CREATE TEMPORARY TABLE IF NOT EXISTS {staging} ON COMMIT DROP AS '
+        f'SELECT {columns} FROM {table} WITH NO DATA'
+    )
+    cursor.execute(f'TRUNCATE {staging}')
+    copy_rows(cursor, model, rows, table=staging)
+    cursor.execute(
+        f'INSERT INTO {table} ({columns}) SELECT {columns} FROM {staging} '
+        f'ON CONFLICT ({conflict}) DO UPDATE SET {updates}'
+    )
+
+
+def _copy_value(value):
+    return r'\N' if value is None else value
+
+
+def _prepend(first, rows):
+    yield first
+    yield from rows
@@ -0,0 +1,272 @@
+import json
+import os
+import statistics
+import subprocess
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler, get_internal_wsgi_application
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from myapp import synthetic
+from myapp.models import (
+    Project, KOL, DataTracking, Creator, CreatorAnalytics, VideoAnalytics,
+    LiveAnalytics, FollowerDemographics, TrendData
+)
+
+# (URL name, group); list endpoints take a project id or nothing, the others a creator id
+ENDPOINTS = [
+    ('project_list', 'list'),
+    ('kol_list', 'list'),
+    ('data_tracking_list', 'list'),
+    ('creator_list', 'list'),
+    ('creator_search', 'list'),
+    ('brand_dashboard_stats', 'list'),
+    ('project_detail', 'detail'),
+    ('creator_detail', 'detail'),
+    ('creator_analytics', 'analytics'),
+    ('video_analytics', 'analytics'),
+    ('live_analytics', 'analytics'),
+    ('follower_demographics', 'analytics'),
+    ('trend_data', 'analytics'),
+]
+PROJECT_ENDPOINTS = {'kol_list', 'data_tracking_list', 'project_detail'}
+NO_ARG_ENDPOINTS = {'project_list', 'creator_list', 'creator_search', 'brand_dashboard_stats'}
+
+# Detail/analytics requests rotate over this many creators and projects
+SAMPLE_SIZE = 50
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class Command(BaseCommand):
+    help = ('Benchmark the list, detail and analytics endpoints through the test client and a real WSGI '
+            'server; reports throughput, p50/p95/p99 and query counts and saves them as JSON')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', action='store_true',
+                            help='Generate the benchmark dataset first (see generate_brand_data for more options)')
+        parser.add_argument('--projects', type=int, default=5)
+        parser.add_argument('--kols', type=int, default=1000, help='KOLs per project')
+        parser.add_argument('--tracking-rows', type=int, default=10000, help='DataTracking rows per project')
+        parser.add_argument('--creators', type=int, default=1000)
+        parser.add_argument('--days', type=int, default=365, help='Days of TrendData per creator')
+        parser.add_argument('--random-seed', type=int, default=42)
+
+        parser.add_argument('--requests', type=int, default=200, help='Requests per endpoint and driver')
+        parser.add_argument('--concurrency', type=int, default=8, help='Concurrent clients for the WSGI server')
+        parser.add_argument('--drivers', default='client,wsgi', help="Comma separated: 'client', 'wsgi'")
+        parser.add_argument('--base-url',
+                            help='Drive an already running server (e.g. gunicorn) instead of an in-process one')
+        parser.add_argument('--endpoints', help='Comma separated URL names (default: all)')
+        parser.add_argument('--with-cache', action='store_true', help='Keep the analytics response cache on')
+        parser.add_argument('--output', help='JSON results path (default: bench_results/api-<time>-<commit>.json)')
+        parser.add_argument('--compare', help='Previous JSON results to print the p50/p95 change against')
+
+    def handle(self, *args, **options):
+        if options['seed']:
+            self.seed(options)
+
+        projects = list(Project.objects.filter(project_id__startswith=synthetic.PREFIX)
+                        .order_by('id').values_list('id', flat=True)[:SAMPLE_SIZE])
+        creators = list(Creator.objects.filter(username__startswith=synthetic.PREFIX)
+                        .order_by('id').values_list('id', flat=True)[:SAMPLE_SIZE])
+        if not projects or not creators:
+            raise CommandError('No generated data found, run with --seed (or manage.py generate_brand_data) first')
+
+        names = options['endpoints'].split(',') if options['endpoints'] else [name for name, _ in ENDPOINTS]
+        groups = dict(ENDPOINTS)
+        unknown = set(names) - set(groups)
+        if unknown:
+            raise CommandError(f'Unknown endpoints: {", ".join(sorted(unknown))}')
+        drivers = options['drivers'].split(',')
+        if set(drivers) - {'client', 'wsgi'}:
+            raise CommandError(f'Unknown driver in {options["drivers"]!r}')
+
+        overrides = {'ALLOWED_HOSTS': [*settings.ALLOWED_HOSTS, 'testserver', '127.0.0.1', 'localhost']}
+        if not options['with_cache']:
+            overrides['CACHES'] = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+        if settings.DEBUG:
+            self.stdout.write(self.style.WARNING('DEBUG is on; timings include its query logging'))
+
+        runs = []
+        with override_settings(**overrides):
+            for name in names:
+                urls = self.urls_for(name, projects, creators)
+                queries = self.count_queries(urls[0])
+                for driver in drivers:
+                    result = self.run(driver, urls, options)
+                    result.update({'endpoint': name, 'group': groups[name], 'driver': driver, 'queries': queries})
+                    runs.append(result)
+                    self.report(result)
+
+        results = {
+            'commit': self.git_commit(),
+            'started_at': timezone.now().isoformat(),
+            'environment': {
+                'database': connection.vendor,
+                'debug': settings.DEBUG,
+                'conn_max_age': connection.settings_dict['CONN_MAX_AGE'],
+                'cache': 'on' if options['with_cache'] else 'off',
+                'base_url': options['base_url'],
+                'requests': options['requests'],
+                'concurrency': options['concurrency'],
+            },
+            'dataset': self.dataset_counts(),
+            'runs': runs,
+        }
+        path = options['output'] or os.path.join(
+            'bench_results', f'api-{timezone.now():%Y%m%d-%H%M%S}-{results["commit"] or "nogit"}.json'
+        )
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as fileobj:
+            json.dump(results, fileobj, indent=2)
+        self.stdout.write(self.style.SUCCESS(f'Saved results to {path}'))
+
+        if options['compare']:
+            self.compare(options['compare'], runs)
+
+    # Dataset
+
+    def seed(self, options):
+        if synthetic.generated_exists():
+            self.stdout.write('Generated data already present, skipping --seed '
+                              '(manage.py generate_brand_data --flush regenerates it)')
+            return
+        start = time.perf_counter()
+        counts = synthetic.generate(
+            creators=options['creators'], days=options['days'], projects=options['projects'],
+            kols_per_project=options['kols'], tracking_per_project=options['tracking_rows'],
+            seed=options['random_seed'], end_date=date(2025, 6, 30),
+        )
+        # Bulk inserts skip the rollup signals
+        call_command('rebuild_dashboard_stats', stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {sum(counts.values()):,} rows in {time.perf_counter() - start:.1f}s'
+        ))
+
+    def dataset_counts(self):
+        models = [Project, KOL, DataTracking, Creator, CreatorAnalytics, VideoAnalytics, LiveAnalytics,
+                  FollowerDemographics, TrendData]
+        return {model.__name__: model.objects.count() for model in models}
+
+    # Drivers
+
+    def urls_for(self, name, projects, creators):
+        if name in NO_ARG_ENDPOINTS:
+            return [reverse(name) + ('?q=creator' if name == 'creator_search' else '')]
+        ids = projects if name in PROJECT_ENDPOINTS else creators
+        return [reverse(name, args=[pk]) for pk in ids]
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            Client().get(url)
+        return len(queries)
+
+    def run(self, driver, urls, options):
+        if driver == 'client':
+            return self.run_client(urls, options['requests'])
+        if options['base_url']:
+            return self.run_http(options['base_url'].rstrip('/'), urls, options['requests'], options['concurrency'])
+        server = ThreadedWSGIServer(('127.0.0.1', 0), QuietRequestHandler)
+        server.set_app(get_internal_wsgi_application())
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            host, port = server.server_address
+            return self.run_http(f'http://{host}:{port}', urls, options['requests'], options['concurrency'])
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def run_client(self, urls, total):
+        """Sequential requests through the test Client (no network, no server)"""
+        client, latencies, errors = Client(), [], 0
+        client.get(urls[0])  # warm up
+        start = time.perf_counter()
+        for i in range(total):
+            request_start = time.perf_counter()
+            response = client.get(urls[i % len(urls)])
+            latencies.append(time.perf_counter() - request_start)
+            errors += response.status_code >= 400
+        return self.summarize(time.perf_counter() - start, latencies, errors, concurrency=1)
+
+    def run_http(self, base_url, urls, total, concurrency):
+        """`concurrency` threads issuing HTTP requests against a WSGI server"""
+        def request(url):
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(base_url + url, timeout=30) as response:
+                    response.read()
+                    failed = response.status >= 400
+            except (urllib.error.URLError, OSError):
+                failed = True
+            return time.perf_counter() - start, failed
+
+        request(urls[0])  # warm up
+        start = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as pool:
+            results = list(pool.map(request, (urls[i % len(urls)] for i in range(total))))
+        elapsed = time.perf_counter() - start
+        return self.summarize(elapsed, [latency for latency, _ in results],
+                              sum(failed for _, failed in results), concurrency)
+
+    def summarize(self, elapsed, latencies, errors, concurrency):
+        percentiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+        return {
+            'requests': len(latencies),
+            'concurrency': concurrency,
+            'errors': errors,
+            'throughput_rps': round(len(latencies) / elapsed, 1),
+            'mean_ms': round(statistics.mean(latencies) * 1000, 2),
+            'p50_ms': round(percentiles[49] * 1000, 2),
+            'p95_ms': round(percentiles[94] * 1000, 2),
+            'p99_ms': round(percentiles[98] * 1000, 2),
+        }
+
+    # Reporting
+
+    def report(self, result):
+        self.stdout.write(
+            f'{result["endpoint"]:<22} {result["driver"]:<6} {result["throughput_rps"]:8.1f} req/s  '
+            f'p50 {result["p50_ms"]:7.2f}  p95 {result["p95_ms"]:7.2f}  p99 {result["p99_ms"]:7.2f} ms  '
+            f'{result["queries"]:3d} queries' + (f'  {result["errors"]} errors' if result['errors'] else '')
+        )
+
+    def compare(self, path, runs):
+        with open(path) as fileobj:
+            previous = json.load(fileobj)
+        before = {(run['endpoint'], run['driver']): run for run in previous['runs']}
+        self.stdout.write(f'Compared with {path} (commit {previous.get("commit")}):')
+        for run in runs:
+            old = before.get((run['endpoint'], run['driver']))
+            if old is None:
+                continue
+            changes = '  '.join(
+                f'{key[:-3]} {(run[key] - old[key]) / old[key] * 100:+6.1f}%' if old[key] else f'{key[:-3]}   n/a'
+                for key in ('p50_ms', 'p95_ms')
+            )
+            self.stdout.write(f'{run["endpoint"]:<22} {run["driver"]:<6} {changes}  '
+                              f'queries {old["queries"]} -> {run["queries"]}')
+
+    def git_commit(self):
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+                cwd=settings.BASE_DIR,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
@@ -0,0 +1,83 @@
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import AsyncClient, Client, override_settings
+from django.urls import reverse
+from myapp.models import Creator
+
+ENDPOINTS = ['creator_detail', 'creator_analytics', 'follower_demographics', 'trend_data']
+
+
+class Command(BaseCommand):
+    help = 'Load-test the async (ASGI) brand endpoints against their sync (WSGI) counterparts in-process'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--creator', type=int, help='Creator id to query (default: the first creator)')
+        parser.add_argument('--requests', type=int, default=500, help='Requests per endpoint and path')
+        parser.add_argument('--concurrency', type=int, default=16)
+        parser.add_argument('--with-cache', action='store_true',
+                            help='Keep the response cache on (both paths use it)')
+
+    def handle(self, *args, **options):
+        creator_id = options['creator'] or Creator.objects.order_by('id').values_list('id', flat=True).first()
+        if creator_id is None:
+            raise CommandError('No creators found, run seed_brand_data first')
+
+        if options['with_cache']:
+            self.run(creator_id, options)
+        else:
+            with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}):
+                self.run(creator_id, options)
+
+    def run(self, creator_id, options):
+        for name in ENDPOINTS:
+            sync_url = reverse(name, args=[creator_id])
+            async_url = reverse(f'async_{name}', args=[creator_id])
+            for label, url, runner in [('sync/WSGI', sync_url, self.run_sync), ('async/ASGI', async_url, self.run_async)]:
+                elapsed, latencies = runner(url, options['requests'], options['concurrency'])
+                self.report(name, label, elapsed, latencies)
+
+    def run_sync(self, url, total, concurrency):
+        """Each worker thread drives the WSGI handler through its own test Client"""
+        def worker(count):
+            client, latencies = Client(), []
+            for _ in range(count):
+                start = time.perf_counter()
+                client.get(url)
+                latencies.append(time.perf_counter() - start)
+            connections.close_all()
+            return latencies
+
+        counts = [total // concurrency + (1 if i < total % concurrency else 0) for i in range(concurrency)]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as pool:
+            latencies = [latency for result in pool.map(worker, counts) for latency in result]
+        return time.perf_counter() - start, latencies
+
+    def run_async(self, url, total, concurrency):
+        """One event loop drives the ASGI handler with `concurrency` requests in flight"""
+        async def main():
+            client, semaphore, latencies = AsyncClient(), asyncio.Semaphore(concurrency), []
+
+            async def one():
+                async with semaphore:
+                    start = time.perf_counter()
+                    await client.get(url)
+                    latencies.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            await asyncio.gather(*(one() for _ in range(total)))
+            return time.perf_counter() - start, latencies
+
+        return asyncio.run(main())
+
+    def report(self, name, label, elapsed, latencies):
+        percentiles = statistics.quantiles(latencies, n=100)
+        self.stdout.write(
+            f'{name:<22} {label:<10} {len(latencies) / elapsed:8.1f} req/s  '
+            f'p50 {percentiles[49] * 1000:6.1f} ms  p95 {percentiles[94] * 1000:6.1f} ms'
+        )
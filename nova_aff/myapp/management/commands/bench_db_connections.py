@@ -0,0 +1,79 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import RequestFactory
+from django.urls import reverse
+from myapp.models import Project
+
+# CONN_MAX_AGE / CONN_HEALTH_CHECKS per mode that can be switched at runtime
+RUNTIME_MODES = {
+    'none': (0, False),
+    'persistent': (60, True),
+}
+
+
+class Command(BaseCommand):
+    help = 'Compare per-request latency of the list endpoints with and without connection reuse'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Sequential requests per endpoint and mode')
+        parser.add_argument('--modes', default='none,persistent',
+                            help="Comma separated modes; 'pool' needs the process started with DB_CONN_MODE=pool")
+
+    def handle(self, *args, **options):
+        project = Project.objects.order_by('id').first()
+        if project is None:
+            raise CommandError('No projects found, create one (e.g. with create_demo_data.py) first')
+        urls = {
+            'creator_list': reverse('creator_list'),
+            'kol_list': reverse('kol_list', args=[project.id]),
+            'data_tracking_list': reverse('data_tracking_list', args=[project.id]),
+        }
+
+        original = dict(connection.settings_dict)
+        try:
+            for mode in options['modes'].split(','):
+                self.configure(mode)
+                for name, url in urls.items():
+                    latencies = self.measure(url, options['requests'])
+                    self.stdout.write(
+                        f'{name:<20} {mode:<10} mean {statistics.mean(latencies) * 1000:6.2f} ms  '
+                        f'p50 {statistics.median(latencies) * 1000:6.2f} ms  '
+                        f'p95 {statistics.quantiles(latencies, n=20)[18] * 1000:6.2f} ms'
+                    )
+        finally:
+            connection.close()
+            connection.settings_dict.update(original)
+
+    def configure(self, mode):
+        connection.close()
+        if mode == 'pool':
+            if settings.DB_CONN_MODE != 'pool':
+                raise CommandError('Run with DB_CONN_MODE=pool to benchmark the pool')
+            return
+        if mode not in RUNTIME_MODES:
+            raise CommandError(f'Unknown mode {mode!r}')
+        if settings.DB_CONN_MODE == 'pool':
+            raise CommandError('Only the pool mode can be benchmarked with DB_CONN_MODE=pool')
+        connection.settings_dict['CONN_MAX_AGE'], connection.settings_dict['CONN_HEALTH_CHECKS'] = RUNTIME_MODES[mode]
+
+    def measure(self, url, total):
+        """Drive the real WSGI handler: unlike the test Client it closes or keeps
+        connections on request_started/finished exactly as a WSGI server would."""
+        handler, factory = WSGIHandler(), RequestFactory()
+
+        def request():
+            response = handler(factory.get(url).environ, lambda status, headers: None)
+            response.close()
+
+        request()  # warm up URL resolving, imports and the first connection
+        latencies = []
+        for _ in range(total):
+            start = time.perf_counter()
+            request()
+            latencies.append(time.perf_counter() - start)
+        return latencies
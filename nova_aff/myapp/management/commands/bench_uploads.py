@@ -0,0 +1,97 @@
+import io
+import os
+import shutil
+import tempfile
+import tracemalloc
+from contextlib import redirect_stdout
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import RequestFactory, override_settings
+from django.utils import timezone
+from myapp.models import Project
+from myapp.serializers import TrackingNumberSerializer
+from myapp.views import TrackingNumberListView
+from rest_framework import status
+from rest_framework.response import Response
+
+
+class Rollback(Exception):
+    pass
+
+
+class CopyingTrackingNumberView(TrackingNumberListView):
+    """The create view as it was before upload_data(): copy the QueryDict, reassign the file, print"""
+
+    def post(self, request, project_id):
+        project = Project.objects.get(id=project_id)
+        data = request.data.copy()
+        print("Request data:", request.data)
+        print("Request FILES:", request.FILES)
+        if 'video_file' in request.FILES:
+            data['video_file'] = request.FILES['video_file']
+            print("Video file found:", request.FILES['video_file'])
+        print("Final data to save:", data)
+        serializer = TrackingNumberSerializer(data=data)
+        if serializer.is_valid():
+            serializer.save(project=project)
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class Command(BaseCommand):
+    help = ('Measure server-side peak allocation of multipart video uploads per file size, '
+            'with the old copying create view as a baseline')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='1,2,20,100', help='Comma separated upload sizes in MB')
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options['sizes'].split(',')]
+        media_root = tempfile.mkdtemp()
+        try:
+            with override_settings(MEDIA_ROOT=media_root), transaction.atomic():
+                self.run(sizes)
+                raise Rollback
+        except Rollback:
+            pass
+        finally:
+            shutil.rmtree(media_root, ignore_errors=True)
+
+    def run(self, sizes):
+        user = User.objects.create_user(username='bench_upload_user')
+        project = Project.objects.create(name='bench', project_id='bench_uploads',
+                                         created_date=timezone.now().date(), created_by=user)
+        paths = [
+            ('copy (before)', CopyingTrackingNumberView.as_view()),
+            ('pass-through', TrackingNumberListView.as_view()),
+        ]
+
+        for size_mb in sizes:
+            payload = os.urandom(size_mb * 1024 * 1024)
+            for label, view in paths:
+                outcome, peak = self.measure(view, project, payload)
+                self.stdout.write(f'{size_mb} MB upload, {label}: {outcome}, peak allocation {peak / 1024 ** 2:.1f} MB')
+
+    def measure(self, view, project, payload):
+        request = RequestFactory().post(f'/api/admin/projects/{project.id}/tracking-numbers/', {
+            'tracking_number': 'BENCH', 'phone_number': '0900000000', 'tracking_url': 'https://example.com/t',
+            'tracking_date': '01/07/2025', 'tiktok_id': 'bench',
+            'video_file': SimpleUploadedFile('bench.mp4', payload, content_type='video/mp4'),
+        })
+        # Only the view is traced; building the multipart body happens above.
+        # The baseline's prints are swallowed so they do not flood the report.
+        tracemalloc.start()
+        try:
+            with redirect_stdout(io.StringIO()):
+                response = view(request, project_id=project.id)
+            outcome = response.status_code
+        except Exception as e:
+            outcome = type(e).__name__
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        # The handler would close the uploaded files once the response is sent
+        request.close()
+        return outcome, peak
@@ -0,0 +1,65 @@
+import time
+from datetime import date
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from myapp import synthetic
+
+
+class Command(BaseCommand):
+    help = ('Generate a large deterministic synthetic dataset (creators with daily TrendData, projects with '
+            'KOLs and tracking rows) for load testing')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--creators', type=int, default=1000)
+        parser.add_argument('--days', type=int, default=365, help='Days of TrendData per creator')
+        parser.add_argument('--projects', type=int, default=5)
+        parser.add_argument('--kols-per-project', type=int, default=1000)
+        parser.add_argument('--tracking-per-project', type=int, default=10000)
+        parser.add_argument('--seed', type=int, default=0, help='Same seed, same rows')
+        parser.add_argument('--end-date', type=date.fromisoformat,
+                            help='Last TrendData day, YYYY-MM-DD (default: today)')
+        parser.add_argument('--method', choices=['auto', 'copy', 'bulk'], default='auto',
+                            help='COPY (Postgres) or bulk_create; auto picks COPY when available')
+        parser.add_argument('--batch-size', type=int, default=10000, help='Rows per COPY / bulk_create')
+        parser.add_argument('--workers', type=int, default=1,
+                            help='Processes writing creators in parallel (each holds a DB connection)')
+        parser.add_argument('--flush', action='store_true', help='Delete previously generated data first')
+
+    def handle(self, *args, **options):
+        if options['days'] < 1:
+            raise CommandError('--days must be at least 1')
+        if options['flush']:
+            synthetic.delete_generated()
+            self.stdout.write('Deleted previously generated data')
+        elif synthetic.generated_exists():
+            raise CommandError('Generated data already exists, pass --flush to replace it')
+
+        start, reported = time.perf_counter(), 0
+
+        def progress(done, total):
+            nonlocal reported
+            if done == total or done - reported >= 1000:
+                reported = done
+                self.stdout.write(f'{done}/{total} creators ({time.perf_counter() - start:.0f}s)')
+
+        try:
+            counts = synthetic.generate(
+                creators=options['creators'], days=options['days'], projects=options['projects'],
+                kols_per_project=options['kols_per_project'],
+                tracking_per_project=options['tracking_per_project'], seed=options['seed'],
+                end_date=options['end_date'], method=options['method'], batch_size=options['batch_size'],
+                workers=options['workers'], progress=progress,
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+        elapsed = time.perf_counter() - start
+
+        # Bulk writes skip the rollup signals
+        call_command('rebuild_dashboard_stats', stdout=self.stdout)
+        total = sum(counts.values())
+        for name, count in sorted(counts.items()):
+            self.stdout.write(f'{name:<22} {count:>12,}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated {total:,} rows in {elapsed:.1f}s ({total / max(elapsed, 1e-9):,.0f} rows/s)'
+        ))
@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from myapp.importers import DataTrackingImporter, ImportFormatError, read_rows
+from myapp.models import Project
+
+
+class Command(BaseCommand):
+    help = 'Bulk import (upsert by video_id) DataTracking rows for a project from a CSV or XLSX file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('project_id', type=int, help='Project primary key')
+        parser.add_argument('path', help='Path to a .csv or .xlsx export')
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        try:
+            project = Project.objects.get(id=options['project_id'])
+        except Project.DoesNotExist:
+            raise CommandError(f"Project {options['project_id']} not found")
+
+        importer = DataTrackingImporter(project, batch_size=options['batch_size'])
+        started = time.monotonic()
+        try:
+            with open(options['path'], 'rb') as fileobj:
+                header, rows = read_rows(fileobj, options['path'])
+                result = importer.run(rows, columns=header)
+        except ImportFormatError as e:
+            raise CommandError(str(e))
+        elapsed = time.monotonic() - started
+
+        for error in result['errors']:
+            self.stderr.write(f"Row {error['row']}: {error['errors']}")
+        written = result['created'] + result['updated']
+        rate = written / elapsed if elapsed else written
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {result['created']} new and {result['updated']} updated rows "
+            f"({result['error_count']} rejected) in {elapsed:.1f}s, {rate:.0f} rows/s"
+        ))
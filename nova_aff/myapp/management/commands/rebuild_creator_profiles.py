@@ -0,0 +1,47 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from myapp.models import Creator, CreatorProfileDocument
+from myapp.profiles import rebuild_stale
+
+
+class Command(BaseCommand):
+    help = 'Re-render stale creator profile documents (once, or continuously with --watch)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true',
+                            help='Flag every creator first, e.g. after enabling CREATOR_PROFILE_DOCUMENTS')
+        parser.add_argument('--watch', action='store_true', help='Keep polling for stale documents')
+        parser.add_argument('--interval', type=float, default=2.0, help='Seconds between polls with --watch')
+        parser.add_argument('--batch-size', type=int, default=100)
+
+    def handle(self, *args, **options):
+        if not settings.CREATOR_PROFILE_DOCUMENTS:
+            self.stdout.write(self.style.WARNING(
+                'CREATOR_PROFILE_DOCUMENTS is off; documents are only flagged stale, not rebuilt'
+            ))
+            return
+
+        if options['all']:
+            CreatorProfileDocument.objects.bulk_create(
+                [CreatorProfileDocument(creator_id=creator_id)
+                 for creator_id in Creator.objects.values_list('id', flat=True).iterator()],
+                batch_size=1000,
+                ignore_conflicts=True,
+            )
+            CreatorProfileDocument.objects.update(stale=True)
+
+        total = 0
+        while True:
+            rebuilt = rebuild_stale(options['batch_size'])
+            total += rebuilt
+            if rebuilt:
+                continue
+            if not options['watch']:
+                break
+            close_old_connections()
+            time.sleep(options['interval'])
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {total} creator profile documents'))
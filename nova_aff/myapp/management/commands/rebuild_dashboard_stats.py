@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Sum
+from django.db.models.functions import TruncDate
+from myapp.models import BrandDashboardStats, DataTracking, TrendData
+
+
+class Command(BaseCommand):
+    help = 'Recompute BrandDashboardStats from DataTracking and TrendData (one-off backfill or repair)'
+
+    def handle(self, *args, **options):
+        stats = {}
+
+        clicks = (
+            DataTracking.objects.order_by()
+            .annotate(day=TruncDate('created_at'))
+            .values('day')
+            .annotate(total=Sum('product_entries'))
+        )
+        for row in clicks:
+            stats.setdefault(row['day'], BrandDashboardStats(date=row['day'])).clicks_today = row['total'] or 0
+
+        trends = (
+            TrendData.objects.order_by()
+            .values('date')
+            .annotate(orders=Sum('products_sold'), revenue=Sum('gmv'))
+        )
+        for row in trends:
+            day_stats = stats.setdefault(row['date'], BrandDashboardStats(date=row['date']))
+            day_stats.orders_today = row['orders'] or 0
+            day_stats.revenue_today = row['revenue'] or 0
+
+        with transaction.atomic():
+            BrandDashboardStats.objects.exclude(date__in=stats.keys()).delete()
+            BrandDashboardStats.objects.bulk_create(
+                stats.values(),
+                batch_size=1000,
+                update_conflicts=True,
+                unique_fields=['date'],
+                update_fields=['clicks_today', 'orders_today', 'revenue_today', 'updated_at'],
+            )
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt dashboard stats for {len(stats)} days'))
@@ -0,0 +1,376 @@
+"""Request metrics in the Prometheus text format.
+
+MetricsMiddleware records, per Django URL name, request counts, a latency
+histogram and the number/time of DB queries, plus an in-flight gauge; the
+response cache reports its hits and misses here too. MetricsView renders
+them for a Prometheus scrape.
+
+Hot-path updates are lock-free: every thread writes to its own shard and
+the shards are only summed when metrics are collected. Shards of threads
+that exited are folded into one retired total, so thread-per-request
+servers do not grow the shard list. Under gunicorn set
+METRICS_MULTIPROC_DIR to a directory shared by the workers: each worker
+writes its totals there (at most every METRICS_FLUSH_INTERVAL seconds) and
+a scrape served by any worker merges the files of all of them. Files are
+keyed by pid and process start time, so a worker that reuses a dead one's
+pid does not overwrite its totals. A scrape folds the counters of workers
+that exited into one metrics_dead.json and removes their files, so totals
+never go backwards and the directory does not grow; their in-flight gauges
+are dropped.
+"""
+import fcntl
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from django.conf import settings
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRIC_HELP = {
+    'nova_http_requests_total': ('counter', 'Requests handled, by URL name, method and status'),
+    'nova_http_request_duration_seconds': ('histogram', 'Request latency by URL name'),
+    'nova_http_requests_in_flight': ('gauge', 'Requests being handled right now'),
+    'nova_db_queries_total': ('counter', 'SQL queries run while handling requests, by URL name'),
+    'nova_db_query_seconds_total': ('counter', 'Time spent in SQL queries, by URL name'),
+    'nova_cache_requests_total': ('counter', 'Analytics response cache lookups, by endpoint and result'),
+}
+
+_shards = []
+_shards_lock = threading.Lock()
+_local = threading.local()
+
+
+class Shard:
+    """One thread's metric values; only that thread writes to it"""
+
+    def __init__(self, thread=None):
+        self.thread = thread
+        self.counters = {}
+        self.gauges = {}
+        self.histograms = {}
+
+
+# Values of threads that exited; thread-per-request servers would otherwise
+# leave a shard behind per request
+_retired = Shard()
+
+
+def _shard():
+    shard = getattr(_local, 'shard', None)
+    if shard is None:
+        shard = _local.shard = Shard(threading.current_thread())
+        with _shards_lock:
+            _retire_dead_shards()
+            _shards.append(shard)
+    return shard
+
+
+def _retire_dead_shards():
+    """Fold the shards of exited threads into _retired; call with _shards_lock held"""
+    live = []
+    for shard in _shards:
+        if shard.thread.is_alive():
+            live.append(shard)
+        else:
+            # The thread is gone, so nothing writes to this shard any more
+            _merge(_retired, shard)
+    _shards[:] = live
+
+
+def _merge(totals, shard):
+    """Add `shard`'s values into `totals` (a Shard)"""
+    # dict.copy() runs without releasing the GIL, so it never sees a half-applied update
+    for kind in ('counters', 'gauges'):
+        merged = getattr(totals, kind)
+        for key, value in getattr(shard, kind).copy().items():
+            merged[key] = merged.get(key, 0) + value
+    merged = totals.histograms
+    for key, values in shard.histograms.copy().items():
+        current = merged.setdefault(key, [0] * len(values))
+        for index, value in enumerate(list(values)):
+            current[index] += value
+
+
+def inc(name, labels=(), amount=1):
+    counters = _shard().counters
+    key = (name, labels)
+    counters[key] = counters.get(key, 0) + amount
+
+
+def add_gauge(name, amount, labels=()):
+    gauges = _shard().gauges
+    key = (name, labels)
+    gauges[key] = gauges.get(key, 0) + amount
+
+
+def observe(name, value, labels=()):
+    histograms = _shard().histograms
+    key = (name, labels)
+    values = histograms.get(key)
+    if values is None:
+        # One slot per bucket, then +Inf, sum
+        values = histograms[key] = [0] * (len(LATENCY_BUCKETS) + 2)
+    for index, bound in enumerate(LATENCY_BUCKETS):
+        if value <= bound:
+            values[index] += 1
+            break
+    else:
+        values[len(LATENCY_BUCKETS)] += 1
+    values[-1] += value
+
+
+def snapshot():
+    """This process's totals as {'counters': ..., 'gauges': ..., 'histograms': ...}"""
+    totals = Shard()
+    with _shards_lock:
+        _retire_dead_shards()
+        _merge(totals, _retired)
+        shards = list(_shards)
+    for shard in shards:
+        _merge(totals, shard)
+    return {'counters': totals.counters, 'gauges': totals.gauges, 'histograms': totals.histograms}
+
+
+def reset():
+    with _shards_lock:
+        for shard in [_retired, *_shards]:
+            shard.counters.clear()
+            shard.gauges.clear()
+            shard.histograms.clear()
+
+
+# Multiprocess (gunicorn) support
+
+_last_flush = 0.0
+_flush_lock = threading.Lock()
+
+
+DEAD_FILE = 'metrics_dead.json'
+_process = None
+
+
+def process_start(pid):
+    """Start time of process `pid` (clock ticks since boot) from /proc, None where unavailable"""
+    try:
+        with open(f'/proc/{pid}/stat') as fileobj:
+            stat = fileobj.read()
+    except OSError:
+        return None
+    # The command name (field 2) may contain spaces; count from after it
+    return stat.rsplit(')', 1)[1].split()[19]
+
+
+def process_key():
+    """pid_starttime of this process; a random token stands in for the start time without /proc"""
+    global _process
+    pid = os.getpid()
+    # Recomputed after a fork, which keeps the module state but not the pid
+    if _process is None or _process[0] != pid:
+        _process = (pid, f'{pid}_{process_start(pid) or "u" + uuid.uuid4().hex}')
+    return _process[1]
+
+
+def process_alive(key):
+    pid, start = key.split('_', 1)
+    if not pid_alive(int(pid)):
+        return False
+    # Same pid, different start time: the pid was reused by a new process
+    return start.startswith('u') or process_start(int(pid)) in (None, start)
+
+
+def process_file(directory, key):
+    return os.path.join(directory, f'metrics_{key}.json')
+
+
+def process_files(directory):
+    """(key, path) of every worker file in `directory`"""
+    for filename in os.listdir(directory):
+        if filename == DEAD_FILE or not (filename.startswith('metrics_') and filename.endswith('.json')):
+            continue
+        yield filename[len('metrics_'):-len('.json')], os.path.join(directory, filename)
+
+
+def encode(totals):
+    return {
+        kind: [[name, list(labels), value] for (name, labels), value in values.items()]
+        for kind, values in totals.items()
+    }
+
+
+def decode(data):
+    return {
+        kind: {(name, tuple(tuple(label) for label in labels)): value for name, labels, value in values}
+        for kind, values in data.items()
+    }
+
+
+def read_totals(path):
+    """Decoded totals stored at `path`, None if it is missing or unreadable"""
+    try:
+        with open(path) as fileobj:
+            return decode(json.load(fileobj))
+    except (OSError, ValueError):
+        return None
+
+
+def write_totals(path, totals):
+    temporary = f'{path}.tmp'
+    with open(temporary, 'w') as fileobj:
+        json.dump(encode(totals), fileobj)
+    os.replace(temporary, path)
+
+
+def add_totals(totals, data, gauges=True):
+    """Add decoded `data` into `totals`; gauges only when `gauges`"""
+    for kind in ('counters', 'histograms', 'gauges') if gauges else ('counters', 'histograms'):
+        merged = totals[kind]
+        for key, value in data[kind].items():
+            if kind == 'histograms':
+                current = merged.setdefault(key, [0] * len(value))
+                for index, item in enumerate(value):
+                    current[index] += item
+            else:
+                merged[key] = merged.get(key, 0) + value
+
+
+@contextmanager
+def directory_lock(directory):
+    """Serialize scrapes across workers, so exited workers are folded in exactly once"""
+    with open(os.path.join(directory, 'metrics.lock'), 'a') as fileobj:
+        fcntl.flock(fileobj, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fileobj, fcntl.LOCK_UN)
+
+
+def flush(force=False):
+    """Write this process's totals to METRICS_MULTIPROC_DIR (rate limited)"""
+    global _last_flush
+    directory = settings.METRICS_MULTIPROC_DIR
+    if not directory:
+        return
+    now = time.monotonic()
+    if not force and now - _last_flush < settings.METRICS_FLUSH_INTERVAL:
+        return
+    if not _flush_lock.acquire(blocking=force):
+        return
+    try:
+        _last_flush = now
+        write_totals(process_file(directory, process_key()), snapshot())
+    finally:
+        _flush_lock.release()
+
+
+def pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def retire_exited(directory):
+    """Fold the counters of exited workers into DEAD_FILE and remove their files; call with directory_lock held"""
+    dead_path = os.path.join(directory, DEAD_FILE)
+    dead = read_totals(dead_path) or {'counters': {}, 'gauges': {}, 'histograms': {}}
+    retired = []
+    for key, path in process_files(directory):
+        if process_alive(key):
+            continue
+        data = read_totals(path)
+        if data is not None:
+            add_totals(dead, data, gauges=False)
+        retired.append(path)
+    if not retired:
+        return
+    write_totals(dead_path, dead)
+    for path in retired:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def collect():
+    """Totals of every process (or just this one without METRICS_MULTIPROC_DIR)"""
+    directory = settings.METRICS_MULTIPROC_DIR
+    if not directory:
+        return snapshot()
+    flush(force=True)
+    totals = {'counters': {}, 'gauges': {}, 'histograms': {}}
+    with directory_lock(directory):
+        retire_exited(directory)
+        dead = read_totals(os.path.join(directory, DEAD_FILE))
+        if dead is not None:
+            add_totals(totals, dead, gauges=False)
+        for key, path in process_files(directory):
+            data = read_totals(path)
+            if data is not None:
+                add_totals(totals, data)
+    return totals
+
+
+# Text exposition
+
+def format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (
+        (key, str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n'))
+        for key, value in pairs
+    )
+    return '{' + ','.join(f'{key}="{value}"' for key, value in escaped) + '}'
+
+
+def format_number(value):
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+
+def render(totals):
+    by_name = {}
+    for kind in ('counters', 'gauges', 'histograms'):
+        for (name, labels), value in totals[kind].items():
+            by_name.setdefault(name, []).append((labels, value))
+
+    lines = []
+    for name in sorted(by_name):
+        metric_type, help_text = METRIC_HELP.get(name, ('untyped', name))
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {metric_type}')
+        for labels, value in sorted(by_name[name]):
+            if metric_type != 'histogram':
+                lines.append(f'{name}{format_labels(labels)} {format_number(value)}')
+                continue
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, value):
+                cumulative += count
+                lines.append(f'{name}_bucket{format_labels(labels, [("le", bound)])} {cumulative}')
+            cumulative += value[len(LATENCY_BUCKETS)]
+            lines.append(f'{name}_bucket{format_labels(labels, [("le", "+Inf")])} {cumulative}')
+            lines.append(f'{name}_sum{format_labels(labels)} {format_number(value[-1])}')
+            lines.append(f'{name}_count{format_labels(labels)} {cumulative}')
+
+    # Convenience ratio so dashboards need no PromQL
+    cache = {}
+    for (name, labels), value in totals['counters'].items():
+        if name == 'nova_cache_requests_total':
+            labels = dict(labels)
+            cache.setdefault(labels['endpoint'], {})[labels['result']] = value
+    if cache:
+        lines.append('# HELP nova_cache_hit_ratio Analytics response cache hit ratio by endpoint')
+        lines.append('# TYPE nova_cache_hit_ratio gauge')
+        for endpoint in sorted(cache):
+            hits, misses = cache[endpoint].get('hit', 0), cache[endpoint].get('miss', 0)
+            ratio = hits / (hits + misses) if hits + misses else 0.0
+            lines.append(f'nova_cache_hit_ratio{format_labels([("endpoint", endpoint)])} {ratio!r}')
+    return '\n'.join(lines) + '\n'
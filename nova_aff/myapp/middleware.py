@@ -0,0 +1,152 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from . import metrics, profiling
+from .routers import request_routing
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+REPLICA_PIN_COOKIE = 'db_primary_pin'
+
+
+class ReplicaRoutingMiddleware:
+    """Open the read-replica routing context for each request.
+
+    A request that writes gets a cookie keeping the client's next requests on
+    the primary for DB_REPLICA_PIN_SECONDS, so it reads its own writes.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with request_routing(**self.routing_options(request)) as state:
+            response = self.get_response(request)
+        return self.process_response(state, response)
+
+    async def __acall__(self, request):
+        with request_routing(**self.routing_options(request)) as state:
+            response = await self.get_response(request)
+        return self.process_response(state, response)
+
+    def routing_options(self, request):
+        return {
+            'safe': request.method in SAFE_METHODS,
+            'pinned': REPLICA_PIN_COOKIE in request.COOKIES,
+        }
+
+    def process_response(self, state, response):
+        if state.wrote and settings.DATABASE_REPLICAS:
+            response.set_cookie(REPLICA_PIN_COOKIE, '1', max_age=settings.DB_REPLICA_PIN_SECONDS,
+                                httponly=True, samesite='Lax')
+        return response
+
+
+class QueryProfilerMiddleware:
+    """Report query count, DB/serializer time and response size per request.
+
+    Adds a Server-Timing header and feeds profiling.stats; only loaded when
+    QUERY_PROFILER is on. Place it first so its total covers the whole stack.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.QUERY_PROFILER:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        profile, token = profiling.start_profile()
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiling.finish_profile(token)
+        return self.process_response(request, response, profile, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        profile, token = profiling.start_profile()
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            profiling.finish_profile(token)
+        return self.process_response(request, response, profile, time.perf_counter() - start)
+
+    def process_response(self, request, response, profile, total_time):
+        match = request.resolver_match
+        name = match.url_name if match and match.url_name else '<unresolved>'
+        response_bytes = None if response.streaming else len(response.content)
+        profiling.stats.record(name, profile, total_time, response_bytes)
+        profiling.check_budget(name, profile, request.path)
+        response['Server-Timing'] = profiling.server_timing(profile, total_time, response_bytes)
+        return response
+
+
+class MetricsMiddleware:
+    """Record per-URL-name request metrics for MetricsView.
+
+    Counts requests and their queries, observes latency and tracks requests
+    in flight; only loaded when METRICS_ENABLED is on. Place it first so its
+    latency covers the whole stack.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics.add_gauge('nova_http_requests_in_flight', 1)
+        profile, token = profiling.start_profile()
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiling.finish_profile(token)
+            metrics.add_gauge('nova_http_requests_in_flight', -1)
+        self.record(request, response, profile, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request):
+        metrics.add_gauge('nova_http_requests_in_flight', 1)
+        profile, token = profiling.start_profile()
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            profiling.finish_profile(token)
+            metrics.add_gauge('nova_http_requests_in_flight', -1)
+        self.record(request, response, profile, time.perf_counter() - start)
+        return response
+
+    def record(self, request, response, profile, total_time):
+        match = request.resolver_match
+        # Never label by path: ids in URLs would make the series unbounded
+        name = match.url_name if match and match.url_name else '<unresolved>'
+        labels = (('url_name', name),)
+        metrics.inc('nova_http_requests_total',
+                    (('url_name', name), ('method', request.method), ('status', str(response.status_code))))
+        metrics.observe('nova_http_request_duration_seconds', total_time, labels)
+        metrics.inc('nova_db_queries_total', labels, profile.queries)
+        metrics.inc('nova_db_query_seconds_total', labels, profile.db_time)
+        metrics.flush()
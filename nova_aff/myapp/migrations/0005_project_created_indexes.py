@@ -0,0 +1,25 @@
+# Generated by Django 5.2.3 on 2026-10-17 07:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0004_branddashboardstats_creator_creatoranalytics_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='datatracking',
+            index=models.Index(fields=['project', 'created_at', 'id'], name='dt_proj_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='kol',
+            index=models.Index(fields=['project', 'created_at', 'id'], name='kol_proj_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='trackingnumber',
+            index=models.Index(fields=['project', 'created_at', 'id'], name='tn_proj_created_idx'),
+        ),
+    ]
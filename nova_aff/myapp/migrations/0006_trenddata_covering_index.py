@@ -0,0 +1,23 @@
+# Generated by Django 5.2.3 on 2026-10-17 07:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0005_project_created_indexes'),
+    ]
+
+    operations = [
+        # The unique index also covers the metrics, so range aggregations are
+        # index-only scans on Postgres
+        migrations.AlterUniqueTogether(
+            name='trenddata',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='trenddata',
+            constraint=models.UniqueConstraint(fields=('creator', 'date'), include=('gmv', 'products_sold', 'followers_gained', 'video_views', 'engagement_rate'), name='trend_creator_date_uniq'),
+        ),
+    ]
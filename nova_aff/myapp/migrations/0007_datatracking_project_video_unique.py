@@ -0,0 +1,53 @@
+# Generated by Django 5.2.3 on 2026-10-17 07:40
+
+import datetime
+
+from django.db import migrations, models
+from django.db.models import F, Max, Sum
+from django.db.models.functions import TruncDate
+
+
+def remove_duplicate_videos(apps, schema_editor):
+    """Keep the newest row for each (project, video_id) so the constraint can be added.
+
+    Historical models send no signals the rollup receivers listen to, so the
+    deleted rows' clicks are taken off BrandDashboardStats here, by the same
+    created_at (UTC) day the receivers use.
+    """
+    DataTracking = apps.get_model('myapp', 'DataTracking')
+    BrandDashboardStats = apps.get_model('myapp', 'BrandDashboardStats')
+    newest = (
+        DataTracking.objects.order_by()
+        .values('project_id', 'video_id')
+        .annotate(keep_id=Max('id'))
+        .values('keep_id')
+    )
+    duplicates = DataTracking.objects.exclude(id__in=newest)
+    removed_clicks = (
+        duplicates.order_by()
+        .annotate(day=TruncDate('created_at', tzinfo=datetime.timezone.utc))
+        .values('day')
+        .annotate(clicks=Sum('product_entries'))
+    )
+    for row in removed_clicks:
+        if row['clicks']:
+            BrandDashboardStats.objects.filter(date=row['day']).update(
+                clicks_today=F('clicks_today') - row['clicks']
+            )
+    # One set-based DELETE instead of a query per duplicate group
+    duplicates.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0006_trenddata_covering_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_videos, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='datatracking',
+            constraint=models.UniqueConstraint(fields=('project', 'video_id'), name='dt_project_video_uniq'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """Add typed shadow columns next to the KOL text columns; 0010 fills them"""
+
+    dependencies = [
+        ('myapp', '0008_chunkedupload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='kol',
+            name='followers_value',
+            field=models.BigIntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='kol',
+            name='gmv_value',
+            field=models.DecimalField(decimal_places=2, max_digits=18, null=True),
+        ),
+        migrations.AddField(
+            model_name='kol',
+            name='number_tracking_value',
+            field=models.IntegerField(null=True),
+        ),
+    ]
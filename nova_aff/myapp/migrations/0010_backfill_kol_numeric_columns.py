@@ -0,0 +1,131 @@
+import re
+import unicodedata
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+from django.db import migrations
+
+BATCH_SIZE = 2000
+
+MAX_BIGINT = 2 ** 63 - 1
+MAX_INT = 2 ** 31 - 1
+MAX_GMV = Decimal('9999999999999999.99')
+
+
+# Frozen copy of myapp.numbers as of this migration, so later changes to the
+# app's parser do not change what the backfill produced
+
+SUFFIX_MULTIPLIERS = {
+    '': 1,
+    'k': 1_000,
+    'n': 1_000,
+    'ngan': 1_000,
+    'nghin': 1_000,
+    'm': 1_000_000,
+    'tr': 1_000_000,
+    'trieu': 1_000_000,
+    'b': 1_000_000_000,
+    'ty': 1_000_000_000,
+}
+
+CURRENCY_MARKERS = ('vnd', '₫', 'd')
+
+NUMBER_RE = re.compile(r'^(?P<number>[0-9][0-9.,]*)\s*(?P<suffix>[a-z]*)$')
+GROUPED_RE = re.compile(r'^\d{1,3}([.,])\d{3}(\1\d{3})*$')
+
+
+def fold(text):
+    text = unicodedata.normalize('NFKD', text.lower().replace('đ', 'd'))
+    return ''.join(char for char in text if not unicodedata.combining(char))
+
+
+def parse_abbreviated_number(value):
+    text = fold(str(value)).replace(' ', '')
+    for marker in CURRENCY_MARKERS:
+        if text.endswith(marker) and text[:-len(marker)][-1:].isdigit():
+            text = text[:-len(marker)]
+            break
+    match = NUMBER_RE.match(text)
+    if not match or match.group('suffix') not in SUFFIX_MULTIPLIERS:
+        raise ValueError(f'Cannot parse number: {value!r}')
+
+    number, suffix = match.group('number'), match.group('suffix')
+    if GROUPED_RE.match(number) and not (suffix and number.count(number[-4]) == 1):
+        number = number.replace('.', '').replace(',', '')
+    elif '.' in number and ',' in number:
+        decimal_sep = '.' if number.rfind('.') > number.rfind(',') else ','
+        thousands_sep = ',' if decimal_sep == '.' else '.'
+        number = number.replace(thousands_sep, '').replace(decimal_sep, '.')
+    else:
+        number = number.replace(',', '.')
+
+    try:
+        return Decimal(number) * SUFFIX_MULTIPLIERS[suffix]
+    except InvalidOperation:
+        raise ValueError(f'Cannot parse number: {value!r}')
+
+
+def parse(value, maximum, places=Decimal('1')):
+    """Parsed and clamped value, 0 for blank text; raises ValueError when the text is not a number"""
+    if not str(value).strip():
+        return 0
+    number = parse_abbreviated_number(value)
+    return max(min(number.quantize(places, rounding=ROUND_HALF_UP), maximum), 0)
+
+
+def backfill(apps, schema_editor):
+    """Fill the typed columns in id-ordered batches.
+
+    The migration is non-atomic so every batch commits on its own; rows that
+    were already converted are skipped, so an interrupted run can be resumed
+    simply by running migrate again.
+
+    Rows with text that does not parse are left unconverted and the migration
+    fails listing them, since 0011 drops the text columns: fix the values and
+    run migrate again.
+    """
+    KOL = apps.get_model('myapp', 'KOL')
+    pending = KOL.objects.filter(followers_value__isnull=True).order_by('id')
+    failed = []
+    last_id = 0
+    while True:
+        batch = list(
+            pending.filter(id__gt=last_id).only('id', 'followers', 'gmv', 'number_tracking')[:BATCH_SIZE]
+        )
+        if not batch:
+            break
+        converted = []
+        for kol in batch:
+            try:
+                followers = int(parse(kol.followers, MAX_BIGINT))
+                gmv = parse(kol.gmv, MAX_GMV, Decimal('0.01'))
+                number_tracking = int(parse(kol.number_tracking, MAX_INT))
+            except ValueError:
+                failed.append(kol)
+                continue
+            kol.followers_value, kol.gmv_value, kol.number_tracking_value = followers, gmv, number_tracking
+            converted.append(kol)
+        KOL.objects.bulk_update(converted, ['followers_value', 'gmv_value', 'number_tracking_value'])
+        last_id = batch[-1].id
+
+    if failed:
+        rows = '\n'.join(
+            f'  id={kol.id}: followers={kol.followers!r}, gmv={kol.gmv!r}, number_tracking={kol.number_tracking!r}'
+            for kol in failed[:50]
+        )
+        more = f'\n  ... and {len(failed) - 50} more' if len(failed) > 50 else ''
+        raise RuntimeError(
+            f'{len(failed)} KOL rows have followers / gmv / number_tracking text that is not a number; '
+            f'fix them and run migrate again:\n{rows}{more}'
+        )
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('myapp', '0009_kol_numeric_columns'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """Replace the KOL text columns with the typed columns filled by 0010"""
+
+    dependencies = [
+        ('myapp', '0010_backfill_kol_numeric_columns'),
+    ]
+
+    operations = [
+        migrations.RemoveField(model_name='kol', name='followers'),
+        migrations.RemoveField(model_name='kol', name='gmv'),
+        migrations.RemoveField(model_name='kol', name='number_tracking'),
+        migrations.RenameField(model_name='kol', old_name='followers_value', new_name='followers'),
+        migrations.RenameField(model_name='kol', old_name='gmv_value', new_name='gmv'),
+        migrations.RenameField(model_name='kol', old_name='number_tracking_value', new_name='number_tracking'),
+        migrations.AlterField(
+            model_name='kol',
+            name='followers',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='kol',
+            name='gmv',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=18),
+        ),
+        migrations.AlterField(
+            model_name='kol',
+            name='number_tracking',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='kol',
+            index=models.Index(fields=['project', '-followers', '-id'], name='kol_proj_followers_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='kol',
+            index=models.Index(fields=['project', '-gmv', '-id'], name='kol_proj_gmv_id_idx'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.3 on 2026-10-17 08:07
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0011_kol_swap_numeric_columns'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name='kol',
+            index=models.Index(fields=['project', 'brand_approval', 'created_at'], name='kol_proj_approval_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='kol',
+            index=models.Index(fields=['project', 'submitted_on'], name='kol_proj_submitted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='kol',
+            index=models.Index(fields=['project', 'kol_koc_approval_time'], name='kol_proj_approved_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='kol',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('full_name'), name='gin_trgm_ops'), name='kol_full_name_trgm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='kol',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('tiktok_id'), name='gin_trgm_ops'), name='kol_tiktok_id_trgm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='kol',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('email'), name='gin_trgm_ops'), name='kol_email_trgm_idx'),
+        ),
+    ]
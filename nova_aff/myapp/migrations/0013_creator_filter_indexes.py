@@ -0,0 +1,22 @@
+# Generated by Django 5.2.3 on 2026-10-17 08:07
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0012_kol_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='creator',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['categories'], name='creator_categories_gin', opclasses=['jsonb_path_ops']),
+        ),
+        migrations.AddIndex(
+            model_name='creator',
+            index=models.Index(fields=['gender', '-followers_count'], name='creator_gender_followers_idx'),
+        ),
+    ]
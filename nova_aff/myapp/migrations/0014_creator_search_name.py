@@ -0,0 +1,50 @@
+# Generated by Django 5.2.3 on 2026-10-17 08:10
+
+import unicodedata
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+BATCH_SIZE = 2000
+
+
+def fold(text):
+    """Frozen copy of the app's accent folding as of this migration"""
+    text = unicodedata.normalize('NFKD', text.lower().replace('đ', 'd'))
+    return ''.join(char for char in text if not unicodedata.combining(char))
+
+
+def fill_search_name(apps, schema_editor):
+    """Fill search_name in id-ordered batches (mirrors Creator.build_search_name)"""
+    Creator = apps.get_model('myapp', 'Creator')
+    last_id = 0
+    while True:
+        batch = list(
+            Creator.objects.filter(id__gt=last_id).order_by('id').only('id', 'display_name', 'username')[:BATCH_SIZE]
+        )
+        if not batch:
+            break
+        for creator in batch:
+            creator.search_name = f'{fold(creator.display_name)} {creator.username.lower()}'
+        Creator.objects.bulk_update(batch, ['search_name'])
+        last_id = batch[-1].id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0013_creator_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='creator',
+            name='search_name',
+            field=models.CharField(blank=True, default='', editable=False, max_length=400),
+        ),
+        migrations.RunPython(fill_search_name, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='creator',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_name'], name='creator_search_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.3 on 2026-10-17 08:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0014_creator_search_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CreatorProfileDocument',
+            fields=[
+                ('creator', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='profile_document', serialize=False, to='myapp.creator')),
+                ('content', models.BinaryField(default=b'')),
+                ('stale', models.BooleanField(default=True)),
+                ('version', models.BigIntegerField(default=0)),
+                ('built_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('stale', True)), fields=['creator'], name='profile_doc_stale_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.3 on 2026-10-17 08:40
+
+from django.db import migrations
+
+BATCH_SIZE = 2000
+
+
+def create_missing_profiles(apps, schema_editor):
+    """Profiles used to be created on a user's next save; give every user one now"""
+    User = apps.get_model('auth', 'User')
+    UserProfile = apps.get_model('myapp', 'UserProfile')
+    user_ids = User.objects.filter(profile__isnull=True).values_list('id', flat=True)
+    UserProfile.objects.bulk_create(
+        (UserProfile(user_id=user_id) for user_id in user_ids.iterator()), batch_size=BATCH_SIZE
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0015_creatorprofiledocument'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_missing_profiles, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,14 @@
+import uuid
+
 from django.db import models
 from django.contrib.auth.models import User
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db.models.functions import Upper
 from django.db.models.signals import post_save
 from django.dispatch import receiver
 
+from .text import fold
+
 # Create your models here.
 
 class UserProfile(models.Model):
@@ -11,9 +17,10 @@ class UserProfile(models.Model):
         ('brand', 'Brand'),
         ('creator', 'Creator'),
     ]
+    DEFAULT_ROLE = 'creator'
     
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
-    role = models.CharField(max_length=10, choices=ROLE_CHOICES, default='creator')
+    role = models.CharField(max_length=10, choices=ROLE_CHOICES, default=DEFAULT_ROLE)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -25,17 +32,17 @@ class UserProfile(models.Model):
 
 
 @receiver(post_save, sender=User)
-def create_user_profile(sender, instance, created, **kwargs):
-    if created:
-        UserProfile.objects.create(user=instance)
-
-
-@receiver(post_save, sender=User)
-def save_user_profile(sender, instance, **kwargs):
-    if hasattr(instance, 'profile'):
-        instance.profile.save()
-    else:
-        UserProfile.objects.create(user=instance)
+def create_user_profile(sender, instance, created, raw=False, **kwargs):
+    """Insert a new user's profile, with the role set on `instance.profile_role` if any.
+
+    Later saves of the user (last_login updates, admin edits) leave the
+    profile alone; change the role by saving the profile itself.
+    """
+    if created and not raw:
+        # Assigning caches it, so reading user.profile afterwards costs no query
+        instance.profile = UserProfile.objects.create(
+            user=instance, role=getattr(instance, 'profile_role', UserProfile.DEFAULT_ROLE)
+        )
 
 class Project(models.Model):
     name = models.CharField(max_length=255)
@@ -61,15 +68,15 @@ class KOL(models.Model):
     zalo = models.CharField(max_length=20)
     tiktok_url = models.URLField()
     tiktok_id = models.CharField(max_length=100)
-    followers = models.CharField(max_length=20)
-    gmv = models.CharField(max_length=20)
+    followers = models.BigIntegerField(default=0)
+    gmv = models.DecimalField(max_digits=18, decimal_places=2, default=0)
     channel_identifier = models.CharField(max_length=100)
     appropriate_channel_topic = models.CharField(max_length=255)
     shipping_address = models.TextField()
     brand_approval = models.CharField(max_length=100)
     note = models.TextField()
     kol_koc_approval_time = models.DateField()
-    number_tracking = models.CharField(max_length=20)
+    number_tracking = models.IntegerField(default=0)
     koc_confirmed_by_nova = models.CharField(max_length=100)
     video_file = models.FileField(upload_to='videos/kols/', null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -80,6 +87,19 @@ class KOL(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['project', 'created_at', 'id'], name='kol_proj_created_idx'),
+            # KeysetPagination breaks ties on id in the same direction as the ordering
+            models.Index(fields=['project', '-followers', '-id'], name='kol_proj_followers_id_idx'),
+            models.Index(fields=['project', '-gmv', '-id'], name='kol_proj_gmv_id_idx'),
+            models.Index(fields=['project', 'brand_approval', 'created_at'], name='kol_proj_approval_idx'),
+            models.Index(fields=['project', 'submitted_on'], name='kol_proj_submitted_idx'),
+            models.Index(fields=['project', 'kol_koc_approval_time'], name='kol_proj_approved_idx'),
+            # icontains compiles to UPPER(col) LIKE UPPER(%s), so index the same expression
+            GinIndex(OpClass(Upper('full_name'), name='gin_trgm_ops'), name='kol_full_name_trgm_idx'),
+            GinIndex(OpClass(Upper('tiktok_id'), name='gin_trgm_ops'), name='kol_tiktok_id_trgm_idx'),
+            GinIndex(OpClass(Upper('email'), name='gin_trgm_ops'), name='kol_email_trgm_idx'),
+        ]
 
 
 class DataTracking(models.Model):
@@ -109,6 +129,12 @@ class DataTracking(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['project', 'created_at', 'id'], name='dt_proj_created_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['project', 'video_id'], name='dt_project_video_uniq'),
+        ]
 
 
 class TrackingNumber(models.Model):
@@ -128,6 +154,40 @@ class TrackingNumber(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['project', 'created_at', 'id'], name='tn_proj_created_idx'),
+        ]
+
+
+class ChunkedUpload(models.Model):
+    """A resumable video upload that is attached to a record once complete"""
+    TARGET_CHOICES = [
+        ('kol', 'KOL'),
+        ('data_tracking', 'Data Tracking'),
+        ('tracking_number', 'Tracking Number'),
+    ]
+    
+    STATUS_CHOICES = [
+        ('uploading', 'Uploading'),
+        ('complete', 'Complete'),
+    ]
+    
+    upload_id = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='chunked_uploads')
+    target = models.CharField(max_length=20, choices=TARGET_CHOICES)
+    object_id = models.BigIntegerField()
+    filename = models.CharField(max_length=255)
+    total_size = models.BigIntegerField()
+    offset = models.BigIntegerField(default=0)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='uploading')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Upload {self.upload_id} ({self.offset}/{self.total_size})"
+
+    class Meta:
+        ordering = ['-created_at']
 
 
 # Brand Analytics Models
@@ -163,6 +223,9 @@ class Creator(models.Model):
     # Follower stats
     followers_count = models.BigIntegerField(default=0)
     
+    # Accent-folded "display name username", kept in sync by save()
+    search_name = models.CharField(max_length=400, blank=True, default='', editable=False)
+    
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -170,8 +233,25 @@ class Creator(models.Model):
     def __str__(self):
         return f"{self.display_name} (@{self.username})"
     
+    @staticmethod
+    def build_search_name(display_name, username):
+        return f'{fold(display_name)} {username.lower()}'
+    
+    def save(self, *args, **kwargs):
+        self.search_name = self.build_search_name(self.display_name, self.username)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'display_name', 'username'} & set(update_fields):
+            kwargs['update_fields'] = set(update_fields) | {'search_name'}
+        super().save(*args, **kwargs)
+    
     class Meta:
         ordering = ['-followers_count']
+        indexes = [
+            # jsonb_path_ops only supports @>, which is all categories__contains needs
+            GinIndex(fields=['categories'], opclasses=['jsonb_path_ops'], name='creator_categories_gin'),
+            models.Index(fields=['gender', '-followers_count'], name='creator_gender_followers_idx'),
+            GinIndex(fields=['search_name'], opclasses=['gin_trgm_ops'], name='creator_search_trgm_idx'),
+        ]
 
 
 class BrandDashboardStats(models.Model):
@@ -324,4 +404,30 @@ class TrendData(models.Model):
     
     class Meta:
         ordering = ['-date']
-        unique_together = ['creator', 'date']
\ No newline at end of file
+        constraints = [
+            # The unique index also covers the metrics, so range aggregations are
+            # index-only scans on Postgres
+            models.UniqueConstraint(
+                fields=['creator', 'date'],
+                include=['gmv', 'products_sold', 'followers_gained', 'video_views', 'engagement_rate'],
+                name='trend_creator_date_uniq',
+            ),
+        ]
+
+class CreatorProfileDocument(models.Model):
+    """Pre-rendered CreatorDetailView JSON, rebuilt when the creator's rows change"""
+    creator = models.OneToOneField(Creator, on_delete=models.CASCADE, primary_key=True,
+                                   related_name='profile_document')
+    content = models.BinaryField(default=b'')
+    # Set by the analytics signals; version guards a rebuild racing a newer write
+    stale = models.BooleanField(default=True)
+    version = models.BigIntegerField(default=0)
+    built_at = models.DateTimeField(null=True, blank=True)
+    
+    def __str__(self):
+        return f"Profile document for creator {self.creator_id}"
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['creator'], condition=models.Q(stale=True), name='profile_doc_stale_idx'),
+        ]
@@ -0,0 +1,62 @@
+"""Parsing of human-entered numbers such as "1.2M", "12,5K", "1.234.567" or "5tr"."""
+import re
+from decimal import Decimal, InvalidOperation
+
+from .text import fold
+
+SUFFIX_MULTIPLIERS = {
+    '': 1,
+    'k': 1_000,
+    'n': 1_000,        # nghìn
+    'ngan': 1_000,
+    'nghin': 1_000,
+    'm': 1_000_000,
+    'tr': 1_000_000,   # triệu
+    'trieu': 1_000_000,
+    'b': 1_000_000_000,
+    'ty': 1_000_000_000,
+}
+
+CURRENCY_MARKERS = ('vnd', '₫', 'd')
+
+NUMBER_RE = re.compile(r'^(?P<number>[0-9][0-9.,]*)\s*(?P<suffix>[a-z]*)$')
+GROUPED_RE = re.compile(r'^\d{1,3}([.,])\d{3}(\1\d{3})*$')
+
+
+def parse_abbreviated_number(value):
+    """Return a Decimal for strings like "1.2M"; raise ValueError if unparseable.
+
+    A lone "." or "," followed by exactly three digits (and no suffix) is read
+    as a thousands separator, as in "1.234" or "12,500"; otherwise a single
+    separator is the decimal point.
+    """
+    if isinstance(value, (int, Decimal)):
+        return Decimal(value)
+    if isinstance(value, float):
+        return Decimal(str(value))
+
+    text = fold(str(value)).replace(' ', '')
+    for marker in CURRENCY_MARKERS:
+        if text.endswith(marker) and text[:-len(marker)][-1:].isdigit():
+            text = text[:-len(marker)]
+            break
+    match = NUMBER_RE.match(text)
+    if not match or match.group('suffix') not in SUFFIX_MULTIPLIERS:
+        raise ValueError(f'Cannot parse number: {value!r}')
+
+    number, suffix = match.group('number'), match.group('suffix')
+    if GROUPED_RE.match(number) and not (suffix and number.count(number[-4]) == 1):
+        number = number.replace('.', '').replace(',', '')
+    elif '.' in number and ',' in number:
+        # The right-most separator is the decimal point: "1.234,5" / "1,234.5"
+        decimal_sep = '.' if number.rfind('.') > number.rfind(',') else ','
+        thousands_sep = ',' if decimal_sep == '.' else '.'
+        number = number.replace(thousands_sep, '').replace(decimal_sep, '.')
+    else:
+        number = number.replace(',', '.')
+
+    try:
+        result = Decimal(number) * SUFFIX_MULTIPLIERS[suffix]
+    except InvalidOperation:
+        raise ValueError(f'Cannot parse number: {value!r}')
+    return result
@@ -0,0 +1,105 @@
+import base64
+from datetime import date, datetime
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """Cursor pagination ordered by (ordering field, id), newest first by default.
+
+    The cursor encodes the ordering value and id of the last row on the page,
+    so fetching the next page is an index range scan instead of an OFFSET.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def __init__(self, ordering='-created_at'):
+        self.ordering = ordering
+        self.field_name = ordering.lstrip('-')
+        self.descending = ordering.startswith('-')
+        self.page_size = settings.API_PAGE_SIZE
+        self.max_page_size = settings.API_MAX_PAGE_SIZE
+        self.next_cursor = None
+        self.request = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        field = queryset.model._meta.get_field(self.field_name)
+        queryset = queryset.order_by(self.ordering, '-id' if self.descending else 'id')
+
+        cursor = self.decode_cursor(request, field)
+        if cursor is not None:
+            value, pk = cursor
+            before, bound = ('lt', 'lte') if self.descending else ('gt', 'gte')
+            # The redundant bound on the ordering field lets the planner turn
+            # the OR into a single range scan on (project, field, id).
+            queryset = queryset.filter(**{f'{self.field_name}__{bound}': value}).filter(
+                Q(**{f'{self.field_name}__{before}': value})
+                | Q(**{self.field_name: value, f'id__{before}': pk})
+            )
+
+        # Fetch one extra row to know whether another page exists.
+        results = list(queryset[:page_size + 1])
+        if len(results) > page_size:
+            results = results[:page_size]
+            last = results[-1]
+            self.next_cursor = self.encode_cursor(getattr(last, field.attname), last.pk)
+        return results
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def decode_cursor(self, request, field):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            decoded = base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8')
+            ordering, value, pk = decoded.rsplit('|', 2)
+            if ordering != self.ordering:
+                raise ValueError('Cursor belongs to a different ordering')
+            return field.to_python(value), int(pk)
+        except (TypeError, ValueError, UnicodeError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, value, pk):
+        if isinstance(value, (date, datetime)):
+            value = value.isoformat()
+        raw = f'{self.ordering}|{value}|{pk}'
+        return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
@@ -0,0 +1,97 @@
+"""Pre-rendered creator profile documents for CreatorDetailView.
+
+When CREATOR_PROFILE_DOCUMENTS is on, the detail payload is rendered to JSON
+once and stored in CreatorProfileDocument; requests return those bytes
+without touching the serializers. Writes to the creator or any of its
+analytics rows only flag the document stale (in the writer's transaction),
+and `manage.py rebuild_creator_profiles --watch` re-renders stale documents
+in the background. A request that finds no fresh document renders it
+itself, so a lagging worker costs latency, never correctness. Flagging
+happens with the setting off too; otherwise documents built before it was
+turned off would be served, out of date, once it is turned back on.
+
+Every flag bumps the document's version and a rebuild only lands if the
+version it started from is still current, so a rebuild that raced a newer
+write leaves the document stale instead of overwriting it with old data.
+"""
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from .models import (
+    Creator, CreatorAnalytics, VideoAnalytics, LiveAnalytics,
+    FollowerDemographics, TrendData, CreatorProfileDocument
+)
+from .routers import pin_to_primary
+from .serializers import CreatorDetailSerializer
+
+SOURCE_MODELS = [Creator, CreatorAnalytics, VideoAnalytics, LiveAnalytics, FollowerDemographics, TrendData]
+
+
+def render_document(creator_id):
+    """JSON bytes of the detail payload; raises Creator.DoesNotExist"""
+    creator = CreatorDetailSerializer.setup_eager_loading(Creator.objects.all()).get(id=creator_id)
+    return JSONRenderer().render(CreatorDetailSerializer(creator).data)
+
+
+def document_version(creator_id):
+    return CreatorProfileDocument.objects.filter(creator_id=creator_id).values_list('version', flat=True).first()
+
+
+def rebuild_document(creator_id):
+    """Render and store the document, returning its bytes; raises Creator.DoesNotExist"""
+    # The version check only works against current data, not a lagging replica
+    pin_to_primary()
+    version = document_version(creator_id)
+    if version is None:
+        # Create the (stale) row first so writes from here on can flag it
+        if not Creator.objects.filter(id=creator_id).exists():
+            raise Creator.DoesNotExist(f'Creator {creator_id} does not exist')
+        CreatorProfileDocument.objects.bulk_create(
+            [CreatorProfileDocument(creator_id=creator_id)], ignore_conflicts=True
+        )
+        version = document_version(creator_id)
+    content = render_document(creator_id)
+    CreatorProfileDocument.objects.filter(creator_id=creator_id, version=version).update(
+        content=content, stale=False, built_at=timezone.now()
+    )
+    return content
+
+
+def get_document(creator_id):
+    """Stored JSON bytes for the creator, rendering them first if missing or stale"""
+    row = CreatorProfileDocument.objects.filter(creator_id=creator_id).values_list('content', 'stale').first()
+    if row is not None and not row[1]:
+        return bytes(row[0])
+    return rebuild_document(creator_id)
+
+
+def mark_stale(creator_id):
+    CreatorProfileDocument.objects.filter(creator_id=creator_id).update(stale=True, version=F('version') + 1)
+
+
+def rebuild_stale(batch_size=100):
+    """Rebuild up to `batch_size` stale documents, returning how many were processed"""
+    creator_ids = list(
+        CreatorProfileDocument.objects.filter(stale=True).values_list('creator_id', flat=True)[:batch_size]
+    )
+    for creator_id in creator_ids:
+        try:
+            rebuild_document(creator_id)
+        except Creator.DoesNotExist:
+            # Deleted meanwhile; the cascade removes the document
+            pass
+    return len(creator_ids)
+
+
+def flag_profile_document(sender, instance, **kwargs):
+    # Not gated on CREATOR_PROFILE_DOCUMENTS, see the module docstring
+    if kwargs.get('raw'):
+        return
+    mark_stale(instance.pk if sender is Creator else instance.creator_id)
+
+
+for model in SOURCE_MODELS:
+    post_save.connect(flag_profile_document, sender=model, dispatch_uid=f'profile_{model.__name__}_save')
+    post_delete.connect(flag_profile_document, sender=model, dispatch_uid=f'profile_{model.__name__}_delete')
@@ -0,0 +1,202 @@
+"""Per-request query profiling.
+
+QueryProfilerMiddleware (enabled by QUERY_PROFILER) records, for every
+request, the number of SQL queries, the time spent in the database and in
+DRF serializers, and the response size. Each response reports them in a
+Server-Timing header, and ProfilerStatsView aggregates them per URL name
+for the life of the process.
+
+Queries are counted by an execute wrapper added to every connection as it is
+created, which reports into the profile held in a context variable, so
+queries made from async views (in sync_to_async threads) and against replica
+aliases are counted too.
+
+QUERY_BUDGETS caps the number of queries per URL name; the test suite
+requests every budgeted endpoint and fails when one goes over, and the
+middleware logs a warning when it sees that happen at runtime.
+"""
+import logging
+import threading
+import time
+from contextvars import ContextVar
+
+from django.db import connections
+from django.db.backends.signals import connection_created
+from rest_framework import serializers
+
+logger = logging.getLogger(__name__)
+
+# Maximum queries per request, by URL name
+QUERY_BUDGETS = {
+    'project_list': 1,
+    'kol_list': 2,
+    'data_tracking_list': 2,
+    'tracking_number_list': 2,
+    'brand_dashboard_stats': 2,
+    'creator_list': 2,
+    'creator_search': 1,
+    'creator_snapshot_list': 5,
+    'creator_detail': 7,
+    'creator_analytics': 3,
+    'video_analytics': 3,
+    'live_analytics': 3,
+    'follower_demographics': 3,
+    'trend_data': 3,
+    'async_creator_detail': 7,
+    'async_creator_analytics': 3,
+    'async_trend_data': 3,
+}
+
+_current = ContextVar('query_profile', default=None)
+
+
+class RequestProfile:
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializer_depth = 0
+
+
+class ProfileStats:
+    """Per-URL-name totals, shared by the threads of one process"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.endpoints = {}
+
+    def record(self, name, profile, total_time, response_bytes):
+        with self.lock:
+            stats = self.endpoints.setdefault(name, {
+                'requests': 0, 'queries': 0, 'max_queries': 0, 'db_ms': 0.0,
+                'serializer_ms': 0.0, 'total_ms': 0.0, 'response_bytes': 0,
+            })
+            stats['requests'] += 1
+            stats['queries'] += profile.queries
+            stats['max_queries'] = max(stats['max_queries'], profile.queries)
+            stats['db_ms'] += profile.db_time * 1000
+            stats['serializer_ms'] += profile.serializer_time * 1000
+            stats['total_ms'] += total_time * 1000
+            stats['response_bytes'] += response_bytes or 0
+
+    def summary(self):
+        with self.lock:
+            return {
+                name: {
+                    'requests': stats['requests'],
+                    'avg_queries': round(stats['queries'] / stats['requests'], 2),
+                    'max_queries': stats['max_queries'],
+                    'query_budget': QUERY_BUDGETS.get(name),
+                    'avg_db_ms': round(stats['db_ms'] / stats['requests'], 2),
+                    'avg_serializer_ms': round(stats['serializer_ms'] / stats['requests'], 2),
+                    'avg_total_ms': round(stats['total_ms'] / stats['requests'], 2),
+                    'avg_response_bytes': round(stats['response_bytes'] / stats['requests']),
+                }
+                for name, stats in sorted(self.endpoints.items())
+            }
+
+    def reset(self):
+        with self.lock:
+            self.endpoints = {}
+
+
+stats = ProfileStats()
+
+
+def start_profile():
+    """Profile the current request, joining the profile already started for
+    it (the metrics and profiler middlewares share one)"""
+    profile = _current.get()
+    if profile is not None:
+        return profile, None
+    profile = RequestProfile()
+    return profile, _current.set(profile)
+
+
+def finish_profile(token):
+    if token is not None:
+        _current.reset(token)
+
+
+def record_query(execute, sql, params, many, context):
+    profile = _current.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.queries += 1
+        profile.db_time += time.perf_counter() - start
+
+
+def add_query_wrapper(sender, connection, **kwargs):
+    # connection_created fires again on reconnect; the wrapper list persists
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def timed_data(prop):
+    """Wrap a serializer's `data` property to time the outermost evaluation"""
+    def data(self):
+        profile = _current.get()
+        if profile is None:
+            return prop.fget(self)
+        profile.serializer_depth += 1
+        start = time.perf_counter()
+        try:
+            return prop.fget(self)
+        finally:
+            profile.serializer_depth -= 1
+            if not profile.serializer_depth:
+                profile.serializer_time += time.perf_counter() - start
+    data.profiled = True
+    data.original = prop
+    return property(data)
+
+
+def install_query_wrapper():
+    connection_created.connect(add_query_wrapper, dispatch_uid='query_profiler')
+    for connection in connections.all(initialized_only=True):
+        add_query_wrapper(None, connection)
+
+
+def uninstall_query_wrapper():
+    connection_created.disconnect(dispatch_uid='query_profiler')
+    for connection in connections.all(initialized_only=True):
+        if record_query in connection.execute_wrappers:
+            connection.execute_wrappers.remove(record_query)
+
+
+def install():
+    """Hook query and serializer timing in; called from AppConfig.ready()"""
+    install_query_wrapper()
+    for serializer_class in (serializers.Serializer, serializers.ListSerializer):
+        if not getattr(serializer_class.data.fget, 'profiled', False):
+            serializer_class.data = timed_data(serializer_class.data)
+
+
+def uninstall():
+    """Undo install()"""
+    uninstall_query_wrapper()
+    for serializer_class in (serializers.Serializer, serializers.ListSerializer):
+        if getattr(serializer_class.data.fget, 'profiled', False):
+            serializer_class.data = serializer_class.data.fget.original
+
+
+def server_timing(profile, total_time, response_bytes):
+    metrics = [
+        f'db;dur={profile.db_time * 1000:.1f};desc="{profile.queries} queries"',
+        f'serialize;dur={profile.serializer_time * 1000:.1f}',
+        f'total;dur={total_time * 1000:.1f}',
+    ]
+    if response_bytes is not None:
+        metrics.append(f'bytes;desc="{response_bytes}"')
+    return ', '.join(metrics)
+
+
+def check_budget(name, profile, path):
+    budget = QUERY_BUDGETS.get(name)
+    if budget is not None and profile.queries > budget:
+        logger.warning('query_budget_exceeded url_name=%s path=%s queries=%d budget=%d',
+                       name, path, profile.queries, budget)
@@ -0,0 +1,139 @@
+"""Incremental daily rollups for BrandDashboardStats.
+
+Every DataTracking / TrendData write turns into a delta that is added onto the
+BrandDashboardStats row for its day, so the dashboard stays a single
+primary-key read no matter how much data is ingested.
+
+Sources:
+    clicks_today   <- DataTracking.product_entries (by created_at day)
+    orders_today   <- TrendData.products_sold (by TrendData.date)
+    revenue_today  <- TrendData.gmv (by TrendData.date)
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import BrandDashboardStats, DataTracking, TrendData
+
+
+def _data_tracking_contribution(date, product_entries):
+    return {date: {'clicks_today': product_entries or 0}}
+
+
+def _trend_data_contribution(date, products_sold, gmv):
+    return {date: {'orders_today': products_sold or 0, 'revenue_today': Decimal(gmv or 0)}}
+
+
+def data_tracking_contribution(instance):
+    """Rollup contribution of a saved DataTracking row, keyed by day"""
+    return _data_tracking_contribution(instance.created_at.date(), instance.product_entries)
+
+
+def trend_data_contribution(instance):
+    """Rollup contribution of a saved TrendData row, keyed by day"""
+    return _trend_data_contribution(instance.date, instance.products_sold, instance.gmv)
+
+
+def diff_contributions(new, old):
+    """Return new - old, so updates only move the difference"""
+    deltas = defaultdict(dict)
+    for sign, contribution in ((1, new), (-1, old)):
+        for date, values in contribution.items():
+            for field, value in values.items():
+                deltas[date][field] = deltas[date].get(field, 0) + sign * value
+    return deltas
+
+
+def apply_rollup_deltas(deltas):
+    """Add per-day deltas onto BrandDashboardStats.
+
+    `deltas` maps a date to {field: amount}. Missing rows are created first and
+    the increments are applied with F() expressions, so concurrent writers
+    never lose each other's updates.
+    """
+    deltas = {
+        date: {field: value for field, value in values.items() if value}
+        for date, values in deltas.items()
+    }
+    deltas = {date: values for date, values in deltas.items() if values}
+    if not deltas:
+        return
+
+    with transaction.atomic():
+        BrandDashboardStats.objects.bulk_create(
+            [BrandDashboardStats(date=date) for date in deltas],
+            ignore_conflicts=True,
+        )
+        now = timezone.now()
+        for date, values in deltas.items():
+            BrandDashboardStats.objects.filter(date=date).update(
+                updated_at=now,
+                **{field: F(field) + value for field, value in values.items()}
+            )
+
+
+def merge_contributions(contributions):
+    """Sum an iterable of contributions into one delta mapping (used by bulk writers)"""
+    merged = defaultdict(dict)
+    for contribution in contributions:
+        for date, values in contribution.items():
+            for field, value in values.items():
+                merged[date][field] = merged[date].get(field, 0) + value
+    return merged
+
+
+@receiver(pre_save, sender=DataTracking)
+def remember_data_tracking_contribution(sender, instance, raw=False, **kwargs):
+    instance._rollup_previous = {}
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    previous = DataTracking.objects.filter(pk=instance.pk).values('created_at', 'product_entries').first()
+    if previous:
+        instance._rollup_previous = _data_tracking_contribution(
+            previous['created_at'].date(), previous['product_entries']
+        )
+
+
+@receiver(post_save, sender=DataTracking)
+def roll_up_data_tracking(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_rollup_previous', {})
+    apply_rollup_deltas(diff_contributions(data_tracking_contribution(instance), previous))
+    instance._rollup_previous = data_tracking_contribution(instance)
+
+
+@receiver(post_delete, sender=DataTracking)
+def roll_back_data_tracking(sender, instance, **kwargs):
+    apply_rollup_deltas(diff_contributions({}, data_tracking_contribution(instance)))
+
+
+@receiver(pre_save, sender=TrendData)
+def remember_trend_data_contribution(sender, instance, raw=False, **kwargs):
+    instance._rollup_previous = {}
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    previous = TrendData.objects.filter(pk=instance.pk).values('date', 'products_sold', 'gmv').first()
+    if previous:
+        instance._rollup_previous = _trend_data_contribution(
+            previous['date'], previous['products_sold'], previous['gmv']
+        )
+
+
+@receiver(post_save, sender=TrendData)
+def roll_up_trend_data(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_rollup_previous', {})
+    apply_rollup_deltas(diff_contributions(trend_data_contribution(instance), previous))
+    instance._rollup_previous = trend_data_contribution(instance)
+
+
+@receiver(post_delete, sender=TrendData)
+def roll_back_trend_data(sender, instance, **kwargs):
+    apply_rollup_deltas(diff_contributions({}, trend_data_contribution(instance)))
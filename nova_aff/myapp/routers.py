@@ -0,0 +1,102 @@
+"""Send brand analytics reads to read replicas.
+
+Replica aliases come from settings.DATABASE_REPLICAS (see POSTGRES_REPLICA_HOSTS).
+Only reads made while handling a safe (GET/HEAD/OPTIONS) request go to a
+replica; management commands, shells and writing requests always use the
+primary. ReplicaRoutingMiddleware opens the routing context for each
+request.
+
+Read-your-writes: once a request writes, the rest of it reads from the
+primary, and the middleware sets a short-lived cookie so the client's
+following requests do too while the replicas catch up. A write is a data
+changing statement actually sent to the database (see pin_on_write), not
+merely a query routed to the primary such as select_for_update().
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+# Labels rather than classes: routers are loaded before the app registry is ready
+ANALYTICS_MODELS = {
+    'myapp.creator', 'myapp.branddashboardstats', 'myapp.creatoranalytics', 'myapp.videoanalytics',
+    'myapp.liveanalytics', 'myapp.followerdemographics', 'myapp.trenddata', 'myapp.creatorprofiledocument',
+}
+
+
+class RoutingState:
+    def __init__(self, use_replicas):
+        self.use_replicas = use_replicas
+        self.wrote = False
+
+
+_routing = ContextVar('db_routing', default=None)
+
+
+@contextmanager
+def request_routing(safe, pinned=False):
+    """Routing context for one request; yields its RoutingState"""
+    state = RoutingState(use_replicas=safe and not pinned)
+    token = _routing.set(state)
+    try:
+        yield state
+    finally:
+        _routing.reset(token)
+
+
+def pin_to_primary():
+    """Read from the primary for the rest of the request (called on every write)"""
+    state = _routing.get()
+    if state is not None:
+        state.use_replicas = False
+        state.wrote = True
+
+
+# Statements that change data; SELECT (FOR UPDATE), SAVEPOINT, SET etc. do not pin
+WRITE_STATEMENTS = ('INSERT', 'UPDATE', 'DELETE', 'MERGE', 'COPY', 'TRUNCATE')
+
+
+def pin_on_write(execute, sql, params, many, context):
+    if _routing.get() is not None and sql.lstrip()[:8].upper().startswith(WRITE_STATEMENTS):
+        pin_to_primary()
+    return execute(sql, params, many, context)
+
+
+def add_write_detector(sender, connection, **kwargs):
+    if pin_on_write not in connection.execute_wrappers:
+        connection.execute_wrappers.append(pin_on_write)
+
+
+def install():
+    """Pin requests to the primary once they write; called from AppConfig.ready()"""
+    connection_created.connect(add_write_detector, dispatch_uid='replica_pin_on_write')
+    for connection in connections.all(initialized_only=True):
+        add_write_detector(None, connection)
+
+
+class AnalyticsReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _routing.get()
+        if state is None or not state.use_replicas or not settings.DATABASE_REPLICAS:
+            return None
+        if model._meta.label_lower not in ANALYTICS_MODELS:
+            return None
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        databases = {'default', *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
@@ -1,13 +1,19 @@
+import os
+
+from django.conf import settings
 from rest_framework import serializers
+from django.db.models import Prefetch
 from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
 from rest_framework_simplejwt.tokens import RefreshToken
 from .models import (
-    Project, KOL, DataTracking, TrackingNumber, UserProfile,
+    Project, KOL, DataTracking, TrackingNumber, UserProfile, ChunkedUpload,
     Creator, BrandDashboardStats, CreatorAnalytics, VideoAnalytics,
     LiveAnalytics, FollowerDemographics, TrendData
 )
+from .numbers import parse_abbreviated_number
 from datetime import datetime
+from decimal import Decimal, ROUND_HALF_UP
 
 
 class CustomDateField(serializers.DateField):
@@ -34,10 +40,34 @@ class CustomDateField(serializers.DateField):
         return value
 
 
+class AbbreviatedIntegerField(serializers.IntegerField):
+    """Integer field that also accepts "1.2M", "12,5K" or "1.234.567" style input"""
+    
+    def to_internal_value(self, data):
+        if isinstance(data, str):
+            try:
+                data = int(parse_abbreviated_number(data).to_integral_value(rounding=ROUND_HALF_UP))
+            except ValueError:
+                self.fail('invalid')
+        return super().to_internal_value(data)
+
+
+class AbbreviatedDecimalField(serializers.DecimalField):
+    """Decimal field that also accepts "1.2M", "5tr" or "5.000.000đ" style input"""
+    
+    def to_internal_value(self, data):
+        if isinstance(data, str):
+            try:
+                data = parse_abbreviated_number(data)
+            except ValueError:
+                self.fail('invalid')
+        return super().to_internal_value(data)
+
+
 class UserRegistrationSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, min_length=6)
     confirm_password = serializers.CharField(write_only=True, min_length=6)
-    role = serializers.ChoiceField(choices=UserProfile.ROLE_CHOICES, default='creator')
+    role = serializers.ChoiceField(choices=UserProfile.ROLE_CHOICES, default=UserProfile.DEFAULT_ROLE)
 
     class Meta:
         model = User
@@ -49,24 +79,20 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         return attrs
 
     def validate_username(self, value):
+        # Uniqueness is checked by the UniqueValidator ModelSerializer derives from User.username
         if len(value) < 6:
             raise serializers.ValidationError("Username must be at least 6 characters long")
-        if User.objects.filter(username=value).exists():
-            raise serializers.ValidationError("Username already exists")
         return value
 
     def create(self, validated_data):
-        role = validated_data.pop('role', 'creator')
+        role = validated_data.pop('role', UserProfile.DEFAULT_ROLE)
         validated_data.pop('confirm_password')
         
-        user = User.objects.create_user(
-            username=validated_data['username'],
-            password=validated_data['password']
-        )
-        
-        # Update the user profile with the selected role
-        user.profile.role = role
-        user.profile.save()
+        user = User(username=User.normalize_username(validated_data['username']))
+        user.set_password(validated_data['password'])
+        # Read by the User post_save receiver, which inserts the profile with this role
+        user.profile_role = role
+        user.save()
         
         return user
 
@@ -129,6 +155,10 @@ class KOLSerializer(serializers.ModelSerializer):
     project = serializers.PrimaryKeyRelatedField(read_only=True)
     submitted_on = CustomDateField()
     kol_koc_approval_time = CustomDateField()
+    # Upper bounds of the BigIntegerField / IntegerField columns, so oversized input is a 400
+    followers = AbbreviatedIntegerField(min_value=0, max_value=2**63 - 1, required=False)
+    gmv = AbbreviatedDecimalField(max_digits=18, decimal_places=2, min_value=Decimal('0'), required=False)
+    number_tracking = AbbreviatedIntegerField(min_value=0, max_value=2**31 - 1, required=False)
     
     class Meta:
         model = KOL
@@ -164,6 +194,26 @@ class TrackingNumberSerializer(serializers.ModelSerializer):
         }
 
 
+class ChunkedUploadSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ChunkedUpload
+        fields = ['upload_id', 'target', 'object_id', 'filename', 'total_size', 'offset', 'status',
+                  'created_at', 'updated_at']
+        read_only_fields = ['upload_id', 'offset', 'status', 'created_at', 'updated_at']
+    
+    def validate_filename(self, value):
+        return os.path.basename(value)
+    
+    def validate_total_size(self, value):
+        if value <= 0:
+            raise serializers.ValidationError('Total size must be positive')
+        if value > settings.CHUNKED_UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(
+                f'Total size cannot exceed {settings.CHUNKED_UPLOAD_MAX_SIZE} bytes'
+            )
+        return value
+
+
 # Brand Analytics Serializers
 class CreatorSerializer(serializers.ModelSerializer):
     category_display = serializers.SerializerMethodField()
@@ -171,7 +221,7 @@ class CreatorSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Creator
-        fields = '__all__'
+        exclude = ['search_name']
         read_only_fields = ['created_at', 'updated_at']
     
     def get_category_display(self, obj):
@@ -247,41 +297,86 @@ class TrendDataSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at']
 
 
-class CreatorDetailSerializer(serializers.ModelSerializer):
-    """Detailed creator info with all analytics"""
+class CreatorSnapshotSerializer(serializers.ModelSerializer):
+    """Creator info with the latest row of each analytics model attached"""
     latest_analytics = serializers.SerializerMethodField()
     latest_video_analytics = serializers.SerializerMethodField()
     latest_live_analytics = serializers.SerializerMethodField()
     latest_demographics = serializers.SerializerMethodField()
-    trend_data = serializers.SerializerMethodField()
     category_display = serializers.SerializerMethodField()
     
     class Meta:
         model = Creator
-        fields = '__all__'
+        exclude = ['search_name']
         read_only_fields = ['created_at', 'updated_at']
     
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Prefetch the latest related rows so the payload costs a fixed number of queries.
+
+        Sliced prefetches are resolved with a ROW_NUMBER() window per creator,
+        so a page of N creators still costs one query per related model.
+        """
+        return queryset.prefetch_related(
+            Prefetch('analytics', queryset=CreatorAnalytics.objects.order_by('-created_at', '-id')[:1],
+                     to_attr='latest_analytics_rows'),
+            Prefetch('video_analytics', queryset=VideoAnalytics.objects.order_by('-created_at', '-id')[:1],
+                     to_attr='latest_video_analytics_rows'),
+            Prefetch('live_analytics', queryset=LiveAnalytics.objects.order_by('-created_at', '-id')[:1],
+                     to_attr='latest_live_analytics_rows'),
+            Prefetch('follower_demographics',
+                     queryset=FollowerDemographics.objects.order_by('-snapshot_date', '-id')[:1],
+                     to_attr='latest_demographics_rows'),
+        )
+    
+    @staticmethod
+    def _latest(obj, attr, related):
+        """Use the prefetched row when available, otherwise fall back to a query"""
+        if hasattr(obj, attr):
+            rows = getattr(obj, attr)
+            return rows[0] if rows else None
+        return related.first()
+
     def get_latest_analytics(self, obj):
-        latest = obj.analytics.first()
+        latest = self._latest(obj, 'latest_analytics_rows', obj.analytics)
         return CreatorAnalyticsSerializer(latest).data if latest else None
     
     def get_latest_video_analytics(self, obj):
-        latest = obj.video_analytics.first()
+        latest = self._latest(obj, 'latest_video_analytics_rows', obj.video_analytics)
         return VideoAnalyticsSerializer(latest).data if latest else None
     
     def get_latest_live_analytics(self, obj):
-        latest = obj.live_analytics.first()
+        latest = self._latest(obj, 'latest_live_analytics_rows', obj.live_analytics)
         return LiveAnalyticsSerializer(latest).data if latest else None
     
     def get_latest_demographics(self, obj):
-        latest = obj.follower_demographics.first()
+        latest = self._latest(obj, 'latest_demographics_rows', obj.follower_demographics)
         return FollowerDemographicsSerializer(latest).data if latest else None
     
-    def get_trend_data(self, obj):
-        trends = obj.trend_data.all()[:30]  # Last 30 days
-        return TrendDataSerializer(trends, many=True).data
-    
     def get_category_display(self, obj):
         """Return display names for categories"""
         category_dict = dict(Creator.CATEGORY_CHOICES)
-        return [category_dict.get(cat, cat) for cat in obj.categories] 
\ No newline at end of file
+        return [category_dict.get(cat, cat) for cat in obj.categories]
+
+
+class CreatorDetailSerializer(CreatorSnapshotSerializer):
+    """Detailed creator info with all analytics"""
+    trend_data = serializers.SerializerMethodField()
+    
+    class Meta(CreatorSnapshotSerializer.Meta):
+        pass
+    
+    @staticmethod
+    def setup_eager_loading(queryset):
+        queryset = CreatorSnapshotSerializer.setup_eager_loading(queryset)
+        return queryset.prefetch_related(
+            Prefetch('trend_data', queryset=TrendData.objects.order_by('-date')[:30],
+                     to_attr='recent_trend_rows'),
+        )
+    
+    def get_trend_data(self, obj):
+        if hasattr(obj, 'recent_trend_rows'):
+            trends = obj.recent_trend_rows
+        else:
+            trends = obj.trend_data.all()[:30]  # Last 30 days
+        return TrendDataSerializer(trends, many=True).data
@@ -0,0 +1,314 @@
+"""Deterministic synthetic brand analytics data for load testing.
+
+generate() creates creators with `days` days of TrendData each (plus one
+analytics period and demographics snapshot per 30 days) and projects with
+KOLs and DataTracking rows. Rows are built in memory and written in batches:
+COPY on Postgres, bulk_create elsewhere. Every creator and project draws from
+its own Random seeded with (seed, index), so a seed always produces the same
+rows whatever the batch size or method.
+
+Generated creators and projects are named with PREFIX so delete_generated()
+can drop them again. Bulk writes skip the save signals: callers rebuild the
+dashboard rollup afterwards (manage.py rebuild_dashboard_stats).
+"""
+import json
+import multiprocessing
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import connections, models, router, transaction
+from django.utils import timezone
+
+from .importers import copy_rows
+from .models import (
+    Project, KOL, DataTracking, Creator, CreatorAnalytics, VideoAnalytics,
+    LiveAnalytics, FollowerDemographics, TrendData
+)
+
+PREFIX = 'synthetic_'
+USERNAME = 'synthetic_data'
+ANALYTICS_PERIOD_DAYS = 30
+CATEGORIES = ['beauty', 'fashion', 'lifestyle', 'tech', 'food', 'education', 'mom_baby', 'sports']
+LOCATIONS = ['HỒ CHÍ MINH', 'HÀ NỘI', 'ĐÀ NẴNG', 'HẢI PHÒNG', 'CẦN THƠ', 'THANH HÓA', 'NGHỆ AN']
+FAMILY_NAMES = ['Nguyễn', 'Trần', 'Lê', 'Phạm', 'Hoàng', 'Vũ', 'Đặng', 'Bùi', 'Đỗ', 'Ngô']
+GIVEN_NAMES = ['Anh', 'Minh', 'Hoàng', 'Quỳnh', 'Linh', 'Trang', 'Huy', 'Thảo', 'Dũng', 'Vy', 'Khánh', 'Ngọc']
+
+
+def rng_for(seed, kind, index):
+    return random.Random(f'{seed}:{kind}:{index}')
+
+
+def money(value):
+    return Decimal(f'{value:.2f}')
+
+
+@lru_cache(maxsize=8)
+def day_strings(start_date, days):
+    # Formatted once and shared by every creator: str() of dates dominates COPY otherwise
+    return [str(start_date + timedelta(days=offset)) for offset in range(days)]
+
+
+class Writer:
+    """Buffers value dicts (keyed by field attname) per model and writes them in batches"""
+
+    def __init__(self, method='auto', batch_size=10000, using=None):
+        self.connection = connections[using or router.db_for_write(TrendData)]
+        # copy_rows() uses psycopg2's copy_expert()
+        can_copy = self.connection.vendor == 'postgresql' and self.connection.Database.__name__ == 'psycopg2'
+        if method == 'auto':
+            method = 'copy' if can_copy else 'bulk'
+        if method == 'copy' and not can_copy:
+            raise ValueError('COPY needs PostgreSQL with psycopg2')
+        self.method = method
+        self.batch_size = batch_size
+        self.buffers = {}
+        self.counts = {}
+        self.templates = {}
+
+    def template(self, model):
+        """Field defaults for every column, since COPY bypasses the model"""
+        if model not in self.templates:
+            now = timezone.now()
+            if self.method == 'copy':
+                now = now.isoformat()
+            self.templates[model] = {
+                field.attname: now if isinstance(field, models.DateTimeField) else field.get_default()
+                for field in model._meta.concrete_fields if not field.primary_key
+            }
+        return self.templates[model]
+
+    def add(self, model, values):
+        buffer = self.buffers.setdefault(model, [])
+        buffer.append({**self.template(model), **values})
+        if len(buffer) >= self.batch_size:
+            self.flush(model)
+
+    def flush(self, model=None):
+        for model in [model] if model else list(self.buffers):
+            rows = self.buffers.pop(model, [])
+            if not rows:
+                continue
+            if self.method == 'copy':
+                json_fields = [field.attname for field in model._meta.concrete_fields
+                               if isinstance(field, models.JSONField)]
+                for row in rows:
+                    for attname in json_fields:
+                        row[attname] = json.dumps(row[attname], ensure_ascii=False)
+                with self.connection.cursor() as cursor:
+                    copy_rows(cursor, model, rows)
+            else:
+                model.objects.using(self.connection.alias).bulk_create(
+                    [model(**row) for row in rows], batch_size=self.batch_size
+                )
+            self.counts[model.__name__] = self.counts.get(model.__name__, 0) + len(rows)
+
+
+def build_creator(seed, index, prefix=PREFIX):
+    rng = rng_for(seed, 'creator', index)
+    username = f'{prefix}creator_{index}'
+    display_name = f'{rng.choice(FAMILY_NAMES)} {rng.choice(GIVEN_NAMES)} {index}'
+    return Creator(
+        username=username,
+        display_name=display_name,
+        tiktok_url=f'https://www.tiktok.com/@{username}',
+        avatar='/brand-avatar.png',
+        categories=rng.sample(CATEGORIES, rng.randint(1, 3)),
+        gender=rng.choice(['male', 'female', 'other']),
+        followers_count=int(rng.paretovariate(1.2) * 5000),
+        # bulk_create skips Creator.save()
+        search_name=Creator.build_search_name(display_name, username),
+    )
+
+
+def add_creator_rows(writer, creator_id, seed, index, days, end_date):
+    """Queue the analytics, demographics and daily TrendData rows of one creator"""
+    rng = rng_for(seed, 'analytics', index)
+    start_date = end_date - timedelta(days=days - 1)
+    scale = rng.uniform(0.2, 5.0)
+
+    for offset in range(0, days, ANALYTICS_PERIOD_DAYS):
+        first = start_date + timedelta(days=offset)
+        last = min(first + timedelta(days=ANALYTICS_PERIOD_DAYS - 1), end_date)
+        live, video = rng.randint(60, 95), rng.randint(1, 30)
+        writer.add(CreatorAnalytics, {
+            'creator_id': creator_id, 'start_date': first, 'end_date': last,
+            'gmv': money(scale * rng.uniform(1e7, 5e9)),
+            'products_sold': int(scale * rng.randint(1000, 1_000_000)),
+            'gpm': money(rng.uniform(5e4, 5e5)),
+            'average_gmv_per_customer': money(rng.uniform(1e5, 1e7)),
+            'commission_rate': money(rng.uniform(1, 20)),
+            'total_products': rng.randint(10, 1000),
+            'price_range_min': Decimal('82000'),
+            'price_range_max': Decimal('5000000'),
+            'brands_collaborated': rng.randint(1, 100),
+            'live_gmv_percentage': Decimal(live),
+            'video_gmv_percentage': Decimal(min(video, 100 - live)),
+            'product_card_gmv_percentage': Decimal(max(100 - live - video, 0)),
+            'category_performance': {category: rng.randint(1, 90) for category in rng.sample(CATEGORIES, 3)},
+        })
+        writer.add(VideoAnalytics, {
+            'creator_id': creator_id, 'start_date': first, 'end_date': last,
+            'total_videos': rng.randint(5, 60),
+            'average_views': int(scale * rng.randint(10_000, 1_000_000)),
+            'average_engagement_rate': money(rng.uniform(1, 8)),
+            'gpm_video': money(rng.uniform(1e5, 5e5)),
+        })
+        writer.add(LiveAnalytics, {
+            'creator_id': creator_id, 'start_date': first, 'end_date': last,
+            'total_live_sessions': rng.randint(5, 80),
+            'average_viewers': int(scale * rng.randint(1000, 800_000)),
+            'average_engagement_rate': money(rng.uniform(1, 5)),
+            'gpm_live': money(rng.uniform(2e6, 5e6)),
+        })
+        male = rng.uniform(10, 60)
+        ages = [rng.random() for _ in range(5)]
+        total = sum(ages)
+        shares = rng.sample(LOCATIONS, 5)
+        writer.add(FollowerDemographics, {
+            'creator_id': creator_id, 'snapshot_date': last,
+            'male_percentage': money(male),
+            'female_percentage': money(100 - male),
+            'age_18_24_percentage': money(ages[0] / total * 100),
+            'age_25_34_percentage': money(ages[1] / total * 100),
+            'age_35_44_percentage': money(ages[2] / total * 100),
+            'age_45_54_percentage': money(ages[3] / total * 100),
+            'age_55_plus_percentage': money(ages[4] / total * 100),
+            'top_locations': [
+                {'location': location, 'percentage': round(50 / (position + 1), 1)}
+                for position, location in enumerate(shares)
+            ],
+        })
+
+    # The hot loop: one random() per value, decimals and dates as ready-made strings
+    # (the model fields parse them on the bulk_create path)
+    random_, add = rng.random, writer.add
+    base_gmv, base_sold, base_views = scale * 5e8, scale * 50_000, scale * 500_000
+    for day in day_strings(start_date, days):
+        add(TrendData, {
+            'creator_id': creator_id,
+            'date': day,
+            'gmv': f'{base_gmv * (0.5 + random_()):.2f}',
+            'products_sold': int(base_sold * (0.5 + random_())),
+            'followers_gained': int(2000 * random_()),
+            'video_views': int(base_views * (0.5 + random_())),
+            'engagement_rate': f'{1 + 5 * random_():.2f}',
+        })
+
+
+def add_project_rows(writer, project_id, seed, index, kols, tracking_rows, end_date):
+    rng = rng_for(seed, 'project', index)
+    for i in range(kols):
+        submitted = end_date - timedelta(days=rng.randrange(365))
+        handle = f'kol_{index}_{i}'
+        writer.add(KOL, {
+            'project_id': project_id, 'full_name': f'{rng.choice(FAMILY_NAMES)} {rng.choice(GIVEN_NAMES)}',
+            'submitted_on': submitted, 'email': f'{handle}@example.com', 'phone_number': '0900000000',
+            'zalo': '0900000000', 'tiktok_url': f'https://www.tiktok.com/@{handle}', 'tiktok_id': handle,
+            'followers': int(rng.paretovariate(1.2) * 2000), 'gmv': money(rng.uniform(0, 5e8)),
+            'channel_identifier': 'tiktok', 'appropriate_channel_topic': rng.choice(CATEGORIES),
+            'shipping_address': rng.choice(LOCATIONS), 'note': '',
+            'brand_approval': rng.choice(['Approved', 'Pending', 'Rejected']),
+            'kol_koc_approval_time': submitted + timedelta(days=rng.randrange(14)),
+            'number_tracking': rng.randrange(10), 'koc_confirmed_by_nova': rng.choice(['Yes', 'No']),
+        })
+    for i in range(tracking_rows):
+        writer.add(DataTracking, {
+            'project_id': project_id, 'creator': f'Creator {i % 1000}', 'creator_id': f'creator_{i % 1000}',
+            'about_video': f'Video {i}', 'video_id': f'{index}_{i}',
+            'upload_time': (end_date - timedelta(days=rng.randrange(365))).strftime('%d/%m/%Y'),
+            'view': rng.randrange(1_000_000), 'like': rng.randrange(100_000), 'share': rng.randrange(10_000),
+            'comment': rng.randrange(10_000), 'product_linked': 'https://example.com/product',
+            'new_followers': rng.randrange(1000), 'product_impressions': rng.randrange(100_000),
+            'product_entries': rng.randrange(10_000), 'gmv': rng.randrange(100_000_000),
+            'ctr': rng.randrange(100), 'revenue_from_videos': rng.randrange(100_000_000),
+        })
+
+
+def generated_exists():
+    return (Creator.objects.filter(username__startswith=PREFIX).exists()
+            or Project.objects.filter(project_id__startswith=PREFIX).exists())
+
+
+def write_creators(start, stop, seed, days, end_date, method='auto', batch_size=10000):
+    """Write creators [start, stop) with all their rows in one transaction; returns the row counts"""
+    writer = Writer(method, batch_size)
+    with transaction.atomic(using=writer.connection.alias):
+        # Creators need their ids for the child rows, so they go through bulk_create batch by batch
+        creator_batch = max(1, batch_size // days)
+        for batch_start in range(start, stop, creator_batch):
+            indexes = range(batch_start, min(batch_start + creator_batch, stop))
+            created = Creator.objects.bulk_create([build_creator(seed, index) for index in indexes])
+            for index, creator in zip(indexes, created):
+                add_creator_rows(writer, creator.pk, seed, index, days, end_date)
+            writer.counts['Creator'] = writer.counts.get('Creator', 0) + len(created)
+        writer.flush()
+    return writer.counts
+
+
+def generate(creators, days, projects, kols_per_project=1000, tracking_per_project=10000, seed=0,
+             end_date=None, method='auto', batch_size=10000, workers=1, chunk_size=1000, progress=None):
+    """Write a synthetic dataset; returns the number of rows written per model.
+
+    Creators are written `chunk_size` at a time, one transaction per chunk,
+    by `workers` forked processes (each with its own connection) when more
+    than one.
+    """
+    end_date = end_date or date.today()
+    writer = Writer(method, batch_size)
+    with transaction.atomic(using=writer.connection.alias):
+        user, _ = User.objects.get_or_create(username=USERNAME)
+        project_objects = Project.objects.bulk_create([
+            Project(name=f'Synthetic project {index}', project_id=f'{PREFIX}{index}',
+                    created_date=end_date, created_by=user)
+            for index in range(projects)
+        ])
+        for index, project in enumerate(project_objects):
+            add_project_rows(writer, project.pk, seed, index, kols_per_project, tracking_per_project, end_date)
+        writer.flush()
+    counts = {'Project': len(project_objects), **writer.counts}
+
+    chunks = [(start, min(start + chunk_size, creators)) for start in range(0, creators, chunk_size)]
+    arguments = (seed, days, end_date, method, batch_size)
+    if workers > 1:
+        # Forked children must not share the parent's open connections
+        connections.close_all()
+        pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('fork'))
+        with pool:
+            futures = [pool.submit(write_creators, start, stop, *arguments) for start, stop in chunks]
+            results = (future.result() for future in as_completed(futures))
+            report_chunks(counts, results, chunk_size, creators, progress)
+    else:
+        results = (write_creators(start, stop, *arguments) for start, stop in chunks)
+        report_chunks(counts, results, chunk_size, creators, progress)
+    return counts
+
+
+def report_chunks(counts, results, chunk_size, total, progress):
+    for position, chunk_counts in enumerate(results, 1):
+        for name, count in chunk_counts.items():
+            counts[name] = counts.get(name, 0) + count
+        if progress:
+            progress(min(position * chunk_size, total), total)
+
+
+def delete_generated(using=None):
+    """Delete the generated creators and projects with their rows, without loading them"""
+    connection = connections[using or router.db_for_write(Creator)]
+    quote_name = connection.ops.quote_name
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        for model, lookup in ((Creator, 'username__startswith'), (Project, 'project_id__startswith')):
+            parents = model.objects.using(connection.alias).filter(**{lookup: PREFIX}).order_by().values('pk')
+            sql, params = parents.query.sql_with_params()
+            for relation in model._meta.related_objects:
+                if relation.one_to_many or relation.one_to_one:
+                    cursor.execute(
+                        f'DELETE FROM {quote_name(relation.related_model._meta.db_table)} '
+                        f'WHERE {quote_name(relation.field.column)} IN ({sql})',
+                        params,
+                    )
+            cursor.execute(f'DELETE FROM {quote_name(model._meta.db_table)} WHERE {quote_name("id")} IN ({sql})',
+                           params)
@@ -1,3 +1,1228 @@
-from django.test import TestCase
+import csv
+import importlib.util
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from datetime import date, timedelta
+from decimal import Decimal
+from io import BytesIO, StringIO
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth.models import User, update_last_login
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.cache import cache
+from django.core.management import call_command, CommandError
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from .numbers import parse_abbreviated_number
+from .middleware import REPLICA_PIN_COOKIE
+from . import caching, metrics, profiling, synthetic
+from .profiles import rebuild_document
+from .profiling import QUERY_BUDGETS
+from .routers import request_routing
+from .uploads import append_chunk, part_path
+from .models import (
+    UserProfile, Project, KOL, DataTracking, TrackingNumber, BrandDashboardStats, ChunkedUpload,
+    Creator, CreatorAnalytics, VideoAnalytics, LiveAnalytics,
+    FollowerDemographics, TrendData, CreatorProfileDocument
+)
+
+
+def make_creator(username='creator_one', **kwargs):
+    defaults = {
+        'display_name': 'Nguyễn Quỳnh Anh',
+        'tiktok_url': f'https://www.tiktok.com/@{username}',
+        'categories': ['beauty'],
+        'gender': 'female',
+        'followers_count': 1000,
+    }
+    defaults.update(kwargs)
+    return Creator.objects.create(username=username, **defaults)
+
+
+def add_analytics_rows(creator, count, start=date(2025, 7, 1)):
+    """Create `count` rows for every analytics model of the creator"""
+    for i in range(count):
+        day = start + timedelta(days=i)
+        CreatorAnalytics.objects.create(creator=creator, start_date=day, end_date=day)
+        VideoAnalytics.objects.create(creator=creator, start_date=day, end_date=day)
+        LiveAnalytics.objects.create(creator=creator, start_date=day, end_date=day)
+        FollowerDemographics.objects.create(creator=creator, snapshot_date=day)
+        TrendData.objects.create(creator=creator, date=day)
+
+
+class CreatorDetailQueryCountTests(TestCase):
+    # 1 ETag validator + 1 creator lookup + 5 prefetches (analytics, video, live, demographics, trends)
+    expected_queries = 7
+
+    def setUp(self):
+        self.creator = make_creator()
+        self.url = reverse('creator_detail', args=[self.creator.id])
+
+    def test_query_count_is_constant_as_related_rows_grow(self):
+        add_analytics_rows(self.creator, 1)
+        with self.assertNumQueries(self.expected_queries):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+
+        # Commit hooks drop the cached response, so this is a fresh build
+        with self.captureOnCommitCallbacks(execute=True):
+            add_analytics_rows(self.creator, 40, start=date(2025, 8, 1))
+        with self.assertNumQueries(self.expected_queries):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['trend_data']), 30)
+
+    def test_latest_rows_are_returned(self):
+        add_analytics_rows(self.creator, 3)
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['latest_demographics']['snapshot_date'], '03/07/2025')
+        self.assertEqual(response.data['latest_analytics']['creator_name'], self.creator.display_name)
+        self.assertEqual(response.data['trend_data'][0]['date'], '03/07/2025')
+
+
+class CreatorSnapshotListTests(TestCase):
+    # 1 page query + 4 window-function prefetches
+    expected_queries = 5
+
+    def setUp(self):
+        self.url = reverse('creator_snapshot_list')
+
+    def test_query_count_is_constant_as_creators_grow(self):
+        add_analytics_rows(make_creator('creator_one'), 2)
+        with self.assertNumQueries(self.expected_queries):
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.data['results']), 1)
+
+        for i in range(5):
+            add_analytics_rows(make_creator(f'creator_more_{i}'), 3)
+        with self.assertNumQueries(self.expected_queries):
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.data['results']), 6)
+        for row in response.data['results']:
+            self.assertIsNotNone(row['latest_analytics'])
+            self.assertIsNotNone(row['latest_demographics'])
+
+    def test_filters(self):
+        make_creator('beauty_girl', categories=['beauty', 'fashion'], followers_count=600000)
+        make_creator('tech_guy', categories=['tech'], gender='male', followers_count=900000)
+        make_creator('small_beauty', categories=['beauty'], followers_count=1000)
+
+        response = self.client.get(self.url, {'category': 'beauty', 'min_followers': 500000})
+        self.assertEqual([row['username'] for row in response.data['results']], ['beauty_girl'])
+
+        response = self.client.get(self.url, {'gender': 'male'})
+        self.assertEqual([row['username'] for row in response.data['results']], ['tech_guy'])
+
+
+def make_project(project_id='campaign_1'):
+    user = User.objects.create_user(username=f'owner_{project_id}', password='secret123')
+    return Project.objects.create(name=project_id, project_id=project_id,
+                                  created_date=date(2025, 7, 1), created_by=user)
+
+
+def make_data_tracking(project, video_id='v1', **kwargs):
+    defaults = {
+        'creator': 'creator', 'creator_id': 'c1', 'about_video': 'about', 'upload_time': '2025-07-01',
+        'view': 0, 'like': 0, 'share': 0, 'comment': 0, 'product_linked': 'https://shop.example.com/p',
+        'new_followers': 0, 'product_impressions': 0, 'product_entries': 0, 'gmv': 0, 'ctr': 0,
+        'revenue_from_videos': 0,
+    }
+    defaults.update(kwargs)
+    return DataTracking.objects.create(project=project, video_id=video_id, **defaults)
+
+
+def make_kol(project, full_name='KOL', **kwargs):
+    defaults = {
+        'submitted_on': date(2025, 7, 1), 'email': 'kol@example.com', 'phone_number': '0900000000',
+        'zalo': '0900000000', 'tiktok_url': 'https://www.tiktok.com/@kol', 'tiktok_id': 'kol',
+        'followers': 0, 'gmv': 0, 'channel_identifier': 'kol', 'appropriate_channel_topic': 'beauty',
+        'shipping_address': 'HCM', 'brand_approval': 'pending', 'note': '',
+        'kol_koc_approval_time': date(2025, 7, 1), 'number_tracking': 0, 'koc_confirmed_by_nova': 'yes',
+    }
+    defaults.update(kwargs)
+    return KOL.objects.create(project=project, full_name=full_name, **defaults)
+
+
+class DashboardRollupTests(TestCase):
+    def test_trend_data_writes_move_daily_totals_by_delta(self):
+        creator = make_creator()
+        day = date(2025, 7, 1)
+        trend = TrendData.objects.create(creator=creator, date=day, products_sold=10, gmv=Decimal('100.00'))
+        TrendData.objects.create(creator=make_creator('creator_two'), date=day, products_sold=5, gmv=50)
+
+        stats = BrandDashboardStats.objects.get(date=day)
+        self.assertEqual(stats.orders_today, 15)
+        self.assertEqual(stats.revenue_today, Decimal('150.00'))
+
+        trend.products_sold = 12
+        trend.save()
+        self.assertEqual(BrandDashboardStats.objects.get(date=day).orders_today, 17)
+
+        trend.date = day + timedelta(days=1)
+        trend.save()
+        self.assertEqual(BrandDashboardStats.objects.get(date=day).orders_today, 5)
+        self.assertEqual(BrandDashboardStats.objects.get(date=trend.date).orders_today, 12)
+
+        trend.delete()
+        self.assertEqual(BrandDashboardStats.objects.get(date=trend.date).orders_today, 0)
+
+    def test_data_tracking_writes_count_clicks(self):
+        project = make_project()
+        tracking = make_data_tracking(project, product_entries=7)
+        make_data_tracking(project, video_id='v2', product_entries=3)
+        day = tracking.created_at.date()
+        self.assertEqual(BrandDashboardStats.objects.get(date=day).clicks_today, 10)
+
+        tracking.delete()
+        self.assertEqual(BrandDashboardStats.objects.get(date=day).clicks_today, 3)
+
+    def test_rebuild_matches_incremental_totals(self):
+        project = make_project()
+        make_data_tracking(project, product_entries=4)
+        TrendData.objects.create(creator=make_creator(), date=date(2025, 7, 1), products_sold=2, gmv=20)
+        before = list(BrandDashboardStats.objects.values_list('date', 'clicks_today', 'orders_today', 'revenue_today'))
+
+        BrandDashboardStats.objects.update(clicks_today=0, orders_today=0, revenue_today=0)
+        call_command('rebuild_dashboard_stats', stdout=StringIO())
+        after = list(BrandDashboardStats.objects.values_list('date', 'clicks_today', 'orders_today', 'revenue_today'))
+        self.assertEqual(before, after)
+
+
+class TrendDataAggregationTests(TestCase):
+    def setUp(self):
+        self.creator = make_creator()
+        self.url = reverse('trend_data', args=[self.creator.id])
+        # 2025-07-07 is a Monday; two full weeks of data
+        for i in range(14):
+            TrendData.objects.create(creator=self.creator, date=date(2025, 7, 7) + timedelta(days=i),
+                                     gmv=10, products_sold=1, engagement_rate=Decimal('2.00') + i % 2)
+
+    def test_weekly_buckets_are_columnar(self):
+        response = self.client.get(self.url, {
+            'granularity': 'week', 'start_date': '2025-07-01', 'end_date': '2025-07-31',
+        })
+        self.assertEqual(response.status_code, 200)
+        columns = response.data['columns']
+        self.assertEqual(columns['period'], ['07/07/2025', '14/07/2025'])
+        self.assertEqual(columns['products_sold'], [7, 7])
+        self.assertEqual(columns['gmv'], ['70.00', '70.00'])
+
+    def test_monthly_bucket(self):
+        response = self.client.get(self.url, {
+            'granularity': 'month', 'start_date': '2025-07-01', 'end_date': '2025-07-31',
+        })
+        self.assertEqual(response.data['columns']['period'], ['01/07/2025'])
+        self.assertEqual(response.data['columns']['products_sold'], [14])
+        self.assertEqual(response.data['columns']['engagement_rate'], ['2.50'])
+
+    def test_decimals_render_like_the_per_row_payload(self):
+        rows = self.client.get(self.url, {'start_date': '2025-07-07', 'end_date': '2025-07-07'}).json()
+        buckets = self.client.get(self.url, {
+            'granularity': 'day', 'start_date': '2025-07-07', 'end_date': '2025-07-07',
+        }).json()['columns']
+        self.assertEqual(buckets['gmv'], [rows[0]['gmv']])
+        self.assertEqual(buckets['engagement_rate'], [rows[0]['engagement_rate']])
+
+    def test_unknown_granularity_is_rejected(self):
+        response = self.client.get(self.url, {'granularity': 'year'})
+        self.assertEqual(response.status_code, 400)
+
+
+class DataTrackingImportTests(TestCase):
+    header = ('creator,creator_id,about_video,video_id,upload_time,view,like,share,comment,product_linked,'
+              'new_followers,product_impressions,product_entries,gmv,ctr,revenue_from_videos\n')
+
+    def setUp(self):
+        self.project = make_project()
+        self.url = reverse('data_tracking_import', args=[self.project.id])
+
+    def upload(self, body, name='export.csv'):
+        upload = SimpleUploadedFile(name, (self.header + body).encode('utf-8'), content_type='text/csv')
+        return self.client.post(self.url, {'file': upload})
+
+    def test_valid_rows_are_created_and_bad_rows_reported(self):
+        response = self.upload(
+            'Quỳnh Anh,c1,review,v1,2025-07-01,"1,200",10,1,2,https://shop.example.com/p,3,100,5,900,2,800\n'
+            'Quỳnh Anh,c1,review,v2,2025-07-01,abc,10,1,2,not-a-url,3,100,5,900,2,800\n'
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(response.data['error_count'], 1)
+        self.assertEqual(response.data['errors'][0]['row'], 3)
+        self.assertEqual(set(response.data['errors'][0]['errors']), {'view', 'product_linked'})
+        self.assertEqual(DataTracking.objects.get(project=self.project).view, 1200)
+        self.assertEqual(BrandDashboardStats.objects.get().clicks_today, 5)
+
+    def test_missing_columns_are_rejected(self):
+        upload = SimpleUploadedFile('export.csv', b'creator,video_id\nx,y\n', content_type='text/csv')
+        response = self.client.post(self.url, {'file': upload})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Missing columns', response.data['error'])
+
+    def test_short_first_row_is_a_row_error_not_missing_columns(self):
+        response = self.upload(
+            'Quỳnh Anh,c1,review,v1\n'
+            'Quỳnh Anh,c1,review,v2,2025-07-01,1,10,1,2,https://shop.example.com/p,3,100,5,900,2,800\n'
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(response.data['errors'][0]['row'], 2)
+
+    def test_non_utf8_csv_is_rejected(self):
+        body = 'Thành,c1,review,v1,2025-07-01,1,10,1,2,https://shop.example.com/p,3,100,5,900,2,800\n'
+        upload = SimpleUploadedFile('export.csv', (self.header + body).encode('cp1258'), content_type='text/csv')
+        response = self.client.post(self.url, {'file': upload})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('UTF-8', response.data['error'])
+        self.assertFalse(DataTracking.objects.exists())
+
+    def test_utf16_tab_separated_export_is_imported(self):
+        text = (self.header + 'Quỳnh Anh,c1,review,v1,2025-07-01,1,10,1,2,https://shop.example.com/p,3,100,5,900,2,800\n')
+        upload = SimpleUploadedFile('export.csv', text.replace(',', '\t').encode('utf-16'), content_type='text/csv')
+        response = self.client.post(self.url, {'file': upload})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(DataTracking.objects.get(project=self.project).creator, 'Quỳnh Anh')
+
+    @unittest.skipUnless(importlib.util.find_spec('openpyxl'), 'XLSX import needs openpyxl')
+    def test_corrupt_xlsx_is_rejected(self):
+        upload = SimpleUploadedFile('export.xlsx', b'not a zip archive', content_type='application/octet-stream')
+        response = self.client.post(self.url, {'file': upload})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('.xlsx', response.data['error'])
+
+    def test_out_of_range_integer_is_a_row_error(self):
+        response = self.upload(
+            'Quỳnh Anh,c1,review,v1,2025-07-01,1,10,1,2,https://shop.example.com/p,3,100,5,99999999999,2,800\n'
+            'Quỳnh Anh,c1,review,v2,2025-07-01,1,10,1,2,https://shop.example.com/p,3,100,5,900,2,800\n'
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(set(response.data['errors'][0]['errors']), {'gmv'})
+
+
+class DataTrackingUpsertTests(TestCase):
+    def setUp(self):
+        self.project = make_project()
+        self.url = reverse('data_tracking_upsert', args=[self.project.id])
+
+    def row(self, video_id, view, product_entries=1):
+        return {
+            'creator': 'creator', 'creator_id': 'c1', 'about_video': 'about', 'video_id': video_id,
+            'upload_time': '2025-07-01', 'view': view, 'like': 0, 'share': 0, 'comment': 0,
+            'product_linked': 'https://shop.example.com/p', 'new_followers': 0, 'product_impressions': 0,
+            'product_entries': product_entries, 'gmv': 0, 'ctr': 0, 'revenue_from_videos': 0,
+        }
+
+    def test_upsert_is_idempotent_and_updates_metrics(self):
+        existing = make_data_tracking(self.project, video_id='v1', view=1, product_entries=2)
+        rows = [self.row('v1', 100, product_entries=5), self.row('v2', 50, product_entries=1)]
+
+        response = self.client.post(self.url, rows, content_type='application/json')
+        self.assertEqual((response.data['created'], response.data['updated']), (1, 1))
+        response = self.client.post(self.url, rows, content_type='application/json')
+        self.assertEqual((response.data['created'], response.data['updated']), (0, 2))
+
+        self.assertEqual(DataTracking.objects.filter(project=self.project).count(), 2)
+        existing.refresh_from_db()
+        self.assertEqual(existing.view, 100)
+        self.assertEqual(BrandDashboardStats.objects.get().clicks_today, 6)
+
+    def test_fractional_numbers_are_rejected_not_truncated(self):
+        rows = [self.row('v1', 1.5), self.row('v2', 2.0)]
+        response = self.client.post(self.url, rows, content_type='application/json')
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(response.data['errors'][0]['row'], 0)
+        self.assertIn('view', response.data['errors'][0]['errors'])
+        self.assertEqual(DataTracking.objects.get(project=self.project).view, 2)
+
+    def test_null_text_is_missing_not_none(self):
+        rows = [{**self.row('v1', 1), 'about_video': None}, {**self.row('v2', 1), 'like': None}]
+        response = self.client.post(self.url, rows, content_type='application/json')
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(response.data['errors'][0]['errors'], {'about_video': 'This field is required.'})
+        self.assertEqual(DataTracking.objects.get(project=self.project).like, 0)
+
+    def test_single_row_create_rejects_duplicate_video(self):
+        make_data_tracking(self.project, video_id='v1')
+        response = self.client.post(
+            reverse('data_tracking_list', args=[self.project.id]), self.row('v1', 1), content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('video_id', response.data)
+
+
+class ExportTests(TestCase):
+    def test_data_tracking_export_round_trips_through_import(self):
+        project = make_project()
+        make_data_tracking(project, video_id='v1', view=10, creator='Quỳnh Anh')
+        make_data_tracking(project, video_id='v2', view=20)
+
+        response = self.client.get(reverse('data_tracking_export', args=[project.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        body = b''.join(response.streaming_content)
+        lines = body.decode('utf-8-sig').splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertIn('video_id', lines[0])
+        self.assertIn('Quỳnh Anh', body.decode('utf-8'))
+
+        other = make_project('campaign_2')
+        upload = SimpleUploadedFile('export.csv', body, content_type='text/csv')
+        response = self.client.post(reverse('data_tracking_import', args=[other.id]), {'file': upload})
+        self.assertEqual(response.data['created'], 2)
+
+    def test_formula_text_is_escaped(self):
+        project = make_project()
+        make_kol(project, '=HYPERLINK("http://evil.example","x")', note='@SUM(1+1)', followers=-1)
+
+        response = self.client.get(reverse('kol_export', args=[project.id]))
+        body = b''.join(response.streaming_content).decode('utf-8-sig')
+        row = next(csv.DictReader(StringIO(body)))
+        self.assertEqual(row['full_name'], '\'=HYPERLINK("http://evil.example","x")')
+        self.assertEqual(row['note'], "'@SUM(1+1)")
+        # Numbers are not text, so they are written as-is
+        self.assertEqual(row['followers'], '-1')
+
+
+class ChunkedUploadTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.project = make_project()
+        self.tracking = make_data_tracking(self.project)
+
+    def put_chunk(self, upload_id, offset, data):
+        url = reverse('chunked_upload', args=[self.project.id, upload_id])
+        return self.client.put(f'{url}?offset={offset}', data, content_type='application/octet-stream')
+
+    def test_upload_resumes_and_attaches_file(self):
+        payload = os.urandom(300 * 1024)
+        response = self.client.post(reverse('chunked_upload_init', args=[self.project.id]), {
+            'target': 'data_tracking', 'object_id': self.tracking.id,
+            'filename': '../clip.mp4', 'total_size': len(payload),
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        upload_id = response.data['upload_id']
+
+        self.assertEqual(self.put_chunk(upload_id, 0, payload[:100 * 1024]).data['offset'], 100 * 1024)
+        # A retried chunk with a stale offset is told where to resume
+        response = self.put_chunk(upload_id, 0, payload[:100 * 1024])
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['offset'], 100 * 1024)
+
+        finalize_url = reverse('chunked_upload_finalize', args=[self.project.id, upload_id])
+        self.assertEqual(self.client.post(finalize_url).status_code, 400)
+
+        self.put_chunk(upload_id, 100 * 1024, payload[100 * 1024:])
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(finalize_url)
+        self.assertEqual(response.status_code, 200)
+        # The .part file outlives the transaction, in case it rolls back
+        self.assertEqual(len(os.listdir(os.path.join(self.media_root, 'chunked_uploads'))), 1)
+        for callback in callbacks:
+            callback()
+
+        self.tracking.refresh_from_db()
+        self.assertEqual(self.tracking.video_file.name, 'videos/data_tracking/clip.mp4')
+        with self.tracking.video_file.open('rb') as f:
+            self.assertEqual(f.read(), payload)
+        self.assertEqual(os.listdir(os.path.join(self.media_root, 'chunked_uploads')), [])
+
+
+    def test_chunk_body_is_read_before_the_row_is_locked(self):
+        upload = ChunkedUpload.objects.create(
+            project=self.project, target='data_tracking', object_id=self.tracking.id,
+            filename='clip.mp4', total_size=8,
+        )
+        queries_at_read = []
+
+        class Stream(BytesIO):
+            def read(self, size=-1):
+                queries_at_read.append(len(captured.captured_queries))
+                return super().read(size)
+
+        with CaptureQueriesContext(connection) as captured:
+            append_chunk(upload.upload_id, 0, Stream(b'12345678'), 8)
+        locked_at = next(
+            i for i, query in enumerate(captured.captured_queries) if 'FOR UPDATE' in query['sql']
+        )
+        self.assertLessEqual(max(queries_at_read), locked_at)
+        with open(part_path(upload), 'rb') as part:
+            self.assertEqual(part.read(), b'12345678')
+
+
+class KOLNumericFieldTests(TestCase):
+    def test_parse_abbreviated_number(self):
+        cases = {
+            '1.2M': 1200000, '12,5K': 12500, '1.234.567': 1234567, '12,500': 12500,
+            '1.5': Decimal('1.5'), '5tr': 5000000, '2 tỷ': 2000000000, '5.000.000đ': 5000000,
+            '1.234,5': Decimal('1234.5'),
+        }
+        for text, expected in cases.items():
+            self.assertEqual(parse_abbreviated_number(text), expected, text)
+        with self.assertRaises(ValueError):
+            parse_abbreviated_number('abc')
+
+    def test_api_accepts_abbreviated_input_and_returns_numbers(self):
+        project = make_project()
+        payload = {
+            'full_name': 'Quỳnh Anh', 'submitted_on': '01/07/2025', 'email': 'kol@example.com',
+            'phone_number': '0900000000', 'zalo': '0900000000', 'tiktok_url': 'https://www.tiktok.com/@qa',
+            'tiktok_id': 'qa', 'followers': '1.2M', 'gmv': '5tr', 'channel_identifier': 'qa',
+            'appropriate_channel_topic': 'beauty', 'shipping_address': 'HCM', 'brand_approval': 'pending',
+            'note': 'ok', 'kol_koc_approval_time': '01/07/2025', 'number_tracking': '3',
+            'koc_confirmed_by_nova': 'yes',
+        }
+        response = self.client.post(reverse('kol_list', args=[project.id]), payload)
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data['followers'], 1200000)
+        self.assertEqual(response.data['gmv'], '5000000.00')
+
+        response = self.client.post(reverse('kol_list', args=[project.id]), {**payload, 'followers': 'lots'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('followers', response.data)
+
+        for field, value in (('followers', '99999999999999999999'), ('number_tracking', 3000000000)):
+            response = self.client.post(reverse('kol_list', args=[project.id]), {**payload, field: value})
+            self.assertEqual(response.status_code, 400)
+            self.assertIn(field, response.data)
+
+
+class KOLListFilterTests(TestCase):
+    def setUp(self):
+        self.project = make_project()
+        self.url = f'/api/admin/projects/{self.project.id}/kols/'
+        make_kol(self.project, 'Nguyễn Văn An', tiktok_id='an.nguyen', followers=5000,
+                 brand_approval='approved', submitted_on=date(2025, 7, 1))
+        make_kol(self.project, 'Trần Thị Bình', tiktok_id='binhtran', email='binh@shop.vn', followers=120000,
+                 brand_approval='pending', submitted_on=date(2025, 7, 10))
+        make_kol(self.project, 'Lê Minh Châu', tiktok_id='chau.le', followers=80000,
+                 brand_approval='approved', submitted_on=date(2025, 7, 20))
+
+    def names(self, response):
+        self.assertEqual(response.status_code, 200)
+        return [kol['full_name'] for kol in response.json()['results']]
+
+    def test_filters_combine(self):
+        response = self.client.get(self.url, {'brand_approval': 'approved', 'min_followers': 10000})
+        self.assertEqual(self.names(response), ['Lê Minh Châu'])
+
+        response = self.client.get(self.url, {'submitted_from': '05/07/2025', 'submitted_to': '2025-07-15'})
+        self.assertEqual(self.names(response), ['Trần Thị Bình'])
+
+    def test_follower_range_ignores_non_integers(self):
+        response = self.client.get(self.url, {'min_followers': 'many', 'max_followers': 100000})
+        self.assertEqual(sorted(self.names(response)), ['Lê Minh Châu', 'Nguyễn Văn An'])
+
+    def test_search_matches_name_tiktok_id_and_email(self):
+        self.assertEqual(self.names(self.client.get(self.url, {'search': 'minh'})), ['Lê Minh Châu'])
+        self.assertEqual(self.names(self.client.get(self.url, {'search': 'AN.NGUYEN'})), ['Nguyễn Văn An'])
+        self.assertEqual(self.names(self.client.get(self.url, {'search': 'shop.vn'})), ['Trần Thị Bình'])
+
+    def test_ordering_paginates_on_sort_key(self):
+        response = self.client.get(self.url, {'ordering': '-followers', 'page_size': 2})
+        self.assertEqual(self.names(response), ['Trần Thị Bình', 'Lê Minh Châu'])
+
+        response = self.client.get(response.json()['next'])
+        self.assertEqual(self.names(response), ['Nguyễn Văn An'])
+        self.assertIsNone(response.json()['next'])
+
+    def test_invalid_ordering_and_cursor(self):
+        self.assertEqual(self.client.get(self.url, {'ordering': 'phone_number'}).status_code, 400)
+
+        first = self.client.get(self.url, {'ordering': 'gmv', 'page_size': 1}).json()
+        cursor = first['next'].split('cursor=')[1]
+        response = self.client.get(self.url, {'ordering': '-followers', 'cursor': cursor})
+        self.assertEqual(response.status_code, 404)
+
+    @unittest.skipUnless(connection.vendor == 'postgresql', 'OpClass indexes are Postgres specific')
+    def test_trigram_indexes_render_the_operator_class_outside_the_expression(self):
+        # Without django.contrib.postgres installed OpClass renders as "((UPPER(...) gin_trgm_ops))"
+        index = next(index for index in KOL._meta.indexes if index.name == 'kol_full_name_trgm_idx')
+        with connection.schema_editor() as editor:
+            sql = str(index.create_sql(KOL, editor))
+        self.assertIn('(UPPER("full_name")) ', sql)
+
+
+class CreatorListFilterTests(TestCase):
+    def setUp(self):
+        make_creator('beauty_big', categories=['beauty', 'fashion'], gender='female', followers_count=800000)
+        make_creator('beauty_small', categories=['beauty'], gender='female', followers_count=20000)
+        make_creator('food_big', categories=['food'], gender='male', followers_count=900000)
+
+    def test_category_gender_and_follower_filters(self):
+        response = self.client.get('/api/brand/creators/', {
+            'category': 'beauty', 'gender': 'female', 'min_followers': 500000,
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([creator['username'] for creator in response.json()], ['beauty_big'])
+
+        response = self.client.get('/api/brand/creators/?category=beauty&category=fashion')
+        self.assertEqual([creator['username'] for creator in response.json()], ['beauty_big'])
+
+    @unittest.skipUnless(connection.vendor == 'postgresql', 'EXPLAIN output is Postgres specific')
+    def test_filters_use_indexes(self):
+        # The table is tiny, so take sequential scans off the table for the planner
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+
+        plan = Creator.objects.filter(categories__contains=['beauty']).explain()
+        self.assertIn('creator_categories_gin', plan)
+
+        plan = Creator.objects.filter(gender='female', followers_count__gte=500000).explain()
+        self.assertIn('creator_gender_followers_idx', plan)
+
+
+class CreatorSearchTests(TestCase):
+    def setUp(self):
+        make_creator('quynhanh', display_name='Nguyễn Quỳnh Anh', followers_count=5000)
+        make_creator('anhquynh.beauty', display_name='Trần Anh Quỳnh', followers_count=900000)
+        make_creator('lananh', display_name='Lê Lan Anh', followers_count=100)
+        make_creator('dung', display_name='Đặng Dũng', followers_count=100)
+        make_creator('anh.official', display_name='Anh Official', followers_count=10)
+
+    def search(self, **params):
+        response = self.client.get('/api/brand/creators/search/', params)
+        self.assertEqual(response.status_code, 200)
+        return [creator['username'] for creator in response.json()]
+
+    def test_matches_without_diacritics_and_ranks_prefix_first(self):
+        self.assertEqual(self.search(q='nguyen quynh anh'), ['quynhanh'])
+        self.assertEqual(self.search(q='Dang dung'), ['dung'])
+        # Every word must match, bigger creators first within a rank
+        self.assertEqual(self.search(q='quỳnh'), ['anhquynh.beauty', 'quynhanh'])
+        self.assertEqual(self.search(q='tran anh'), ['anhquynh.beauty'])
+        # A name prefix outranks word matches from bigger creators
+        self.assertEqual(self.search(q='anh', limit=2), ['anh.official', 'anhquynh.beauty'])
+
+    def test_search_name_follows_renames(self):
+        creator = Creator.objects.get(username='lananh')
+        creator.display_name = 'Phạm Thu Hà'
+        creator.save(update_fields=['display_name'])
+        self.assertEqual(self.search(q='thu ha'), ['lananh'])
+        self.assertEqual(self.search(q=''), [])
+
+
+class AnalyticsResponseCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.creator = make_creator()
+        add_analytics_rows(self.creator, 2)
+        self.url = reverse('creator_analytics', args=[self.creator.id])
+
+    def test_second_request_is_served_from_cache(self):
+        first = self.client.get(self.url)
+        # Only the ETag validator touches the database
+        with self.assertNumQueries(1):
+            second = self.client.get(self.url)
+        self.assertEqual(second.json(), first.json())
+
+        stats = self.client.get(reverse('analytics_cache_stats')).json()
+        self.assertEqual(stats['analytics'], {'hits': 1, 'misses': 1, 'hit_ratio': 0.5})
+
+    def test_saves_and_deletes_invalidate_after_commit(self):
+        detail_url = reverse('creator_detail', args=[self.creator.id])
+        self.client.get(self.url)
+        self.client.get(detail_url)
+        live_url = reverse('live_analytics', args=[self.creator.id])
+        self.client.get(live_url)
+
+        first, latest = CreatorAnalytics.objects.filter(creator=self.creator).order_by('id')
+        with self.captureOnCommitCallbacks(execute=True):
+            latest.delete()
+        self.assertEqual(len(self.client.get(self.url).json()), 1)
+        self.assertEqual(self.client.get(detail_url).json()['latest_analytics']['id'], first.id)
+        # Rows of other models leave unrelated endpoints cached
+        with self.assertNumQueries(1):
+            self.client.get(live_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.creator.display_name = 'Trần Thảo'
+            self.creator.save()
+        self.assertEqual(self.client.get(live_url).json()[0]['creator_name'], 'Trần Thảo')
+
+    def test_response_built_before_a_commit_is_not_served_after_it(self):
+        data, version = caching.get_response('analytics', self.creator.id)
+        stale = self.client.get(self.url).json()
+        with self.captureOnCommitCallbacks(execute=True):
+            CreatorAnalytics.objects.filter(creator=self.creator).first().delete()
+        # A request that read the rows before the commit stores its response afterwards
+        caching.set_response('analytics', self.creator.id, version, stale)
+        self.assertEqual(len(self.client.get(self.url).json()), 1)
+
+    @override_settings(ANALYTICS_CACHE_SETTLE_TIMEOUT=5)
+    def test_responses_right_after_an_invalidation_are_cached_briefly(self):
+        caching.invalidate_creator(self.creator.id)
+        with mock.patch.object(caching.cache, 'set', wraps=caching.cache.set) as cache_set:
+            self.client.get(self.url)
+        self.assertEqual(cache_set.call_args.kwargs['timeout'], 5)
+
+    def test_missing_creator_is_not_cached(self):
+        url = reverse('creator_analytics', args=[self.creator.id + 1000])
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        self.creator = make_creator()
+        add_analytics_rows(self.creator, 2)
+
+    def assert_not_modified_until_changed(self, url, change):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+        change()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_dashboard_stats(self):
+        self.assert_not_modified_until_changed(
+            reverse('brand_dashboard_stats'),
+            lambda: TrendData.objects.create(creator=self.creator, date=timezone.now().date(), products_sold=3),
+        )
+
+    def test_creator_list(self):
+        self.assert_not_modified_until_changed(
+            reverse('creator_list'), lambda: make_creator('creator_two'),
+        )
+
+    def test_per_creator_analytics_notices_deletes(self):
+        self.assert_not_modified_until_changed(
+            reverse('video_analytics', args=[self.creator.id]),
+            lambda: VideoAnalytics.objects.filter(creator=self.creator).first().delete(),
+        )
+
+    def test_creator_detail_notices_related_rows(self):
+        self.assert_not_modified_until_changed(
+            reverse('creator_detail', args=[self.creator.id]),
+            lambda: FollowerDemographics.objects.create(creator=self.creator, snapshot_date=date(2025, 8, 1)),
+        )
+
+    def test_unknown_creator_is_still_404(self):
+        response = self.client.get(reverse('creator_analytics', args=[self.creator.id + 1000]))
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(response.has_header('ETag'))
+
+
+@override_settings(CREATOR_PROFILE_DOCUMENTS=True)
+class CreatorProfileDocumentTests(TestCase):
+    def setUp(self):
+        self.creator = make_creator()
+        add_analytics_rows(self.creator, 2)
+        self.url = reverse('creator_detail', args=[self.creator.id])
+
+    def test_document_is_served_as_stored_bytes(self):
+        built = self.client.get(self.url)
+        self.assertEqual(built.status_code, 200)
+        # ETag validator + document read, no serializer queries
+        with self.assertNumQueries(2):
+            served = self.client.get(self.url)
+        self.assertEqual(served['Content-Type'], 'application/json')
+        self.assertEqual(served.content, built.content)
+        self.assertEqual(served.json()['username'], 'creator_one')
+
+    def test_analytics_writes_flag_the_document_and_it_is_rebuilt(self):
+        self.client.get(self.url)
+        TrendData.objects.create(creator=self.creator, date=date(2025, 9, 1), gmv=Decimal('12.50'))
+        self.assertTrue(CreatorProfileDocument.objects.get(creator=self.creator).stale)
+
+        call_command('rebuild_creator_profiles', stdout=StringIO())
+        document = CreatorProfileDocument.objects.get(creator=self.creator)
+        self.assertFalse(document.stale)
+        self.assertEqual(self.client.get(self.url).json()['trend_data'][0]['date'], '01/09/2025')
+
+    def test_rebuild_racing_a_newer_write_stays_stale(self):
+        rebuild_document(self.creator.id)
+        CreatorProfileDocument.objects.filter(creator=self.creator).update(stale=True)
+
+        with mock.patch('myapp.profiles.render_document', side_effect=self.render_with_concurrent_write):
+            rebuild_document(self.creator.id)
+        self.assertTrue(CreatorProfileDocument.objects.get(creator=self.creator).stale)
+
+    def render_with_concurrent_write(self, creator_id):
+        LiveAnalytics.objects.create(creator=self.creator, start_date=date(2025, 9, 1), end_date=date(2025, 9, 1))
+        return b'{}'
+
+    def test_writes_while_disabled_still_flag_the_document(self):
+        self.client.get(self.url)
+        with override_settings(CREATOR_PROFILE_DOCUMENTS=False):
+            self.creator.display_name = 'Trần Thảo'
+            self.creator.save()
+            out = StringIO()
+            call_command('rebuild_creator_profiles', stdout=out)
+            self.assertIn('not rebuilt', out.getvalue())
+        self.assertTrue(CreatorProfileDocument.objects.get(creator=self.creator).stale)
+        self.assertEqual(self.client.get(self.url).json()['display_name'], 'Trần Thảo')
+
+    def test_missing_creator_is_404(self):
+        response = self.client.get(reverse('creator_detail', args=[self.creator.id + 1000]))
+        self.assertEqual(response.status_code, 404)
+
+
+class AsyncBrandViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.creator = make_creator()
+        add_analytics_rows(self.creator, 3)
+
+    async def test_async_views_match_sync_responses(self):
+        names = [
+            ('brand_dashboard_stats', []),
+            ('creator_list', []),
+            ('creator_detail', [self.creator.id]),
+            ('creator_analytics', [self.creator.id]),
+            ('video_analytics', [self.creator.id]),
+            ('live_analytics', [self.creator.id]),
+            ('follower_demographics', [self.creator.id]),
+            ('trend_data', [self.creator.id]),
+        ]
+        for name, args in names:
+            with self.subTest(name):
+                sync_response = await self.async_client.get(reverse(name, args=args))
+                async_response = await self.async_client.get(reverse(f'async_{name}', args=args))
+                self.assertEqual(async_response.status_code, 200)
+                self.assertEqual(async_response.json(), sync_response.json())
+
+    def test_async_detail_query_count_and_404(self):
+        get = async_to_sync(self.async_client.get)
+        # ETag validator, 1 creator lookup + 5 latest/trend queries, no lazy loads from the serializers
+        with self.assertNumQueries(7):
+            response = get(reverse('async_creator_detail', args=[self.creator.id]))
+        self.assertEqual(len(response.json()['trend_data']), 3)
+
+        response = get(reverse('async_creator_analytics', args=[self.creator.id + 1000]))
+        self.assertEqual(response.status_code, 404)
+
+    async def test_async_trend_buckets_match_sync_response(self):
+        params = {'granularity': 'week'}
+        sync_response = await self.async_client.get(reverse('trend_data', args=[self.creator.id]), params)
+        async_response = await self.async_client.get(reverse('async_trend_data', args=[self.creator.id]), params)
+        self.assertEqual(async_response.status_code, 200)
+        self.assertEqual(async_response.json(), sync_response.json())
+
+        response = await self.async_client.get(reverse('async_trend_data', args=[self.creator.id]),
+                                               {'granularity': 'year'})
+        self.assertEqual(response.status_code, 400)
+
+
+    def test_async_views_share_the_response_cache_and_etags(self):
+        get = async_to_sync(self.async_client.get)
+        url = reverse('async_creator_analytics', args=[self.creator.id])
+        etag = self.client.get(reverse('creator_analytics', args=[self.creator.id]))['ETag']
+        # Only the ETag validator: the sync view's cached response is reused
+        with self.assertNumQueries(1):
+            response = get(url)
+        self.assertEqual(response['ETag'], etag)
+
+        response = get(url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+
+
+@override_settings(DATABASE_REPLICAS=['replica1'])
+class ReplicaRouterTests(TestCase):
+    def test_safe_request_reads_analytics_from_replica_until_it_writes(self):
+        project = make_project()
+        with request_routing(safe=True):
+            self.assertEqual(Creator.objects.all().db, 'replica1')
+            self.assertEqual(TrendData.objects.all().db, 'replica1')
+            # Operational models always stay on the primary
+            self.assertEqual(KOL.objects.all().db, 'default')
+
+            make_kol(project)
+            self.assertEqual(Creator.objects.all().db, 'default')
+
+    def test_locking_reads_do_not_pin(self):
+        project = make_project()
+        with request_routing(safe=True) as state:
+            list(Project.objects.select_for_update().filter(id=project.id))
+            self.assertFalse(state.wrote)
+            self.assertEqual(Creator.objects.all().db, 'replica1')
+
+            Project.objects.filter(id=project.id).update(name='Renamed')
+            self.assertTrue(state.wrote)
+
+    def test_writes_pinned_clients_and_background_code_use_primary(self):
+        with request_routing(safe=False):
+            self.assertEqual(Creator.objects.all().db, 'default')
+        with request_routing(safe=True, pinned=True):
+            self.assertEqual(Creator.objects.all().db, 'default')
+        self.assertEqual(Creator.objects.all().db, 'default')
+
+    def test_writing_request_pins_the_client_to_primary(self):
+        project = make_project()
+        response = self.client.post(
+            f'/api/admin/projects/{project.id}/data-tracking/upsert/', [], content_type='application/json'
+        )
+        self.assertNotIn(REPLICA_PIN_COOKIE, response.cookies)
+
+        response = self.client.post(reverse('register'), {
+            'username': 'brand_user', 'password': 'S3cure-pass!', 'confirm_password': 'S3cure-pass!',
+        })
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.cookies[REPLICA_PIN_COOKIE]['max-age'], settings.DB_REPLICA_PIN_SECONDS)
+
+
+@unittest.skipUnless(settings.DATABASE_REPLICAS, 'Set POSTGRES_REPLICA_HOSTS to test against a replica alias')
+class ReplicaAliasTests(TransactionTestCase):
+    """Runs queries on a real second alias, a test mirror of the primary.
+
+    POSTGRES_REPLICA_HOSTS may name the primary's own host; run this class on
+    its own, as the other tests assume no replicas.
+    """
+    databases = {'default', *settings.DATABASE_REPLICAS[:1]}
+
+    def test_reads_use_the_replica_connection_until_the_request_writes(self):
+        creator = make_creator()
+        replica = settings.DATABASE_REPLICAS[0]
+        with override_settings(DATABASE_REPLICAS=[replica]), request_routing(safe=True):
+            with CaptureQueriesContext(connections[replica]) as replica_queries:
+                self.assertEqual(Creator.objects.get(id=creator.id).followers_count, 1000)
+                Creator.objects.filter(id=creator.id).update(followers_count=5)
+                self.assertEqual(Creator.objects.get(id=creator.id).followers_count, 5)
+        self.assertEqual(len(replica_queries), 1)
+
+
+class QueryBudgetTests(TestCase):
+    """Every endpoint in profiling.QUERY_BUDGETS must stay within its budget"""
+
+    def setUp(self):
+        cache.clear()
+        self.project = make_project()
+        for i in range(3):
+            make_kol(self.project, f'KOL {i}')
+            make_data_tracking(self.project, f'video_{i}')
+            TrackingNumber.objects.create(
+                project=self.project, tracking_number=f'TN{i}', phone_number='0900000000',
+                tracking_url='https://example.com/t', tracking_date=date(2025, 7, 1), tiktok_id='kol',
+            )
+            creator = make_creator(f'creator_{i}')
+            add_analytics_rows(creator, 3)
+        self.creator = creator
+
+    def url_for(self, name):
+        if name.startswith(('kol_', 'data_tracking_', 'tracking_number_')):
+            return reverse(name, args=[self.project.id])
+        if name in ('creator_list', 'creator_search', 'creator_snapshot_list', 'project_list',
+                    'brand_dashboard_stats'):
+            return reverse(name) + ('?q=creator' if name == 'creator_search' else '')
+        return reverse(name, args=[self.creator.id])
+
+    def test_endpoints_stay_within_query_budgets(self):
+        for name, budget in QUERY_BUDGETS.items():
+            with self.subTest(name):
+                cache.clear()
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.get(self.url_for(name))
+                self.assertEqual(response.status_code, 200)
+                self.assertLessEqual(
+                    len(queries), budget,
+                    f'{name} ran {len(queries)} queries (budget {budget}):\n'
+                    + '\n'.join(query['sql'] for query in queries.captured_queries)
+                )
+
+
+@override_settings(QUERY_PROFILER=True)
+class QueryProfilerTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        profiling.install()
+
+    @classmethod
+    def tearDownClass(cls):
+        profiling.uninstall()
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        profiling.stats.reset()
+        self.creator = make_creator()
+        add_analytics_rows(self.creator, 2)
+
+    def test_server_timing_header_and_stats(self):
+        url = reverse('creator_detail', args=[self.creator.id])
+        response = self.client.get(url)
+        timing = response['Server-Timing']
+        self.assertIn('db;dur=', timing)
+        self.assertIn('desc="7 queries"', timing)
+        self.assertIn(f'bytes;desc="{len(response.content)}"', timing)
+
+        self.client.get(url)
+        stats = self.client.get(reverse('profiler_stats')).json()['creator_detail']
+        self.assertEqual(stats['requests'], 2)
+        self.assertEqual(stats['max_queries'], 7)
+        self.assertEqual(stats['query_budget'], QUERY_BUDGETS['creator_detail'])
+        self.assertGreater(stats['avg_serializer_ms'], 0)
+
+    def test_uninstall_removes_the_hooks(self):
+        profiling.uninstall()
+        try:
+            self.assertNotIn(profiling.record_query, connection.execute_wrappers)
+            self.assertFalse(hasattr(profiling.serializers.Serializer.data.fget, 'profiled'))
+        finally:
+            profiling.install()
+
+    def test_stats_are_for_local_unproxied_clients_only(self):
+        url = reverse('profiler_stats')
+        self.assertEqual(self.client.get(url, REMOTE_ADDR='203.0.113.7').status_code, 403)
+        self.assertEqual(self.client.get(url, HTTP_X_FORWARDED_FOR='203.0.113.7').status_code, 403)
+
+    def test_queries_from_async_views_are_counted(self):
+        response = self.client.get(reverse('async_creator_detail', args=[self.creator.id]))
+        self.assertIn('desc="7 queries"', response['Server-Timing'])
+
+    def test_over_budget_requests_are_logged(self):
+        with mock.patch.dict(QUERY_BUDGETS, {'creator_analytics': 1}):
+            with self.assertLogs('myapp.profiling', 'WARNING') as logs:
+                self.client.get(reverse('creator_analytics', args=[self.creator.id]))
+        self.assertIn('url_name=creator_analytics', logs.output[0])
+
+
+@override_settings(METRICS_ENABLED=True)
+class MetricsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        profiling.install_query_wrapper()
+
+    @classmethod
+    def tearDownClass(cls):
+        profiling.uninstall_query_wrapper()
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        metrics.reset()
+        self.creator = make_creator()
+        add_analytics_rows(self.creator, 2)
+
+    def scrape(self, **extra):
+        return self.client.get(reverse('metrics'), **extra)
+
+    def test_request_metrics_keyed_by_url_name(self):
+        url = reverse('creator_analytics', args=[self.creator.id])
+        self.client.get(url)
+        self.client.get(url)
+        self.client.get(reverse('creator_detail', args=[self.creator.id]))
+
+        response = self.scrape()
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        body = response.content.decode()
+        self.assertIn('# TYPE nova_http_request_duration_seconds histogram', body)
+        self.assertIn(
+            'nova_http_requests_total{url_name="creator_analytics",method="GET",status="200"} 2', body
+        )
+        self.assertIn('nova_http_request_duration_seconds_count{url_name="creator_analytics"} 2', body)
+        self.assertIn('nova_http_request_duration_seconds_bucket{url_name="creator_detail",le="+Inf"} 1', body)
+        self.assertIn('nova_db_queries_total{url_name="creator_detail"} 7', body)
+        # The scrape itself is still in flight
+        self.assertIn('nova_http_requests_in_flight 1', body)
+        self.assertIn('nova_cache_requests_total{endpoint="analytics",result="hit"} 1', body)
+        self.assertIn('nova_cache_hit_ratio{endpoint="analytics"} 0.5', body)
+
+    def test_exited_threads_are_folded_into_the_retired_total(self):
+        labels = (('url_name', 'test'),)
+
+        def request():
+            metrics.inc('nova_db_queries_total', labels)
+            metrics.observe('nova_http_request_duration_seconds', 0.25, labels)
+
+        for _ in range(20):
+            thread = threading.Thread(target=request)
+            thread.start()
+            thread.join()
+        totals = metrics.snapshot()
+        self.assertEqual(totals['counters'][('nova_db_queries_total', labels)], 20)
+        self.assertEqual(totals['histograms'][('nova_http_request_duration_seconds', labels)][-1], 5.0)
+        self.assertTrue(all(shard.thread.is_alive() for shard in metrics._shards))
+
+    def test_only_local_unproxied_clients(self):
+        self.assertEqual(self.scrape(REMOTE_ADDR='203.0.113.7').status_code, 403)
+        self.assertEqual(self.scrape(HTTP_X_FORWARDED_FOR='203.0.113.7').status_code, 403)
+
+    def test_workers_are_aggregated(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        labels = (('url_name', 'kol_list'),)
+        exited_worker = {
+            'counters': {('nova_db_queries_total', labels): 5},
+            'gauges': {('nova_http_requests_in_flight', ()): 3},
+            'histograms': {},
+        }
+        metrics.write_totals(metrics.process_file(directory, '999999999_1'), exited_worker)
+
+        metrics.inc('nova_db_queries_total', labels, 2)
+        with override_settings(METRICS_MULTIPROC_DIR=directory):
+            totals = metrics.collect()
+        self.assertEqual(totals['counters'][('nova_db_queries_total', labels)], 7)
+        self.assertNotIn(('nova_http_requests_in_flight', ()), totals['gauges'])
+
+    @unittest.skipUnless(os.path.exists('/proc/self/stat'), 'Process start times come from /proc')
+    def test_exited_workers_survive_pid_reuse(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        labels = (('url_name', 'kol_list'),)
+        # A worker that exited, whose pid now belongs to this process
+        metrics.write_totals(metrics.process_file(directory, f'{os.getpid()}_1'), {
+            'counters': {('nova_db_queries_total', labels): 5}, 'gauges': {}, 'histograms': {},
+        })
+
+        metrics.inc('nova_db_queries_total', labels, 2)
+        with override_settings(METRICS_MULTIPROC_DIR=directory):
+            self.assertEqual(metrics.collect()['counters'][('nova_db_queries_total', labels)], 7)
+            # Folded into the dead totals once, not again on the next scrape
+            self.assertEqual(metrics.collect()['counters'][('nova_db_queries_total', labels)], 7)
+        self.assertEqual(
+            sorted(name for name in os.listdir(directory) if name.endswith('.json')),
+            sorted([metrics.DEAD_FILE, os.path.basename(metrics.process_file(directory, metrics.process_key()))]),
+        )
+
+
+class BenchApiCommandTests(TestCase):
+    def test_seeds_benchmarks_and_saves_results(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        output = os.path.join(directory, 'results.json')
+        call_command(
+            'bench_api', seed=True, projects=1, kols=3, tracking_rows=3, creators=2, days=40,
+            drivers='client', requests=3, endpoints='kol_list,creator_detail,trend_data',
+            output=output, stdout=StringIO(),
+        )
+        self.assertEqual(TrendData.objects.count(), 80)
+        self.assertEqual(CreatorAnalytics.objects.count(), 4)
+
+        with open(output) as fileobj:
+            results = json.load(fileobj)
+        self.assertEqual(results['dataset']['Creator'], 2)
+        runs = {run['endpoint']: run for run in results['runs']}
+        self.assertEqual(set(runs), {'kol_list', 'creator_detail', 'trend_data'})
+        self.assertEqual(runs['creator_detail']['queries'], 7)
+        self.assertEqual(runs['trend_data']['errors'], 0)
+        for key in ('throughput_rps', 'p50_ms', 'p95_ms', 'p99_ms'):
+            self.assertIn(key, runs['kol_list'])
+
+
+class SyntheticDataTests(TestCase):
+    options = {
+        'creators': 3, 'days': 45, 'projects': 1, 'kols_per_project': 4, 'tracking_per_project': 5,
+        'seed': 3, 'end_date': date(2025, 7, 30),
+    }
+
+    def trend_rows(self):
+        return list(
+            TrendData.objects.order_by('creator__username', 'date')
+            .values_list('creator__username', 'date', 'gmv', 'products_sold', 'engagement_rate')
+        )
+
+    def test_same_seed_gives_same_rows_whatever_the_method_and_batch_size(self):
+        counts = synthetic.generate(method='bulk', batch_size=7, **self.options)
+        self.assertEqual(counts['TrendData'], 135)
+        self.assertEqual(counts['CreatorAnalytics'], 6)
+        self.assertEqual(counts['KOL'], 4)
+        self.assertEqual(counts['DataTracking'], 5)
+        rows = self.trend_rows()
+        self.assertEqual(rows[-1][1], date(2025, 7, 30))
+
+        synthetic.delete_generated()
+        self.assertFalse(synthetic.generated_exists())
+        self.assertFalse(TrendData.objects.exists())
+
+        synthetic.generate(method='auto', batch_size=1000, **self.options)
+        self.assertEqual(self.trend_rows(), rows)
+        creator = Creator.objects.get(username='synthetic_creator_0')
+        self.assertEqual(creator.search_name, Creator.build_search_name(creator.display_name, creator.username))
+
+    def test_command_needs_flush_to_regenerate(self):
+        arguments = ['--creators', '2', '--days', '10', '--projects', '1', '--kols-per-project', '1',
+                     '--tracking-per-project', '1']
+        call_command('generate_brand_data', *arguments, stdout=StringIO())
+        with self.assertRaises(CommandError):
+            call_command('generate_brand_data', *arguments, stdout=StringIO())
+        call_command('generate_brand_data', '--flush', *arguments, stdout=StringIO())
+        self.assertEqual(Creator.objects.count(), 2)
+        self.assertEqual(TrendData.objects.count(), 20)
+        self.assertTrue(BrandDashboardStats.objects.exists())
+
+    def test_seed_brand_data_is_idempotent(self):
+        call_command('seed_brand_data', stdout=StringIO())
+        call_command('seed_brand_data', stdout=StringIO())
+        self.assertEqual(Creator.objects.count(), 3)
+        self.assertEqual(TrendData.objects.count(), 90)
+        self.assertEqual(CreatorAnalytics.objects.count(), 3)
+        self.assertEqual(BrandDashboardStats.objects.count(), 30)
+        self.assertEqual(TrendData.objects.latest('date').date, date.today())
+
+    def test_seed_brand_data_fills_in_existing_creators(self):
+        call_command('seed_brand_data', '--end-date', '2025-07-30', stdout=StringIO())
+        creator = Creator.objects.get(username='minh_beauty_official')
+        TrendData.objects.filter(creator=creator, date__gte=date(2025, 7, 20)).delete()
+        CreatorAnalytics.objects.filter(creator=creator).delete()
+        call_command('seed_brand_data', '--end-date', '2025-07-30', stdout=StringIO())
+        self.assertEqual(Creator.objects.count(), 3)
+        self.assertEqual(TrendData.objects.filter(creator=creator).count(), 30)
+        self.assertEqual(CreatorAnalytics.objects.filter(creator=creator).count(), 1)
+        self.assertEqual(TrendData.objects.latest('date').date, date(2025, 7, 30))
+
+
+class UserProfileLifecycleTests(TestCase):
+    password = 'S3cure-pass!'
+
+    def register(self, username, role):
+        return self.client.post(reverse('register'), {
+            'username': username, 'password': self.password, 'confirm_password': self.password, 'role': role,
+        })
+
+    def test_register_inserts_the_profile_once_with_its_role(self):
+        # Username check, user INSERT, profile INSERT
+        with self.assertNumQueries(3) as queries:
+            response = self.register('brand_user', 'brand')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['user']['role'], 'brand')
+        self.assertFalse([query for query in queries.captured_queries if query['sql'].startswith('UPDATE')])
+        self.assertEqual(UserProfile.objects.get(user__username='brand_user').role, 'brand')
+
+        response = self.register('brand_user', 'brand')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('username', response.json()['errors'])
+
+    def test_login_does_not_write_the_profile(self):
+        self.register('creator_user', 'creator')
+        # User lookup, profile lookup
+        with self.assertNumQueries(2):
+            response = self.client.post(reverse('login'), {
+                'username': 'creator_user', 'password': self.password, 'role': 'creator',
+            })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['user']['role'], 'creator')
+
+        user = User.objects.get(username='creator_user')
+        profile_updated_at = user.profile.updated_at
+        with self.assertNumQueries(1):
+            update_last_login(None, user)
+        self.assertEqual(UserProfile.objects.get(user=user).updated_at, profile_updated_at)
+
+    def test_users_created_elsewhere_get_the_default_role(self):
+        user = User.objects.create_user(username='plain_user', password=self.password)
+        self.assertEqual(user.profile.role, UserProfile.DEFAULT_ROLE)
@@ -0,0 +1,8 @@
+"""Text normalization shared by creator search and number parsing."""
+import unicodedata
+
+
+def fold(text):
+    """Lower-case and strip Vietnamese diacritics ("triệu" -> "trieu", "đ" -> "d")"""
+    text = unicodedata.normalize('NFKD', text.lower().replace('đ', 'd'))
+    return ''.join(char for char in text if not unicodedata.combining(char))
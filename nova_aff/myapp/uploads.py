@@ -0,0 +1,195 @@
+"""Video file handling for the KOL / DataTracking / TrackingNumber views.
+
+Multipart create/update requests go through upload_data(). Resumable
+chunked uploads append straight to a single ``.part`` file under MEDIA_ROOT,
+so finalizing is a hard link into the FileField's upload_to directory
+instead of re-reading and concatenating the pieces.
+"""
+import logging
+import os
+import random
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import InMemoryUploadedFile
+from django.db import transaction
+
+from .models import ChunkedUpload, KOL, DataTracking, TrackingNumber
+
+UPLOAD_TARGETS = {
+    'kol': KOL,
+    'data_tracking': DataTracking,
+    'tracking_number': TrackingNumber,
+}
+
+CHUNK_READ_SIZE = 64 * 1024
+
+logger = logging.getLogger(__name__)
+
+
+class UploadError(Exception):
+    """The chunk or finalize request does not match the upload state"""
+
+
+class OffsetMismatch(UploadError):
+    def __init__(self, expected):
+        self.expected = expected
+        super().__init__(f'Expected offset {expected}')
+
+
+def upload_data(request):
+    """Serializer input for a create/update request, without copying it.
+
+    For multipart bodies DRF already merges request.FILES into request.data,
+    so the uploaded file handle reaches the FileField (and its storage)
+    untouched. QueryDict.copy() deep-copies every value, duplicating
+    in-memory uploads and failing outright on temporary-file uploads.
+    """
+    log_upload(request)
+    return request.data
+
+
+def log_upload(request, field_name='video_file'):
+    """Log a sample of incoming video uploads as key=value pairs"""
+    upload = request.FILES.get(field_name)
+    if upload is None or random.random() >= settings.UPLOAD_LOG_SAMPLE_RATE:
+        return
+    logger.info(
+        'video_upload method=%s path=%s name=%r size=%d content_type=%s in_memory=%s',
+        request.method, request.path, upload.name, upload.size, upload.content_type,
+        isinstance(upload, InMemoryUploadedFile),
+    )
+
+
+def upload_dir():
+    return os.path.join(settings.MEDIA_ROOT, 'chunked_uploads')
+
+
+def part_path(upload):
+    return os.path.join(upload_dir(), f'{upload.upload_id}.part')
+
+
+def get_target(upload):
+    model = UPLOAD_TARGETS[upload.target]
+    return model.objects.get(id=upload.object_id, project_id=upload.project_id)
+
+
+def check_chunk(upload, offset, length):
+    if upload.status != 'uploading':
+        raise UploadError('Upload is already complete')
+    if offset != upload.offset:
+        raise OffsetMismatch(upload.offset)
+    if upload.offset + length > upload.total_size:
+        raise UploadError('Chunk exceeds the declared total size')
+
+
+def append_chunk(upload_id, offset, stream, length):
+    """Append `length` bytes from `stream` at `offset` and return the upload.
+
+    The body is read into an anonymous staging file before the row is locked,
+    so a slow client never holds the lock. Under the lock, which serialises
+    concurrent writers, the offset is checked again and the staged bytes are
+    copied onto the ``.part`` file (a local disk copy). A retried chunk whose
+    offset does not match the stored one is rejected so the client can resume.
+    """
+    check_chunk(ChunkedUpload.objects.get(upload_id=upload_id), offset, length)
+    os.makedirs(upload_dir(), exist_ok=True)
+    with tempfile.TemporaryFile(dir=upload_dir()) as staged:
+        written = 0
+        while written < length:
+            block = stream.read(min(CHUNK_READ_SIZE, length - written))
+            if not block:
+                break
+            staged.write(block)
+            written += len(block)
+        if written != length:
+            raise UploadError('Chunk body is shorter than Content-Length')
+        staged.seek(0)
+
+        with transaction.atomic():
+            upload = ChunkedUpload.objects.select_for_update().get(upload_id=upload_id)
+            check_chunk(upload, offset, length)
+            fd = os.open(part_path(upload), os.O_RDWR | os.O_CREAT, 0o644)
+            with os.fdopen(fd, 'r+b') as part:
+                # Drop bytes left behind by a copy that failed half-way
+                part.truncate(upload.offset)
+                part.seek(upload.offset)
+                shutil.copyfileobj(staged, part, CHUNK_READ_SIZE)
+            upload.offset += written
+            upload.save(update_fields=['offset', 'updated_at'])
+    return upload
+
+
+def check_complete(upload):
+    if upload.status != 'uploading':
+        raise UploadError('Upload is already complete')
+    if upload.offset != upload.total_size:
+        raise UploadError(f'Upload is incomplete ({upload.offset}/{upload.total_size} bytes)')
+
+
+def store_file(upload, record):
+    """Store the assembled ``.part`` file under the record's upload_to, returning the stored name.
+
+    On the filesystem this is a hard link, so nothing is copied and the
+    ``.part`` file stays until the database says the upload is complete.
+    """
+    field_file = record.video_file
+    storage = field_file.storage
+    max_length = field_file.field.max_length
+    name = field_file.field.generate_filename(record, upload.filename)
+    path = part_path(upload)
+
+    if isinstance(storage, FileSystemStorage):
+        while True:
+            name = storage.get_available_name(name, max_length=max_length)
+            destination = storage.path(name)
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            try:
+                os.link(path, destination)
+                return name
+            except FileExistsError:
+                # Taken since get_available_name looked
+                continue
+            except OSError:
+                # No hard links here (e.g. another filesystem); fall back to a copy
+                break
+    with open(path, 'rb') as part:
+        return storage.save(name, File(part), max_length=max_length)
+
+
+def remove_part(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def finalize_upload(upload_id):
+    """Attach the assembled file to the target record.
+
+    The file is stored before the row is locked and the ``.part`` file only
+    removed once the transaction commits, so no file operation runs under the
+    lock and a rolled back finalize leaves the upload intact to retry.
+    """
+    upload = ChunkedUpload.objects.get(upload_id=upload_id)
+    check_complete(upload)
+    record = get_target(upload)
+    name = store_file(upload, record)
+    try:
+        with transaction.atomic():
+            upload = ChunkedUpload.objects.select_for_update().get(upload_id=upload_id)
+            # Another finalize may have completed it meanwhile
+            check_complete(upload)
+            record.video_file.name = name
+            record.save(update_fields=['video_file', 'updated_at'])
+            upload.status = 'complete'
+            upload.save(update_fields=['status', 'updated_at'])
+            path = part_path(upload)
+            transaction.on_commit(lambda: remove_part(path))
+    except Exception:
+        record.video_file.storage.delete(name)
+        raise
+    return upload, record
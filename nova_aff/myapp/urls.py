@@ -1,4 +1,14 @@
 from django.urls import path
+from .async_views import (
+    AsyncBrandDashboardStatsView,
+    AsyncCreatorListView,
+    AsyncCreatorDetailView,
+    AsyncCreatorAnalyticsView,
+    AsyncVideoAnalyticsView,
+    AsyncLiveAnalyticsView,
+    AsyncFollowerDemographicsView,
+    AsyncTrendDataView,
+)
 from .views import (
     HelloWorldView, 
     RegisterView, 
@@ -9,12 +19,25 @@ from .views import (
     KOLListView,
     KOLDetailView,
     DataTrackingListView,
+    DataTrackingImportView,
+    DataTrackingUpsertView,
     DataTrackingDetailView,
     TrackingNumberListView,
     TrackingNumberDetailView,
+    KOLExportView,
+    DataTrackingExportView,
+    TrackingNumberExportView,
+    ChunkedUploadInitView,
+    ChunkedUploadView,
+    ChunkedUploadFinalizeView,
     # Brand Analytics Views
     BrandDashboardStatsView,
     CreatorListView,
+    CreatorSearchView,
+    AnalyticsCacheStatsView,
+    ProfilerStatsView,
+    MetricsView,
+    CreatorSnapshotListView,
     CreatorDetailView,
     CreatorAnalyticsView,
     VideoAnalyticsView,
@@ -36,21 +59,45 @@ urlpatterns = [
     path('admin/projects/<int:project_id>/', ProjectDetailView.as_view(), name='project_detail'),
     
     path('admin/projects/<int:project_id>/kols/', KOLListView.as_view(), name='kol_list'),
+    path('admin/projects/<int:project_id>/kols/export/', KOLExportView.as_view(), name='kol_export'),
     path('admin/projects/<int:project_id>/kols/<int:kol_id>/', KOLDetailView.as_view(), name='kol_detail'),
     
     path('admin/projects/<int:project_id>/data-tracking/', DataTrackingListView.as_view(), name='data_tracking_list'),
+    path('admin/projects/<int:project_id>/data-tracking/import/', DataTrackingImportView.as_view(), name='data_tracking_import'),
+    path('admin/projects/<int:project_id>/data-tracking/upsert/', DataTrackingUpsertView.as_view(), name='data_tracking_upsert'),
+    path('admin/projects/<int:project_id>/data-tracking/export/', DataTrackingExportView.as_view(), name='data_tracking_export'),
     path('admin/projects/<int:project_id>/data-tracking/<int:tracking_id>/', DataTrackingDetailView.as_view(), name='data_tracking_detail'),
     
     path('admin/projects/<int:project_id>/tracking-numbers/', TrackingNumberListView.as_view(), name='tracking_number_list'),
+    path('admin/projects/<int:project_id>/tracking-numbers/export/', TrackingNumberExportView.as_view(), name='tracking_number_export'),
     path('admin/projects/<int:project_id>/tracking-numbers/<int:tracking_id>/', TrackingNumberDetailView.as_view(), name='tracking_number_detail'),
     
+    path('admin/projects/<int:project_id>/uploads/', ChunkedUploadInitView.as_view(), name='chunked_upload_init'),
+    path('admin/projects/<int:project_id>/uploads/<uuid:upload_id>/', ChunkedUploadView.as_view(), name='chunked_upload'),
+    path('admin/projects/<int:project_id>/uploads/<uuid:upload_id>/finalize/', ChunkedUploadFinalizeView.as_view(), name='chunked_upload_finalize'),
+    
     # Brand Analytics API URLs
     path('brand/dashboard/stats/', BrandDashboardStatsView.as_view(), name='brand_dashboard_stats'),
+    path('brand/cache/stats/', AnalyticsCacheStatsView.as_view(), name='analytics_cache_stats'),
+    path('debug/profiler/stats/', ProfilerStatsView.as_view(), name='profiler_stats'),
+    path('metrics/', MetricsView.as_view(), name='metrics'),
     path('brand/creators/', CreatorListView.as_view(), name='creator_list'),
+    path('brand/creators/search/', CreatorSearchView.as_view(), name='creator_search'),
+    path('brand/creators/snapshots/', CreatorSnapshotListView.as_view(), name='creator_snapshot_list'),
     path('brand/creators/<int:creator_id>/', CreatorDetailView.as_view(), name='creator_detail'),
     path('brand/creators/<int:creator_id>/analytics/', CreatorAnalyticsView.as_view(), name='creator_analytics'),
     path('brand/creators/<int:creator_id>/video-analytics/', VideoAnalyticsView.as_view(), name='video_analytics'),
     path('brand/creators/<int:creator_id>/live-analytics/', LiveAnalyticsView.as_view(), name='live_analytics'),
     path('brand/creators/<int:creator_id>/demographics/', FollowerDemographicsView.as_view(), name='follower_demographics'),
     path('brand/creators/<int:creator_id>/trends/', TrendDataView.as_view(), name='trend_data'),
+    
+    # Async (ASGI) versions of the brand analytics read endpoints
+    path('async/brand/dashboard/stats/', AsyncBrandDashboardStatsView.as_view(), name='async_brand_dashboard_stats'),
+    path('async/brand/creators/', AsyncCreatorListView.as_view(), name='async_creator_list'),
+    path('async/brand/creators/<int:creator_id>/', AsyncCreatorDetailView.as_view(), name='async_creator_detail'),
+    path('async/brand/creators/<int:creator_id>/analytics/', AsyncCreatorAnalyticsView.as_view(), name='async_creator_analytics'),
+    path('async/brand/creators/<int:creator_id>/video-analytics/', AsyncVideoAnalyticsView.as_view(), name='async_video_analytics'),
+    path('async/brand/creators/<int:creator_id>/live-analytics/', AsyncLiveAnalyticsView.as_view(), name='async_live_analytics'),
+    path('async/brand/creators/<int:creator_id>/demographics/', AsyncFollowerDemographicsView.as_view(), name='async_follower_demographics'),
+    path('async/brand/creators/<int:creator_id>/trends/', AsyncTrendDataView.as_view(), name='async_trend_data'),
 ]
@@ -20,15 +20,34 @@ from .serializers import (
     LiveAnalyticsSerializer,
     FollowerDemographicsSerializer,
     TrendDataSerializer,
-    CreatorDetailSerializer
+    CreatorSnapshotSerializer,
+    CreatorDetailSerializer,
+    ChunkedUploadSerializer
 )
 from .models import (
-    Project, KOL, DataTracking, TrackingNumber,
+    Project, KOL, DataTracking, TrackingNumber, ChunkedUpload,
     Creator, BrandDashboardStats, CreatorAnalytics, VideoAnalytics,
     LiveAnalytics, FollowerDemographics, TrendData
 )
+from .pagination import KeysetPagination
+from .text import fold
+from . import caching, metrics, profiles, profiling
+from .conditional import creator_etag, make_etag, queryset_etag
+from .exporters import csv_response, export_fields
+from .uploads import (
+    OffsetMismatch, UploadError, UPLOAD_TARGETS, append_chunk, finalize_upload, upload_data
+)
+from .importers import DataTrackingImporter, ImportFormatError, read_rows
 from datetime import datetime, timedelta
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import IntegrityError, transaction
+from django.db.models import Avg, Case, F, IntegerField, Q, Sum, Value, When
+from django.db.models.functions import TruncMonth, TruncWeek
+from django.conf import settings
+from django.http import HttpResponse
 from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import etag
 # Create your views here.
 
 
@@ -123,15 +142,79 @@ class ProjectDetailView(APIView):
             return Response({'error': 'Project not found'}, status=status.HTTP_404_NOT_FOUND)
 
 
+KOL_ORDERINGS = ['created_at', 'submitted_on', 'kol_koc_approval_time', 'followers', 'gmv']
+
+
+def parse_date_param(value):
+    """Parse a YYYY-MM-DD or DD/MM/YYYY query param, None if invalid"""
+    for date_format in ('%Y-%m-%d', '%d/%m/%Y'):
+        try:
+            return datetime.strptime(value, date_format).date()
+        except ValueError:
+            pass
+    return None
+
+
+def filter_followers(queryset, params, field):
+    """Apply ?min_followers= / ?max_followers= to `field`, ignoring non-integer values"""
+    for param, lookup in (('min_followers', 'gte'), ('max_followers', 'lte')):
+        value = params.get(param)
+        if value:
+            try:
+                queryset = queryset.filter(**{f'{field}__{lookup}': int(value)})
+            except ValueError:
+                pass
+    return queryset
+
+
+def filter_kols(queryset, params):
+    """Apply the KOL list filters and search from query params"""
+    brand_approval = params.get('brand_approval')
+    if brand_approval:
+        queryset = queryset.filter(brand_approval=brand_approval)
+    
+    date_ranges = {
+        'submitted': 'submitted_on',
+        'approved': 'kol_koc_approval_time',
+    }
+    for prefix, field in date_ranges.items():
+        date_from = parse_date_param(params.get(f'{prefix}_from', ''))
+        if date_from:
+            queryset = queryset.filter(**{f'{field}__gte': date_from})
+        date_to = parse_date_param(params.get(f'{prefix}_to', ''))
+        if date_to:
+            queryset = queryset.filter(**{f'{field}__lte': date_to})
+    
+    queryset = filter_followers(queryset, params, 'followers')
+    
+    search = params.get('search', '').strip()
+    if search:
+        queryset = queryset.filter(
+            Q(full_name__icontains=search)
+            | Q(tiktok_id__icontains=search)
+            | Q(email__icontains=search)
+        )
+    
+    return queryset
+
+
 class KOLListView(APIView):
     permission_classes = [AllowAny]
     
     def get(self, request, project_id):
         try:
             project = Project.objects.get(id=project_id)
-            kols = KOL.objects.filter(project=project)
-            serializer = KOLSerializer(kols, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            ordering = request.GET.get('ordering', '-created_at')
+            if ordering.lstrip('-') not in KOL_ORDERINGS:
+                return Response(
+                    {'error': f"Invalid ordering, use one of: {', '.join(KOL_ORDERINGS)} (prefix with - for descending)"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            kols = filter_kols(KOL.objects.filter(project=project), request.GET)
+            paginator = KeysetPagination(ordering=ordering)
+            page = paginator.paginate_queryset(kols, request)
+            serializer = KOLSerializer(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
         except Project.DoesNotExist:
             return Response({'error': 'Project not found'}, status=status.HTTP_404_NOT_FOUND)
     
@@ -139,12 +222,7 @@ class KOLListView(APIView):
         try:
             project = Project.objects.get(id=project_id)
             
-            # Handle multipart form data for video upload
-            data = request.data.copy()
-            
-            # Get video file from request.FILES
-            if 'video_file' in request.FILES:
-                data['video_file'] = request.FILES['video_file']
+            data = upload_data(request)
             
             serializer = KOLSerializer(data=data)
             if serializer.is_valid():
@@ -170,12 +248,7 @@ class KOLDetailView(APIView):
         try:
             kol = KOL.objects.get(id=kol_id, project_id=project_id)
             
-            # Handle multipart form data for video upload
-            data = request.data.copy()
-            
-            # Get video file from request.FILES
-            if 'video_file' in request.FILES:
-                data['video_file'] = request.FILES['video_file']
+            data = upload_data(request)
             
             serializer = KOLSerializer(kol, data=data, partial=True)
             if serializer.is_valid():
@@ -194,6 +267,9 @@ class KOLDetailView(APIView):
             return Response({'error': 'KOL not found'}, status=status.HTTP_404_NOT_FOUND)
 
 
+DUPLICATE_VIDEO_MESSAGE = 'This video is already tracked in this project.'
+
+
 class DataTrackingListView(APIView):
     permission_classes = [AllowAny]
     
@@ -201,8 +277,10 @@ class DataTrackingListView(APIView):
         try:
             project = Project.objects.get(id=project_id)
             data_tracking = DataTracking.objects.filter(project=project)
-            serializer = DataTrackingSerializer(data_tracking, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            paginator = KeysetPagination()
+            page = paginator.paginate_queryset(data_tracking, request)
+            serializer = DataTrackingSerializer(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
         except Project.DoesNotExist:
             return Response({'error': 'Project not found'}, status=status.HTTP_404_NOT_FOUND)
     
@@ -210,22 +288,68 @@ class DataTrackingListView(APIView):
         try:
             project = Project.objects.get(id=project_id)
             
-            # Handle multipart form data for video upload
-            data = request.data.copy()
-            
-            # Get video file from request.FILES
-            if 'video_file' in request.FILES:
-                data['video_file'] = request.FILES['video_file']
+            data = upload_data(request)
             
             serializer = DataTrackingSerializer(data=data)
             if serializer.is_valid():
-                serializer.save(project=project)
+                try:
+                    with transaction.atomic():
+                        serializer.save(project=project)
+                except IntegrityError:
+                    return Response({'video_id': [DUPLICATE_VIDEO_MESSAGE]}, status=status.HTTP_400_BAD_REQUEST)
                 return Response(serializer.data, status=status.HTTP_201_CREATED)
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         except Project.DoesNotExist:
             return Response({'error': 'Project not found'}, status=status.HTTP_404_NOT_FOUND)
 
 
+class DataTrackingImportView(APIView):
+    """Bulk import DataTracking rows from a CSV or XLSX file"""
+    permission_classes = [AllowAny]
+    
+    def post(self, request, project_id):
+        try:
+            project = Project.objects.get(id=project_id)
+        except Project.DoesNotExist:
+            return Response({'error': 'Project not found'}, status=status.HTTP_404_NOT_FOUND)
+        
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'error': 'No file uploaded'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            header, rows = read_rows(upload, upload.name)
+            result = DataTrackingImporter(project).run(rows, columns=header)
+        except ImportFormatError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        response_status = status.HTTP_201_CREATED if result['created'] or result['updated'] else status.HTTP_400_BAD_REQUEST
+        return Response(result, status=response_status)
+
+
+class DataTrackingUpsertView(APIView):
+    """Create or update DataTracking rows in bulk, matched on video_id"""
+    permission_classes = [AllowAny]
+    
+    def post(self, request, project_id):
+        try:
+            project = Project.objects.get(id=project_id)
+        except Project.DoesNotExist:
+            return Response({'error': 'Project not found'}, status=status.HTTP_404_NOT_FOUND)
+        
+        rows = request.data
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            return Response({'error': 'Expected a JSON list of rows'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            result = DataTrackingImporter(project).run(rows, start=0)
+        except ImportFormatError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        response_status = status.HTTP_200_OK if result['created'] or result['updated'] else status.HTTP_400_BAD_REQUEST
+        return Response(result, status=response_status)
+
+
 class DataTrackingDetailView(APIView):
     permission_classes = [AllowAny]
     
@@ -241,16 +365,15 @@ class DataTrackingDetailView(APIView):
         try:
             tracking = DataTracking.objects.get(id=tracking_id, project_id=project_id)
             
-            # Handle multipart form data for video upload
-            data = request.data.copy()
-            
-            # Get video file from request.FILES
-            if 'video_file' in request.FILES:
-                data['video_file'] = request.FILES['video_file']
+            data = upload_data(request)
             
             serializer = DataTrackingSerializer(tracking, data=data, partial=True)
             if serializer.is_valid():
-                serializer.save()
+                try:
+                    with transaction.atomic():
+                        serializer.save()
+                except IntegrityError:
+                    return Response({'video_id': [DUPLICATE_VIDEO_MESSAGE]}, status=status.HTTP_400_BAD_REQUEST)
                 return Response(serializer.data, status=status.HTTP_200_OK)
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         except DataTracking.DoesNotExist:
@@ -272,8 +395,10 @@ class TrackingNumberListView(APIView):
         try:
             project = Project.objects.get(id=project_id)
             tracking_numbers = TrackingNumber.objects.filter(project=project)
-            serializer = TrackingNumberSerializer(tracking_numbers, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            paginator = KeysetPagination()
+            page = paginator.paginate_queryset(tracking_numbers, request)
+            serializer = TrackingNumberSerializer(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
         except Project.DoesNotExist:
             return Response({'error': 'Project not found'}, status=status.HTTP_404_NOT_FOUND)
     
@@ -281,20 +406,7 @@ class TrackingNumberListView(APIView):
         try:
             project = Project.objects.get(id=project_id)
             
-            # Handle multipart form data for video upload
-            data = request.data.copy()
-            
-            print("Request data:", request.data)
-            print("Request FILES:", request.FILES)
-            
-            # Get video file from request.FILES
-            if 'video_file' in request.FILES:
-                data['video_file'] = request.FILES['video_file']
-                print("Video file found:", request.FILES['video_file'])
-            else:
-                print("No video file in request.FILES")
-            
-            print("Final data to save:", data)
+            data = upload_data(request)
             
             serializer = TrackingNumberSerializer(data=data)
             if serializer.is_valid():
@@ -320,12 +432,7 @@ class TrackingNumberDetailView(APIView):
         try:
             tracking = TrackingNumber.objects.get(id=tracking_id, project_id=project_id)
             
-            # Handle multipart form data for video upload
-            data = request.data.copy()
-            
-            # Get video file from request.FILES
-            if 'video_file' in request.FILES:
-                data['video_file'] = request.FILES['video_file']
+            data = upload_data(request)
             
             serializer = TrackingNumberSerializer(tracking, data=data, partial=True)
             if serializer.is_valid():
@@ -344,11 +451,132 @@ class TrackingNumberDetailView(APIView):
             return Response({'error': 'Tracking number not found'}, status=status.HTTP_404_NOT_FOUND)
 
 
+class ProjectCSVExportView(APIView):
+    """Stream every row of a project-scoped model as CSV"""
+    permission_classes = [AllowAny]
+    model = None
+    filename = None
+    
+    def get(self, request, project_id):
+        try:
+            project = Project.objects.get(id=project_id)
+        except Project.DoesNotExist:
+            return Response({'error': 'Project not found'}, status=status.HTTP_404_NOT_FOUND)
+        
+        rows = self.model.objects.filter(project=project).order_by('-created_at', '-id')
+        return csv_response(rows, export_fields(self.model), f'{project.project_id}_{self.filename}.csv')
+
+
+class KOLExportView(ProjectCSVExportView):
+    model = KOL
+    filename = 'kols'
+
+
+class DataTrackingExportView(ProjectCSVExportView):
+    model = DataTracking
+    filename = 'data_tracking'
+
+
+class TrackingNumberExportView(ProjectCSVExportView):
+    model = TrackingNumber
+    filename = 'tracking_numbers'
+
+
+UPLOAD_TARGET_SERIALIZERS = {
+    'kol': KOLSerializer,
+    'data_tracking': DataTrackingSerializer,
+    'tracking_number': TrackingNumberSerializer,
+}
+
+
+class ChunkedUploadInitView(APIView):
+    """Start a resumable video upload for a KOL, DataTracking or TrackingNumber record"""
+    permission_classes = [AllowAny]
+    
+    def post(self, request, project_id):
+        try:
+            project = Project.objects.get(id=project_id)
+        except Project.DoesNotExist:
+            return Response({'error': 'Project not found'}, status=status.HTTP_404_NOT_FOUND)
+        
+        serializer = ChunkedUploadSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        target = serializer.validated_data['target']
+        model = UPLOAD_TARGETS[target]
+        if not model.objects.filter(id=serializer.validated_data['object_id'], project=project).exists():
+            return Response({'error': 'Target record not found'}, status=status.HTTP_404_NOT_FOUND)
+        
+        serializer.save(project=project)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+class ChunkedUploadView(APIView):
+    """Query upload progress (GET) or append a chunk at ?offset= (PUT, raw body)"""
+    permission_classes = [AllowAny]
+    
+    def get(self, request, project_id, upload_id):
+        try:
+            upload = ChunkedUpload.objects.get(upload_id=upload_id, project_id=project_id)
+            return Response(ChunkedUploadSerializer(upload).data, status=status.HTTP_200_OK)
+        except ChunkedUpload.DoesNotExist:
+            return Response({'error': 'Upload not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    def put(self, request, project_id, upload_id):
+        if not ChunkedUpload.objects.filter(upload_id=upload_id, project_id=project_id).exists():
+            return Response({'error': 'Upload not found'}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            offset = int(request.query_params.get('offset', ''))
+            length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            return Response({'error': 'offset query param and Content-Length are required'},
+                            status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            # Read the raw body stream so the chunk never goes through the parsers
+            upload = append_chunk(upload_id, offset, request._request, length)
+        except OffsetMismatch as e:
+            return Response({'error': str(e), 'offset': e.expected}, status=status.HTTP_409_CONFLICT)
+        except UploadError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(ChunkedUploadSerializer(upload).data, status=status.HTTP_200_OK)
+
+
+class ChunkedUploadFinalizeView(APIView):
+    """Attach a fully uploaded file to its target record"""
+    permission_classes = [AllowAny]
+    
+    def post(self, request, project_id, upload_id):
+        if not ChunkedUpload.objects.filter(upload_id=upload_id, project_id=project_id).exists():
+            return Response({'error': 'Upload not found'}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            upload, record = finalize_upload(upload_id)
+        except UploadError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except ObjectDoesNotExist:
+            return Response({'error': 'Target record not found'}, status=status.HTTP_404_NOT_FOUND)
+        
+        serializer = UPLOAD_TARGET_SERIALIZERS[upload.target](record)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
 # Brand Analytics API Views
+def dashboard_stats_etag(request):
+    today = timezone.now().date()
+    updated_at = BrandDashboardStats.objects.filter(date=today).values_list('updated_at', flat=True).first()
+    return make_etag(today, updated_at)
+
+
+def creator_list_etag(request):
+    return queryset_etag(filter_creators(Creator.objects.all(), request.GET))
+
+
 class BrandDashboardStatsView(APIView):
     """Get brand dashboard stats"""
     permission_classes = [AllowAny]
     
+    @method_decorator(etag(dashboard_stats_etag))
     def get(self, request):
         today = timezone.now().date()
         try:
@@ -367,23 +595,110 @@ class BrandDashboardStatsView(APIView):
 
 
 class CreatorListView(APIView):
-    """Get list of creators"""
+    """Get list of creators, filtered by ?gender=, ?category= and min_/max_followers"""
+    permission_classes = [AllowAny]
+    
+    @method_decorator(etag(creator_list_etag))
+    def get(self, request):
+        creators = filter_creators(Creator.objects.all(), request.GET)
+        serializer = CreatorSerializer(creators, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+CREATOR_SEARCH_LIMIT = 20
+CREATOR_SEARCH_MAX_LIMIT = 100
+
+
+def search_creators(queryset, query):
+    """Rank creators whose folded name/username contains every word of `query`.
+
+    Matching runs on the precomputed accent-folded search_name column, so
+    "nguyen quynh anh" finds "Nguyễn Quỳnh Anh"; each LIKE '%word%' is served
+    by the trigram index. Name prefixes rank first, then word prefixes, then
+    other substring matches, with bigger creators first within a rank.
+    """
+    words = fold(query).split()
+    if not words:
+        return queryset.none()
+    for word in words:
+        queryset = queryset.filter(search_name__contains=word)
+    phrase = ' '.join(words)
+    return queryset.annotate(
+        search_rank=Case(
+            When(search_name__startswith=phrase, then=Value(0)),
+            When(search_name__contains=f' {phrase}', then=Value(1)),
+            When(search_name__contains=phrase, then=Value(2)),
+            default=Value(3),
+            output_field=IntegerField(),
+        )
+    ).order_by('search_rank', '-followers_count', 'id')
+
+
+class CreatorSearchView(APIView):
+    """Ranked, accent-insensitive creator search: ?q=<text>&limit=<k>"""
     permission_classes = [AllowAny]
     
     def get(self, request):
-        creators = Creator.objects.all()
+        query = request.GET.get('q', '')
+        try:
+            limit = min(int(request.GET.get('limit', CREATOR_SEARCH_LIMIT)), CREATOR_SEARCH_MAX_LIMIT)
+        except ValueError:
+            limit = CREATOR_SEARCH_LIMIT
+        creators = search_creators(filter_creators(Creator.objects.all(), request.GET), query)[:max(limit, 1)]
         serializer = CreatorSerializer(creators, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
+def filter_creators(queryset, params):
+    """Apply the brand creator list filters from query params"""
+    gender = params.get('gender')
+    if gender:
+        queryset = queryset.filter(gender=gender)
+    
+    for category in params.getlist('category'):
+        queryset = queryset.filter(categories__contains=[category])
+    
+    queryset = filter_followers(queryset, params, 'followers_count')
+    
+    return queryset
+
+
+class CreatorSnapshotListView(APIView):
+    """Get a page of creators with their latest analytics attached"""
+    permission_classes = [AllowAny]
+    
+    def get(self, request):
+        creators = filter_creators(Creator.objects.all(), request.query_params)
+        creators = CreatorSnapshotSerializer.setup_eager_loading(creators)
+        paginator = KeysetPagination()
+        # Prefetches run against the sliced page only, so they stay bounded by page size
+        page = paginator.paginate_queryset(creators, request)
+        serializer = CreatorSnapshotSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+
 class CreatorDetailView(APIView):
     """Get detailed creator information with analytics"""
     permission_classes = [AllowAny]
     
+    @method_decorator(etag(creator_etag(
+        'analytics', 'video_analytics', 'live_analytics', 'follower_demographics', 'trend_data'
+    )))
     def get(self, request, creator_id):
+        if settings.CREATOR_PROFILE_DOCUMENTS:
+            try:
+                content = profiles.get_document(creator_id)
+            except Creator.DoesNotExist:
+                return Response({'error': 'Creator not found'}, status=status.HTTP_404_NOT_FOUND)
+            return HttpResponse(content, content_type='application/json')
+        
+        data, version = caching.get_response('detail', creator_id)
+        if data is not None:
+            return Response(data, status=status.HTTP_200_OK)
         try:
-            creator = Creator.objects.get(id=creator_id)
+            creator = CreatorDetailSerializer.setup_eager_loading(Creator.objects.all()).get(id=creator_id)
             serializer = CreatorDetailSerializer(creator)
+            caching.set_response('detail', creator_id, version, serializer.data)
             return Response(serializer.data, status=status.HTTP_200_OK)
         except Creator.DoesNotExist:
             return Response({'error': 'Creator not found'}, status=status.HTTP_404_NOT_FOUND)
@@ -393,11 +708,16 @@ class CreatorAnalyticsView(APIView):
     """Get creator analytics"""
     permission_classes = [AllowAny]
     
+    @method_decorator(etag(creator_etag('analytics')))
     def get(self, request, creator_id):
+        data, version = caching.get_response('analytics', creator_id)
+        if data is not None:
+            return Response(data, status=status.HTTP_200_OK)
         try:
             creator = Creator.objects.get(id=creator_id)
             analytics = creator.analytics.all()
             serializer = CreatorAnalyticsSerializer(analytics, many=True)
+            caching.set_response('analytics', creator_id, version, serializer.data)
             return Response(serializer.data, status=status.HTTP_200_OK)
         except Creator.DoesNotExist:
             return Response({'error': 'Creator not found'}, status=status.HTTP_404_NOT_FOUND)
@@ -407,11 +727,16 @@ class VideoAnalyticsView(APIView):
     """Get video analytics for creator"""
     permission_classes = [AllowAny]
     
+    @method_decorator(etag(creator_etag('video_analytics')))
     def get(self, request, creator_id):
+        data, version = caching.get_response('video_analytics', creator_id)
+        if data is not None:
+            return Response(data, status=status.HTTP_200_OK)
         try:
             creator = Creator.objects.get(id=creator_id)
             video_analytics = creator.video_analytics.all()
             serializer = VideoAnalyticsSerializer(video_analytics, many=True)
+            caching.set_response('video_analytics', creator_id, version, serializer.data)
             return Response(serializer.data, status=status.HTTP_200_OK)
         except Creator.DoesNotExist:
             return Response({'error': 'Creator not found'}, status=status.HTTP_404_NOT_FOUND)
@@ -421,11 +746,16 @@ class LiveAnalyticsView(APIView):
     """Get live analytics for creator"""
     permission_classes = [AllowAny]
     
+    @method_decorator(etag(creator_etag('live_analytics')))
     def get(self, request, creator_id):
+        data, version = caching.get_response('live_analytics', creator_id)
+        if data is not None:
+            return Response(data, status=status.HTTP_200_OK)
         try:
             creator = Creator.objects.get(id=creator_id)
             live_analytics = creator.live_analytics.all()
             serializer = LiveAnalyticsSerializer(live_analytics, many=True)
+            caching.set_response('live_analytics', creator_id, version, serializer.data)
             return Response(serializer.data, status=status.HTTP_200_OK)
         except Creator.DoesNotExist:
             return Response({'error': 'Creator not found'}, status=status.HTTP_404_NOT_FOUND)
@@ -435,48 +765,171 @@ class FollowerDemographicsView(APIView):
     """Get follower demographics for creator"""
     permission_classes = [AllowAny]
     
+    @method_decorator(etag(creator_etag('follower_demographics')))
     def get(self, request, creator_id):
+        data, version = caching.get_response('demographics', creator_id)
+        if data is not None:
+            return Response(data, status=status.HTTP_200_OK)
         try:
             creator = Creator.objects.get(id=creator_id)
             demographics = creator.follower_demographics.all()
             serializer = FollowerDemographicsSerializer(demographics, many=True)
+            caching.set_response('demographics', creator_id, version, serializer.data)
             return Response(serializer.data, status=status.HTTP_200_OK)
         except Creator.DoesNotExist:
             return Response({'error': 'Creator not found'}, status=status.HTTP_404_NOT_FOUND)
 
 
+class AnalyticsCacheStatsView(APIView):
+    """Hit/miss counters of the brand analytics response cache"""
+    permission_classes = [AllowAny]
+    
+    def get(self, request):
+        return Response(caching.cache_stats(), status=status.HTTP_200_OK)
+
+
+def is_local_client(request):
+    """True for METRICS_ALLOWED_IPS clients talking to the app directly"""
+    # Requests relayed by the reverse proxy come from 127.0.0.1 too
+    return (request.META.get('REMOTE_ADDR') in settings.METRICS_ALLOWED_IPS
+            and 'HTTP_X_FORWARDED_FOR' not in request.META)
+
+
+class ProfilerStatsView(APIView):
+    """Per-endpoint query/timing averages recorded by QueryProfilerMiddleware in this process, local clients only"""
+    permission_classes = [AllowAny]
+    
+    def get(self, request):
+        if not settings.QUERY_PROFILER:
+            return Response({'error': 'Query profiler is disabled'}, status=status.HTTP_404_NOT_FOUND)
+        if not is_local_client(request):
+            return Response({'error': 'Forbidden'}, status=status.HTTP_403_FORBIDDEN)
+        return Response(profiling.stats.summary(), status=status.HTTP_200_OK)
+
+
+class MetricsView(APIView):
+    """Prometheus scrape endpoint (text exposition format), local clients only"""
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        if not settings.METRICS_ENABLED:
+            return Response({'error': 'Metrics are disabled'}, status=status.HTTP_404_NOT_FOUND)
+        if not is_local_client(request):
+            return Response({'error': 'Forbidden'}, status=status.HTTP_403_FORBIDDEN)
+        return HttpResponse(metrics.render(metrics.collect()),
+                            content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+TREND_BUCKETS = {
+    'day': None,
+    'week': TruncWeek,
+    'month': TruncMonth,
+}
+
+
+def bucket_trend_data(trend_data, granularity):
+    """(period, metric totals...) rows of trend data bucketed in SQL"""
+    trunc = TREND_BUCKETS[granularity]
+    period = trunc('date') if trunc else F('date')
+    return (
+        trend_data.order_by()
+        .annotate(period=period)
+        .values('period')
+        .annotate(
+            gmv_total=Sum('gmv'),
+            products_sold_total=Sum('products_sold'),
+            followers_gained_total=Sum('followers_gained'),
+            video_views_total=Sum('video_views'),
+            engagement_rate_avg=Avg('engagement_rate'),
+        )
+        .order_by('period')
+        .values_list('period', 'gmv_total', 'products_sold_total', 'followers_gained_total',
+                     'video_views_total', 'engagement_rate_avg')
+    )
+
+
+def trend_columns(rows, granularity):
+    """Bucketed trend rows as columns (one list per metric)"""
+    columns = {
+        'period': [], 'gmv': [], 'products_sold': [], 'followers_gained': [],
+        'video_views': [], 'engagement_rate': [],
+    }
+    # Decimals go through the per-row serializer's fields so both payloads render them alike
+    fields = TrendDataSerializer().fields
+    for period_start, gmv, products_sold, followers_gained, video_views, engagement_rate in rows:
+        columns['period'].append(period_start.strftime('%d/%m/%Y'))
+        columns['gmv'].append(fields['gmv'].to_representation(gmv))
+        columns['products_sold'].append(products_sold)
+        columns['followers_gained'].append(followers_gained)
+        columns['video_views'].append(video_views)
+        columns['engagement_rate'].append(fields['engagement_rate'].to_representation(engagement_rate))
+    return {'granularity': granularity, 'columns': columns}
+
+
+def aggregate_trend_data(trend_data, granularity):
+    """Bucket trend rows in SQL and return them as columns (one list per metric)"""
+    return trend_columns(bucket_trend_data(trend_data, granularity), granularity)
+
+
+def filter_trend_data(trend_data, params):
+    """Apply ?start_date= / ?end_date= (YYYY-MM-DD), the last 30 days when neither is given"""
+    start_date = params.get('start_date')
+    end_date = params.get('end_date')
+    
+    if start_date:
+        try:
+            start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
+            trend_data = trend_data.filter(date__gte=start_date)
+        except ValueError:
+            pass
+    
+    if end_date:
+        try:
+            end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
+            trend_data = trend_data.filter(date__lte=end_date)
+        except ValueError:
+            pass
+    
+    # Default to last 30 days if no date range specified
+    if not start_date and not end_date:
+        thirty_days_ago = timezone.now().date() - timedelta(days=30)
+        trend_data = trend_data.filter(date__gte=thirty_days_ago)
+    
+    return trend_data
+
+
+def trend_granularity_error(granularity):
+    """The 400 payload for an unknown ?granularity=, None when it is valid"""
+    if granularity not in TREND_BUCKETS:
+        return {'error': f"granularity must be one of: {', '.join(TREND_BUCKETS)}"}
+    return None
+
+
+trend_rows_etag = creator_etag('trend_data')
+
+
+def trend_data_etag(request, creator_id):
+    # The default window is the last 30 days, so the day is part of the validator
+    validator = trend_rows_etag(request, creator_id)
+    return validator and make_etag(validator, timezone.now().date())
+
+
 class TrendDataView(APIView):
     """Get trend data for creator"""
     permission_classes = [AllowAny]
     
+    @method_decorator(etag(trend_data_etag))
     def get(self, request, creator_id):
         try:
             creator = Creator.objects.get(id=creator_id)
+            trend_data = filter_trend_data(creator.trend_data.all(), request.GET)
             
-            # Get date range from query params
-            start_date = request.GET.get('start_date')
-            end_date = request.GET.get('end_date')
-            
-            trend_data = creator.trend_data.all()
-            
-            if start_date:
-                try:
-                    start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
-                    trend_data = trend_data.filter(date__gte=start_date)
-                except ValueError:
-                    pass
-            
-            if end_date:
-                try:
-                    end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
-                    trend_data = trend_data.filter(date__lte=end_date)
-                except ValueError:
-                    pass
-            
-            # Default to last 30 days if no date range specified
-            if not start_date and not end_date:
-                thirty_days_ago = timezone.now().date() - timedelta(days=30)
-                trend_data = trend_data.filter(date__gte=thirty_days_ago)
+            granularity = request.GET.get('granularity')
+            if granularity:
+                error = trend_granularity_error(granularity)
+                if error:
+                    return Response(error, status=status.HTTP_400_BAD_REQUEST)
+                return Response(aggregate_trend_data(trend_data, granularity), status=status.HTTP_200_OK)
             
             serializer = TrendDataSerializer(trend_data, many=True)
             return Response(serializer.data, status=status.HTTP_200_OK)
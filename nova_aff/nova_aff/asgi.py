@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'nova_aff.settings')
+# Lets settings.py pick a connection mode that is safe under ASGI
+os.environ['NOVA_AFF_ASGI'] = '1'
 
 application = get_asgi_application()
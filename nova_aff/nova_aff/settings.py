@@ -12,6 +12,9 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 import os
+
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -42,6 +45,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'rest_framework_simplejwt',
     'corsheaders',
@@ -50,6 +54,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'myapp.middleware.MetricsMiddleware',
+    'myapp.middleware.QueryProfilerMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -58,6 +64,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'myapp.middleware.ReplicaRoutingMiddleware',
 ]
 
 ROOT_URLCONF = 'nova_aff.urls'
@@ -100,6 +107,51 @@ DATABASES = {
     }
 }
 
+# Connection reuse, chosen with DB_CONN_MODE:
+#   persistent (default) - keep each worker's connection open for DB_CONN_MAX_AGE
+#                          seconds, checking it is alive before reuse; WSGI only
+#   pool                 - psycopg 3 connection pool shared by a process's threads
+#                          (requires `psycopg[pool]` instead of psycopg2)
+#   none                 - connect and disconnect on every request
+# Under ASGI (asgi.py sets NOVA_AFF_ASGI) the default is none and persistent is
+# refused: sync code runs on changing threads there, so per-thread persistent
+# connections are not reused but left open, which Django advises against.
+RUNNING_ASGI = os.getenv('NOVA_AFF_ASGI') == '1'
+DB_CONN_MODE = os.getenv('DB_CONN_MODE', 'none' if RUNNING_ASGI else 'persistent').lower()
+if DB_CONN_MODE == 'persistent' and RUNNING_ASGI:
+    raise ImproperlyConfigured('DB_CONN_MODE=persistent is not supported under ASGI, use pool or none')
+if DB_CONN_MODE == 'persistent':
+    DATABASES['default']['CONN_MAX_AGE'] = int(os.getenv('DB_CONN_MAX_AGE', '60'))
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = os.getenv('DB_CONN_HEALTH_CHECKS', 'True').lower() == 'true'
+elif DB_CONN_MODE == 'pool':
+    # Pooled connections are returned after each request, so CONN_MAX_AGE must stay 0
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '2')),
+            'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+            'timeout': float(os.getenv('DB_POOL_TIMEOUT', '10')),
+        },
+    }
+elif DB_CONN_MODE != 'none':
+    raise ImproperlyConfigured(f"DB_CONN_MODE must be persistent, pool or none, not {DB_CONN_MODE!r}")
+
+# Read replicas for brand analytics reads: comma separated host[:port] list,
+# same database name and credentials as the primary (see myapp/routers.py)
+DATABASE_REPLICAS = []
+for index, replica in enumerate(filter(None, os.getenv('POSTGRES_REPLICA_HOSTS', '').split(',')), start=1):
+    host, _, port = replica.strip().partition(':')
+    alias = f'replica{index}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        'HOST': host,
+        'PORT': port or DATABASES['default']['PORT'],
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(alias)
+DATABASE_ROUTERS = ['myapp.routers.AnalyticsReplicaRouter']
+# How long a client that wrote keeps reading from the primary
+DB_REPLICA_PIN_SECONDS = int(os.getenv('DB_REPLICA_PIN_SECONDS', '5'))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -206,3 +258,61 @@ CSRF_TRUSTED_ORIGINS = [
     'https://api.novaaff.id.vn',
 ]
 CORS_ALLOW_ALL_ORIGINS = os.getenv('CORS_ALLOW_ALL_ORIGINS', 'True').lower() == 'true'  # Only for development
+
+# List pagination (keyset/cursor based)
+API_PAGE_SIZE = int(os.getenv('API_PAGE_SIZE', '50'))
+API_MAX_PAGE_SIZE = int(os.getenv('API_MAX_PAGE_SIZE', '500'))
+
+# Resumable video uploads
+CHUNKED_UPLOAD_MAX_SIZE = int(os.getenv('CHUNKED_UPLOAD_MAX_SIZE', str(2 * 1024 ** 3)))
+# Fraction of video uploads logged by myapp.uploads (0 disables, 1 logs all)
+UPLOAD_LOG_SAMPLE_RATE = float(os.getenv('UPLOAD_LOG_SAMPLE_RATE', '0.1'))
+
+# Cache for brand analytics responses: Redis when REDIS_URL is set, local memory otherwise
+REDIS_URL = os.getenv('REDIS_URL', '')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'nova_aff',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+ANALYTICS_CACHE_TIMEOUT = int(os.getenv('ANALYTICS_CACHE_TIMEOUT', str(24 * 60 * 60)))
+# Responses built this soon after an invalidation may come from a lagging replica; cache them only this long
+ANALYTICS_CACHE_SETTLE_TIMEOUT = int(os.getenv('ANALYTICS_CACHE_SETTLE_TIMEOUT', '5'))
+# Serve CreatorDetailView from pre-rendered documents (run `manage.py rebuild_creator_profiles --watch`)
+CREATOR_PROFILE_DOCUMENTS = os.getenv('CREATOR_PROFILE_DOCUMENTS', 'False').lower() == 'true'
+
+# Per-request query/DB/serializer profiling via Server-Timing headers (myapp/profiling.py)
+QUERY_PROFILER = os.getenv('QUERY_PROFILER', 'False').lower() == 'true'
+
+# Prometheus metrics served at /api/metrics/ to METRICS_ALLOWED_IPS (myapp/metrics.py); off by
+# default as it wraps every query and request. The same IPs may read /api/debug/profiler/stats/.
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'False').lower() == 'true'
+METRICS_ALLOWED_IPS = [ip.strip() for ip in os.getenv('METRICS_ALLOWED_IPS', '127.0.0.1,::1').split(',') if ip.strip()]
+# Directory shared by the gunicorn workers; empty for a single process
+METRICS_MULTIPROC_DIR = os.getenv('METRICS_MULTIPROC_DIR', '')
+METRICS_FLUSH_INTERVAL = float(os.getenv('METRICS_FLUSH_INTERVAL', '1'))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'myapp': {
+            'handlers': ['console'],
+            'level': os.getenv('MYAPP_LOG_LEVEL', 'INFO'),
+        },
+    },
+}